@@ -1,96 +1,432 @@
-from flask import Flask, request, jsonify, session, send_from_directory
+from flask import Flask, Response, abort, request, jsonify, session
 
 from flask_cors import CORS
 import secrets
 import logging
+import logging.handlers
 import os
+import threading
+import json
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 from chatbot.nlp_processor import NLPProcessor
 from chatbot.intent_classifier import IntentClassifier
-from chatbot.response_generator import ResponseGenerator
+from chatbot.response_generator import AI_SERVICES_AVAILABLE, ResponseGenerator
 from chatbot.conversation_manager import ConversationManager
+from chatbot.admission import create_admission_controller
+from chatbot.analysis_cache import AnalysisCache
+from chatbot.history_store import HistoryWriter
+from chatbot.job_queue import FallbackJobQueue, create_job_store
+from chatbot.payloads import DEFAULT_COMPRESS_MIN_SIZE, ORJSON_AVAILABLE, FastJSONProvider, compress_response
+from chatbot.static_assets import StaticAssets
 from chatbot.training_data import TRAINING_DATA
 
+try:
+    from flask_sock import Sock
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One JSON object per answered message, read by scripts/analyze_chat_logs.py;
+# CHAT_EVENT_LOG sends them to their own file instead of the main log
+chat_event_logger = logging.getLogger('chat_events')
+if os.environ.get('CHAT_EVENT_LOG'):
+    event_handler = logging.handlers.WatchedFileHandler(os.environ['CHAT_EVENT_LOG'])
+    event_handler.setFormatter(logging.Formatter('%(message)s'))
+    chat_event_logger.addHandler(event_handler)
+    chat_event_logger.propagate = False
+
 # Load environment variables from .env if present
 try:
     load_dotenv()
 except Exception:
     pass
 
-app = Flask(__name__, static_folder='dist', static_url_path='')
+# The built frontend is served by static_file() below, with precompressed variants
+app = Flask(__name__, static_folder=None)
 CORS(app, supports_credentials=True)  # Enable CORS with credentials
-app.secret_key = secrets.token_hex(16)
+# Workers and restarts must share the key to read each other's session cookies
+app.secret_key = os.environ.get('SECRET_KEY') or secrets.token_hex(16)
 app.config['PERMANENT_SESSION_LIFETIME'] = 1800  # 30 minutes session lifetime
 app.config['SESSION_COOKIE_SECURE'] = True
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 
+# Encode JSON with orjson when it is installed; gzip large API responses (long AI answers)
+if ORJSON_AVAILABLE:
+    app.json = FastJSONProvider(app)
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', str(DEFAULT_COMPRESS_MIN_SIZE)))
+
 # Initialize chatbot components
 nlp_processor = NLPProcessor()
 intent_classifier = IntentClassifier()
-response_generator = ResponseGenerator()
-conversation_manager = ConversationManager()
+response_generator = ResponseGenerator(nlp_processor)
+
+# Persist conversation history for analytics; set HISTORY_DB_PATH empty to disable.
+# The default lives in the instance folder, not the working directory
+history_db_path = os.environ.get('HISTORY_DB_PATH')
+if history_db_path is None:
+    os.makedirs(app.instance_path, exist_ok=True)
+    history_db_path = os.path.join(app.instance_path, 'chat_history.db')
+history_writer = HistoryWriter(history_db_path) if history_db_path else None
+conversation_manager = ConversationManager(history_writer)
+# AI prompts carry the session's recent turns and a rolling summary within a token budget
+response_generator.conversation_manager = conversation_manager
+response_generator.history_token_budget = int(os.environ.get('AI_HISTORY_TOKEN_BUDGET', '120'))
 
 # Train the intent classifier with sample data
 intent_classifier.train(TRAINING_DATA)
 
+# Load calibrated routing thresholds (see scripts/calibrate_thresholds.py)
+thresholds_path = os.environ.get('INTENT_THRESHOLDS_PATH', 'intent_thresholds.json')
+if os.path.exists(thresholds_path):
+    response_generator.load_intent_thresholds(thresholds_path)
+    logger.info(f"Loaded intent thresholds from {thresholds_path}")
+
+# Limit AI fallbacks per session and in flight; set REDIS_URL to share the limits
+# between worker processes
+response_generator.admission_controller = create_admission_controller(
+    rate_per_minute=float(os.environ.get('AI_RATE_PER_MINUTE', '6')),
+    burst=int(os.environ.get('AI_RATE_BURST', '3')),
+    max_concurrent=int(os.environ.get('AI_MAX_CONCURRENT', '8')),
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+# Cache processing and classification of repeated messages; suggestion chips are
+# sent back verbatim, so they are precomputed and pinned
+analysis_cache = AnalysisCache(
+    nlp_processor, intent_classifier,
+    maxsize=int(os.environ.get('ANALYSIS_CACHE_SIZE', '2048'))
+)
+suggestion_texts = list(dict.fromkeys(
+    response_generator.suggestion_texts() + ConversationManager.suggestion_texts()
+))
+analysis_cache.warm(suggestion_texts)
+
+# Serve suggestion chips from precomputed payloads
+precompute_counts = response_generator.precompute_responses(suggestion_texts, analysis_cache.analyze)
+logger.info(f"Precomputed suggestion responses: {precompute_counts}")
+analysis_cache.reset_stats()
+
+def warm_ai_suggestions(attempts=3, retry_interval=300.0):
+    """Precompute AI answers for the suggestion chips that route to AI.
+    
+    Chips no provider answered are retried after ``retry_interval`` seconds,
+    up to ``attempts`` rounds in all.
+    """
+    for attempt in range(attempts):
+        counts = response_generator.precompute_responses(suggestion_texts, analysis_cache.analyze, warm_ai=True)
+        logger.info(f"Warmed AI suggestion responses: {counts}")
+        if not counts['skipped'] or attempt == attempts - 1:
+            return
+        time.sleep(retry_interval)
+
+def start_ai_warmup():
+    """Start warm_ai_suggestions in a background thread when WARM_AI_SUGGESTIONS=1.
+    
+    Call it in the process that serves requests. Under gunicorn that is each
+    worker after the fork (post_fork in gunicorn.conf.py), since a thread
+    started in the preloading master is not copied into the workers, and its
+    results would never reach them.
+    """
+    if os.environ.get('WARM_AI_SUGGESTIONS') != '1':
+        return None
+    thread = threading.Thread(target=warm_ai_suggestions, name='ai-warmup', daemon=True)
+    thread.start()
+    return thread
+
+# Optional background processing of AI fallbacks; clients poll or subscribe for the result.
+# A poll may reach another worker process than the one running the job, so job states
+# are shared through Redis (REDIS_URL) or a SQLite file on this host (AI_JOBS_DB_PATH)
+ai_jobs_db_path = os.environ.get('AI_JOBS_DB_PATH')
+if ai_jobs_db_path is None:
+    os.makedirs(app.instance_path, exist_ok=True)
+    ai_jobs_db_path = os.path.join(app.instance_path, 'ai_jobs.db')
+job_store = create_job_store(
+    path=ai_jobs_db_path,
+    redis_url=os.environ.get('REDIS_URL')
+)
+fallback_jobs = FallbackJobQueue(
+    workers=int(os.environ.get('AI_FALLBACK_WORKERS', '4')),
+    max_pending=int(os.environ.get('AI_FALLBACK_QUEUE_SIZE', '100')),
+    store=job_store
+)
+# Without a store that could be opened, background jobs are refused and AI answers are returned in the request
+ASYNC_JOBS_AVAILABLE = job_store is not None
+ASYNC_AI_FALLBACK = os.environ.get('ASYNC_AI_FALLBACK') == '1'
+if ASYNC_AI_FALLBACK and not ASYNC_JOBS_AVAILABLE:
+    logger.warning("ASYNC_AI_FALLBACK needs a shared job store (AI_JOBS_DB_PATH or REDIS_URL); answering AI requests inline")
+
+# Index the frontend build (see scripts/precompress_assets.py for the .gz/.br variants)
+static_assets = StaticAssets(os.path.join(app.root_path, os.environ.get('STATIC_ROOT', 'dist')))
+
 @app.route('/')
 def index():
     """Serve the React frontend."""
     if 'session_id' not in session:
         session['session_id'] = secrets.token_hex(8)
-    return send_from_directory('dist', 'index.html')
+    return static_file('index.html')
+
+@app.route('/<path:filename>')
+def static_file(filename):
+    """Serve a file from the frontend build, precompressed when the client accepts it."""
+    response = static_assets.serve(filename, request)
+    if response is None:
+        abort(404)
+    return response
+
+@app.after_request
+def compress_api_response(response):
+    return compress_response(response, request, min_size=COMPRESS_MIN_SIZE)
+
+def _complete_exchange(session_id, user_message, intent_result, response_data, started,
+                       include_suggestions=False, suggestions_etag=None):
+    """Record an answered message and build the chat response payload.
+    
+    With ``include_suggestions`` the session's topic suggestions are added, so the
+    client needs no separate /api/suggestions request; the list is left out when
+    it still matches the client's ``suggestions_etag``.
+    """
+    response_source = response_data.get('source', 'local')
+    
+    # Update conversation context
+    conversation_manager.update_context(
+        session_id, user_message, response_data['response'],
+        intent=intent_result['intent'], confidence=intent_result['confidence'], source=response_source
+    )
+    
+    # Log the interaction
+    chat_event_logger.info(json.dumps({
+        'event': 'chat',
+        'ts': datetime.now().isoformat(),
+        'session': session_id,
+        'intent': intent_result['intent'],
+        'confidence': round(intent_result['confidence'], 4),
+        'source': response_source,
+        'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+        'prompt_tokens': response_data.get('prompt_tokens'),
+        'message': user_message[:200]
+    }))
+    
+    payload = {
+        'response': response_data['response'],
+        'intent': intent_result['intent'],
+        'confidence': intent_result['confidence'],
+        'suggestions': list(response_data.get('suggestions', [])),
+        'timestamp': datetime.now().isoformat()
+    }
+    if include_suggestions:
+        session_suggestions, etag = conversation_manager.get_suggestions_with_etag(session_id)
+        payload['suggestions_etag'] = etag
+        if etag != suggestions_etag:
+            payload['session_suggestions'] = session_suggestions
+    return payload
+
+CHAT_ERROR_RESPONSE = {
+    'response': "I'm sorry, I encountered an error. Please try again.",
+    'error': True
+}
+
+def _client_key(session_id):
+    """Key for the per-client AI rate limit: the session, or the address without one."""
+    return session_id or request.remote_addr
+
+def _answer_message(session_id, data, on_token=None, client_key=None):
+    """Answer one chat message; returns the response payload and HTTP status.
+    
+    Shared by POST /api/chat and the WebSocket channel. With ``on_token`` AI
+    answers are streamed to it while they are generated, instead of being moved
+    to a background job. ``client_key`` is the AI rate limit key (see _client_key).
+    """
+    started = time.perf_counter()
+    user_message = data.get('message', '').strip()
+    
+    if not user_message:
+        return {'error': 'Empty message'}, 400
+    
+    suggestion_options = {
+        'include_suggestions': bool(data.get('include_suggestions')),
+        'suggestions_etag': data.get('suggestions_etag')
+    }
+    
+    precomputed = response_generator.get_precomputed_response(user_message)
+    if precomputed:
+        # Suggestion chips are answered from the precomputed table
+        intent_result, response_data = precomputed
+        return _complete_exchange(
+            session_id, user_message, intent_result, response_data, started, **suggestion_options
+        ), 200
+    
+    # Process and classify the user message (cached for repeated messages)
+    processed_input, intent_result = analysis_cache.analyze(user_message)
+    # Short replies ("yes", "what about hostel?") continue the previous exchange
+    intent_result = intent_classifier.resolve_follow_up(
+        intent_result, processed_input, conversation_manager.get_last_intent(session_id)
+    )
+    
+    # A job can only be collected by the session that owns it, so clients without one are answered inline
+    if on_token is None and ASYNC_JOBS_AVAILABLE and session_id and (ASYNC_AI_FALLBACK or data.get('async')):
+        response_data = response_generator.try_local_response(intent_result, processed_input)
+        if response_data is None:
+            def run_fallback():
+                ai_data = response_generator.generate_response(
+                    intent_result, processed_input, session_id, client_key=client_key
+                )
+                return _complete_exchange(
+                    session_id, user_message, intent_result, ai_data, started, **suggestion_options
+                )
+            
+            # Long analytical questions yield to short ones
+            priority = 1 if len(user_message.split()) > 20 else 0
+            job = fallback_jobs.submit(run_fallback, priority=priority, owner=session_id)
+            if job:
+                return {
+                    'job_id': job.id,
+                    'status': job.status,
+                    'intent': intent_result['intent'],
+                    'confidence': intent_result['confidence'],
+                    'timestamp': datetime.now().isoformat()
+                }, 202
+            
+            # Queue is full: answer locally rather than hold the request open
+            logger.warning(f"AI fallback queue full, answering locally for session {session_id}")
+            response_data = response_generator.generate_local_response(intent_result)
+    else:
+        # Generate response (includes AI fallback for low confidence)
+        response_data = response_generator.generate_response(
+            intent_result, processed_input, session_id, on_token=on_token, client_key=client_key
+        )
+    
+    return _complete_exchange(
+        session_id, user_message, intent_result, response_data, started, **suggestion_options
+    ), 200
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Handle chat messages and return chatbot responses."""
     try:
-        data = request.get_json()
-        user_message = data.get('message', '').strip()
         session_id = session.get('session_id')
-        
-        if not user_message:
-            return jsonify({'error': 'Empty message'}), 400
-        
-        # Process the user message
-        processed_input = nlp_processor.process(user_message)
-        
-        # Classify intent
-        intent_result = intent_classifier.classify(processed_input)
-        
-        # Generate response (includes AI fallback for low confidence)
-        response_data = response_generator.generate_response(
-            intent_result, processed_input, session_id
-        )
-        
-        # Update conversation context
-        conversation_manager.update_context(
-            session_id, user_message, response_data['response']
-        )
-        
-        # Log the interaction
-        response_source = response_data.get('source', 'local')
-        logger.info(f"Session {session_id}: Intent={intent_result['intent']}, "
-                   f"Confidence={intent_result['confidence']:.2f}, Source={response_source}")
-        
-        return jsonify({
-            'response': response_data['response'],
-            'intent': intent_result['intent'],
-            'confidence': intent_result['confidence'],
-            'suggestions': response_data.get('suggestions', []),
-            'timestamp': datetime.now().isoformat()
-        })
+        payload, status = _answer_message(session_id, request.get_json(), client_key=_client_key(session_id))
+        if status in (200, 202):
+            # Tells the client whether it may ask for background AI answers, or
+            # open a WebSocket for streamed ones, next time
+            payload = {**payload, 'async_jobs': ASYNC_JOBS_AVAILABLE, 'streaming': STREAMING_AVAILABLE}
+        return jsonify(payload), status
         
     except Exception as e:
         logger.error(f"Error processing chat message: {str(e)}")
-        return jsonify({
-            'response': "I'm sorry, I encountered an error. Please try again.",
-            'error': True
-        }), 500
+        return jsonify(CHAT_ERROR_RESPONSE), 500
+
+# WebSockets only pay off when AI answers can be streamed; local answers are instant over HTTP
+STREAMING_AVAILABLE = WEBSOCKETS_AVAILABLE and AI_SERVICES_AVAILABLE
+
+if WEBSOCKETS_AVAILABLE:
+    # One connection per browser tab; keep-alive pings stop proxies closing idle sockets
+    app.config.setdefault('SOCK_SERVER_OPTIONS', {'ping_interval': 25, 'max_message_size': 16 * 1024})
+    sock = Sock(app)
+    
+    # Each open socket holds a server thread for its lifetime. Sockets are capped per
+    # process (by default half of gunicorn's threads, see gunicorn.conf.py) so that
+    # plain HTTP requests always have threads left, and idle ones are closed
+    WEBSOCKET_MAX_CONNECTIONS = int(os.environ.get(
+        'WEBSOCKET_MAX_CONNECTIONS', max(1, int(os.environ.get('GUNICORN_THREADS', '16')) // 2)
+    ))
+    WEBSOCKET_IDLE_TIMEOUT = float(os.environ.get('WEBSOCKET_IDLE_TIMEOUT', '120'))
+    websocket_slots = threading.BoundedSemaphore(WEBSOCKET_MAX_CONNECTIONS)
+    
+    @sock.route('/api/ws')
+    def chat_socket(ws):
+        """Answer chat messages over a WebSocket, streaming AI answers as they are generated.
+        
+        The session is resolved once, when the connection opens. Each message is
+        ``{"id", "message", ...}`` with the same options as POST /api/chat; the
+        server replies with ``token`` frames while an AI answer streams (``restart``
+        when a failed attempt's partial text must be discarded) and a final
+        ``message`` frame with the full payload. When WEBSOCKET_MAX_CONNECTIONS
+        sockets are already open the server sends a ``busy`` frame and closes, and
+        the client stays on HTTP; sockets idle for WEBSOCKET_IDLE_TIMEOUT seconds
+        are closed.
+        """
+        if not websocket_slots.acquire(blocking=False):
+            ws.send(app.json.dumps({'type': 'busy'}))
+            return
+        try:
+            _serve_socket(ws)
+        finally:
+            websocket_slots.release()
+    
+    def _serve_socket(ws):
+        """Answer messages on one socket until it is closed or goes idle."""
+        session_id = session.get('session_id')
+        client_key = _client_key(session_id)
+        
+        while True:
+            raw = ws.receive(timeout=WEBSOCKET_IDLE_TIMEOUT)
+            if raw is None:
+                # Idle: free the thread; the client reconnects for its next message
+                return
+            try:
+                data = json.loads(raw)
+                message_id = data.get('id')
+            except (TypeError, ValueError, AttributeError):
+                ws.send(app.json.dumps({'type': 'error', 'error': 'Invalid message'}))
+                continue
+            
+            def send_token(text):
+                frame = {'type': 'restart'} if text is None else {'type': 'token', 'text': text}
+                frame['id'] = message_id
+                ws.send(app.json.dumps(frame))
+            
+            try:
+                payload, status = _answer_message(session_id, data, on_token=send_token, client_key=client_key)
+                frame_type = 'message' if status == 200 else 'error'
+            except Exception as e:
+                logger.error(f"Error processing chat message: {str(e)}")
+                payload, frame_type = CHAT_ERROR_RESPONSE, 'error'
+            ws.send(app.json.dumps({'type': frame_type, 'id': message_id, **payload}))
+
+def _get_session_job(job_id):
+    """Find a background job owned by the current session; clients without a session own none."""
+    session_id = session.get('session_id')
+    if not session_id:
+        return None
+    job = fallback_jobs.get(job_id)
+    if job is None or job.owner != session_id:
+        return None
+    return job
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Poll the status and result of a background AI fallback."""
+    job = _get_session_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream the result of a background AI fallback as a server-sent event."""
+    job = _get_session_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    def stream():
+        deadline = time.monotonic() + 120
+        current = job
+        while True:
+            # The job may run in another worker process; wait() then polls the job store
+            current = fallback_jobs.wait(job_id, 15) or current
+            if current.done.is_set() or time.monotonic() >= deadline:
+                break
+            # Comment lines keep proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+        yield f"data: {json.dumps(current.to_dict())}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/reset', methods=['POST'])
 def reset_conversation():
@@ -104,8 +440,29 @@ def reset_conversation():
 def get_suggestions():
     """Get conversation suggestions based on current context."""
     session_id = session.get('session_id')
-    suggestions = conversation_manager.get_suggestions(session_id)
-    return jsonify({'suggestions': suggestions})
+    suggestions, etag = conversation_manager.get_suggestions_with_etag(session_id)
+    
+    # Clients revalidate every time, but unchanged lists cost no body
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = jsonify({'suggestions': suggestions})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/api/stats')
+def get_stats():
+    """Report cache statistics for monitoring."""
+    return jsonify({
+        'analysis_cache': analysis_cache.stats(),
+        'precomputed_responses': len(response_generator.precomputed_responses),
+        'ai_token_usage': response_generator.token_usage,
+        'ai_jobs': fallback_jobs.stats(),
+        'ai_admission': response_generator.admission_controller.stats(),
+        'ai_providers': response_generator.provider_stats.snapshot(),
+        'history': history_writer.stats() if history_writer else None
+    })
 
 if __name__ == '__main__':
     # Set logging to catch any errors
@@ -114,11 +471,13 @@ if __name__ == '__main__':
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Run the app with proper server settings
+    # Development server; use gunicorn.conf.py for production
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    start_ai_warmup()
     app.run(
-        debug=True,  # Enable debug mode for development
+        debug=debug,  # Enable debug mode for development
         host='0.0.0.0',  # Listen on all available interfaces
         port=5000,
         threaded=True,  # Enable threading
-        use_reloader=True  # Enable auto-reload on code changes
+        use_reloader=debug  # Auto-reload loads everything twice, so only when debugging
     )
\ No newline at end of file
@@ -1,84 +1,198 @@
-from openai import OpenAI
-import google.generativeai as genai
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from a .env file if present
-try:
-    load_dotenv()
-except Exception:
-    pass
-
-# Read API keys from environment variables
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
-
-# Configure Gemini if key exists
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
-
-def search_college_data(query):
-    """
-    Searches a predefined dictionary for answers to common questions.
-    """
-    college_faq = {
-        "admission": "Admissions generally open in June. Please check the college website for specific dates.",
-        "courses": "We offer B.Tech in Computer Science, Mechanical, and Electronics, as well as MBA and MCA programs.",
-        "fees": "The average fee is approximately INR 1,00,000 per year. For a detailed fee structure, please visit the admissions office.",
-        "scholarships": "Various merit-based and need-based scholarships are available. You can find details and application forms on the 'Scholarships' section of our website.",
-        "hostel": "Yes, hostel facilities are available for both boys and girls with options for AC and non-AC rooms.",
-        "placement": "Our college has a dedicated placement cell with a strong track record. Top companies like Microsoft, Google, and Amazon recruit from our campus."
-        # Add more keywords and answers
-    }
-    for keyword in college_faq:
-        if keyword in query.lower():
-            return college_faq[keyword]
-    return None
-
-def fallback_to_llm(query):
-    """
-    Falls back to a Large Language Model (LLM) if the answer is not in local data.
-    Tries Gemini first, then falls back to ChatGPT.
-    """
-    # Try Gemini first
-    try:
-        if GOOGLE_API_KEY:
-            gemini_model = genai.GenerativeModel("gemini-1.5-flash")
-            response = gemini_model.generate_content(query)
-            return response.text
-    except Exception as e:
-        print(f"Gemini API failed with error: {e}")
-        # If Gemini fails, try ChatGPT
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else OpenAI()
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": query}]
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"OpenAI API failed with error: {e}")
-            return "Sorry, I am having trouble connecting to my knowledge base right now."
-
-
-def chatbot(query):
-    """
-    Main chatbot function to process a user query.
-    """
-    # First, search in the local data
-    answer = search_college_data(query)
-    if answer:
-        return answer
-    
-    # If not found, use the LLM fallback
-    return fallback_to_llm(query)
-
-# Example usage when the script is run directly
-if __name__ == "__main__":
-    print("Chatbot is ready! Ask a question. Type 'exit' to quit.")
-    while True:
-        user_query = input("You: ") 
-        if user_query.lower() == 'exit':
-            break
-        response = chatbot(user_query)
-        print("Chatbot:", response)
\ No newline at end of file
+"""Command-line chatbot using the same pipeline as the web app.
+
+Interactive:
+    python chatbot.py
+
+Batch, for answer audits: reads one query per line (plain text, or JSON
+objects with a "query" field) from a file or stdin and writes one JSON
+result per line, in input order, with per-query timing:
+    python chatbot.py --batch queries.txt --output results.jsonl [--workers 4] [--no-ai]
+    cat queries.txt | python chatbot.py --batch - > results.jsonl
+
+Local answers are produced as the queries are read; queries that need an AI
+service go to a pool of --workers threads, with at most --max-pending
+queries in flight so memory stays flat on large inputs.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+def build_pipeline():
+    """Create the NLP processor, trained classifier and response generator, as app.py does."""
+    # Imported here so the package's start-up messages follow any stdout redirection
+    from chatbot.analysis_cache import AnalysisCache
+    from chatbot.intent_classifier import IntentClassifier
+    from chatbot.nlp_processor import NLPProcessor
+    from chatbot.response_generator import ResponseGenerator
+    from chatbot.training_data import TRAINING_DATA
+
+    nlp_processor = NLPProcessor()
+    intent_classifier = IntentClassifier()
+    intent_classifier.train(TRAINING_DATA)
+    response_generator = ResponseGenerator(nlp_processor)
+
+    thresholds_path = os.environ.get('INTENT_THRESHOLDS_PATH', 'intent_thresholds.json')
+    if os.path.exists(thresholds_path):
+        response_generator.load_intent_thresholds(thresholds_path)
+
+    analysis_cache = AnalysisCache(
+        nlp_processor, intent_classifier,
+        maxsize=int(os.environ.get('ANALYSIS_CACHE_SIZE', '2048'))
+    )
+    return analysis_cache, response_generator
+
+
+def read_queries(lines):
+    """Yield (line number, query) for each non-empty line; JSON lines use their "query" field."""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('{'):
+            try:
+                line = json.loads(line)['query']
+            except (ValueError, KeyError, TypeError):
+                pass
+        yield number, line
+
+
+def make_result(number, query, intent_result, response_data, started, finished, queued_ms=0.0):
+    return {
+        'line': number,
+        'query': query,
+        'intent': intent_result['intent'],
+        'confidence': round(intent_result['confidence'], 4),
+        'source': response_data.get('source', 'local'),
+        'response': response_data['response'],
+        'suggestions': list(response_data.get('suggestions', [])),
+        'latency_ms': round((finished - started) * 1000, 3),
+        'queued_ms': round(queued_ms, 3)
+    }
+
+
+def make_error_result(number, query, error, started, finished, queued_ms=0.0):
+    return {
+        'line': number,
+        'query': query,
+        'source': 'error',
+        'error': f"{type(error).__name__}: {error}",
+        'latency_ms': round((finished - started) * 1000, 3),
+        'queued_ms': round(queued_ms, 3)
+    }
+
+
+def run_batch(lines, output, workers=4, max_pending=64, use_ai=True, pipeline=None):
+    """Answer every query in ``lines`` and write JSONL results to ``output`` in input order.
+
+    A query that raises is written as a result with source 'error' and the
+    exception text; the rest of the batch carries on.
+    """
+    analysis_cache, response_generator = pipeline or build_pipeline()
+    counts = {}
+    latencies = []
+    started_at = time.perf_counter()
+
+    def answer_with_ai(number, query, processed_input, intent_result, submitted):
+        started = time.perf_counter()
+        try:
+            response_data = response_generator.generate_response(intent_result, processed_input, f'batch-{number}')
+            return make_result(number, query, intent_result, response_data, started,
+                               time.perf_counter(), (started - submitted) * 1000)
+        except Exception as e:
+            return make_error_result(number, query, e, started, time.perf_counter(), (started - submitted) * 1000)
+
+    def write(result):
+        output.write(json.dumps(result, ensure_ascii=False) + '\n')
+        counts[result['source']] = counts.get(result['source'], 0) + 1
+        latencies.append(result['latency_ms'])
+
+    # Results wait here until everything before them is written
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for number, query in read_queries(lines):
+            started = time.perf_counter()
+            try:
+                processed_input, intent_result = analysis_cache.analyze(query)
+                response_data = response_generator.try_local_response(intent_result, processed_input)
+                if response_data is None and use_ai:
+                    pending.append(pool.submit(answer_with_ai, number, query, processed_input,
+                                               intent_result, time.perf_counter()))
+                else:
+                    if response_data is None:
+                        response_data = dict(response_generator.generate_local_response(intent_result), source='needs_ai')
+                    pending.append(make_result(number, query, intent_result, response_data, started, time.perf_counter()))
+            except Exception as e:
+                pending.append(make_error_result(number, query, e, started, time.perf_counter()))
+
+            while pending and (isinstance(pending[0], dict) or pending[0].done() or len(pending) > max_pending):
+                head = pending.popleft()
+                write(head if isinstance(head, dict) else head.result())
+
+        while pending:
+            head = pending.popleft()
+            write(head if isinstance(head, dict) else head.result())
+    output.flush()
+
+    elapsed = time.perf_counter() - started_at
+    total = len(latencies)
+    if total:
+        latencies.sort()
+        print(f"Answered {total} queries in {elapsed:.2f}s ({total / elapsed:.0f}/s): "
+              + ", ".join(f"{source} {count}" for source, count in sorted(counts.items())), file=sys.stderr)
+        print(f"Latency ms: mean {sum(latencies) / total:.2f}  p50 {latencies[total // 2]:.2f}  "
+              f"p95 {latencies[min(total - 1, int(total * 0.95))]:.2f}  max {latencies[-1]:.2f}", file=sys.stderr)
+    return counts
+
+
+def chatbot(query, pipeline=None):
+    """Answer one query; pass the result of build_pipeline() to reuse it between calls."""
+    analysis_cache, response_generator = pipeline or build_pipeline()
+    processed_input, intent_result = analysis_cache.analyze(query)
+    return response_generator.generate_response(intent_result, processed_input, 'cli')['response']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch', metavar='FILE', help="Answer the queries in FILE ('-' for stdin) as JSONL")
+    parser.add_argument('--output', default='-', help="Where to write batch results (default stdout)")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent AI fallbacks in batch mode")
+    parser.add_argument('--max-pending', type=int, default=64, help="Most queries in flight in batch mode")
+    parser.add_argument('--no-ai', action='store_true',
+                        help="Answer AI-routed queries from templates and mark them source 'needs_ai'")
+    args = parser.parse_args()
+
+    if args.batch:
+        output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        # Keep progress messages out of the results when they go to stdout
+        sys.stdout = sys.stderr
+        source = sys.stdin if args.batch == '-' else open(args.batch, encoding='utf-8')
+        try:
+            run_batch(source, output, workers=args.workers, max_pending=args.max_pending, use_ai=not args.no_ai)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if output is not sys.__stdout__:
+                output.close()
+        return
+
+    pipeline = build_pipeline()
+    print(f"Chatbot is ready! Ask a question. Type 'exit' to quit. ({datetime.now():%H:%M})")
+    while True:
+        user_query = input("You: ")
+        if user_query.lower() == 'exit':
+            break
+        if not user_query.strip():
+            continue
+        print("Chatbot:", chatbot(user_query, pipeline))
+
+
+# Example usage when the script is run directly
+if __name__ == "__main__":
+    main()
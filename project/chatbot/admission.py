@@ -0,0 +1,216 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Reasons a request is kept off the AI path
+RATE_LIMITED = 'rate_limited'
+OVER_CAPACITY = 'over_capacity'
+
+# Rate limit bucket shared by requests that arrive without a client key
+ANONYMOUS_KEY = 'anonymous'
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return allowed
+"""
+
+_LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - lease)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('EXPIRE', KEYS[1], math.ceil(lease))
+    return 1
+end
+return 0
+"""
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets held in process memory.
+
+    Each key may spend ``burst`` requests at once and regains ``rate`` requests
+    per second. Only the ``max_keys`` most recently seen keys are tracked, so a
+    flood of new sessions cannot grow memory without bound.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Spend one token for the key if one is available."""
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets kept in Redis so every worker process shares the same limits."""
+
+    def __init__(self, client, rate: float, burst: int, prefix: str = 'chatbot:ai-bucket:'):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def allow(self, key: str) -> bool:
+        allowed = self._script(keys=[self.prefix + key], args=[self.rate, self.burst, time.time()])
+        return bool(allowed)
+
+
+class ConcurrencyLimiter:
+    """Caps the number of AI calls in flight within this process."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def acquire(self) -> Optional[str]:
+        """Take a slot without waiting; returns None when all slots are busy."""
+        if not self._semaphore.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.in_flight += 1
+        return 'slot'
+
+    def release(self, token: str) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+
+class RedisConcurrencyLimiter:
+    """Caps AI calls in flight across processes using leases in a Redis sorted set.
+
+    A lease that is never released (e.g. the worker crashed) expires after
+    ``lease_seconds``, so lost slots come back on their own.
+    """
+
+    def __init__(self, client, limit: int, key: str = 'chatbot:ai-inflight', lease_seconds: float = 60.0):
+        self.client = client
+        self.limit = limit
+        self.key = key
+        self.lease_seconds = lease_seconds
+        self._script = client.register_script(_LEASE_SCRIPT)
+
+    def acquire(self) -> Optional[str]:
+        token = secrets.token_hex(8)
+        acquired = self._script(keys=[self.key], args=[time.time(), self.lease_seconds, self.limit, token])
+        return token if acquired else None
+
+    def release(self, token: str) -> None:
+        self.client.zrem(self.key, token)
+
+    @property
+    def in_flight(self) -> int:
+        return self.client.zcard(self.key)
+
+
+class AdmissionController:
+    """Decides whether a request may use the AI fallback.
+
+    A request must pass its session's rate limit and find a free concurrency
+    slot; otherwise the caller should answer locally.
+    """
+
+    def __init__(self, rate_limiter, concurrency_limiter):
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self._lock = threading.Lock()
+        self._counters = {'admitted': 0, RATE_LIMITED: 0, OVER_CAPACITY: 0}
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counters[outcome] += 1
+
+    @contextmanager
+    def admit(self, key: Optional[str], exempt: bool = False) -> Iterator[Optional[str]]:
+        """Yield None if the request is admitted, otherwise the rejection reason.
+
+        ``key`` identifies the client (session or address); requests without one
+        share a single bucket, so leaving it out never lifts the limit. ``exempt``
+        requests (startup warm-up) skip the rate limit but still count against
+        the concurrency cap.
+        """
+        if not exempt and not self.rate_limiter.allow(key or ANONYMOUS_KEY):
+            self._count(RATE_LIMITED)
+            yield RATE_LIMITED
+            return
+
+        token = self.concurrency_limiter.acquire()
+        if token is None:
+            self._count(OVER_CAPACITY)
+            yield OVER_CAPACITY
+            return
+
+        self._count('admitted')
+        try:
+            yield None
+        finally:
+            self.concurrency_limiter.release(token)
+
+    def stats(self) -> Dict:
+        """Report admission outcomes and current AI calls in flight."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            'in_flight': self.concurrency_limiter.in_flight,
+            'max_concurrent': self.concurrency_limiter.limit
+        }
+
+
+def create_admission_controller(rate_per_minute: float, burst: int, max_concurrent: int,
+                                redis_url: Optional[str] = None) -> AdmissionController:
+    """Build an admission controller, sharing state through Redis when a URL is given."""
+    rate = rate_per_minute / 60.0
+    if redis_url:
+        if REDIS_AVAILABLE:
+            client = redis.Redis.from_url(redis_url)
+            return AdmissionController(
+                RedisTokenBucketLimiter(client, rate, burst),
+                RedisConcurrencyLimiter(client, max_concurrent)
+            )
+        print("Warning: redis package not installed; AI rate limits are per process.")
+    return AdmissionController(TokenBucketLimiter(rate, burst), ConcurrencyLimiter(max_concurrent))
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Tuple
+
+def freeze(value):
+    """Recursively convert dicts, lists and sets into read-only equivalents."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class AnalysisCache:
+    """Bounded LRU cache of NLP processing and intent classification results.
+
+    Entries are keyed on the raw message text and stored frozen, so callers can
+    share them without being able to corrupt what later requests will see.
+    Pinned entries (suggestion chips) are never evicted.
+    """
+
+    def __init__(self, nlp_processor, intent_classifier, maxsize: int = 1024):
+        self.nlp_processor = nlp_processor
+        self.intent_classifier = intent_classifier
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._pinned: Dict[str, Tuple[Mapping, Mapping]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _compute(self, text: str) -> Tuple[Mapping, Mapping]:
+        processed_input = self.nlp_processor.process(text)
+        intent_result = self.intent_classifier.classify(processed_input)
+        return freeze(processed_input), freeze(intent_result)
+
+    def analyze(self, text: str) -> Tuple[Mapping, Mapping]:
+        """Return the (processed_input, intent_result) pair for a message."""
+        with self._lock:
+            entry = self._pinned.get(text)
+            if entry is None:
+                entry = self._entries.get(text)
+                if entry is not None:
+                    self._entries.move_to_end(text)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Compute outside the lock; a concurrent miss on the same text just does the work twice
+        entry = self._compute(text)
+
+        with self._lock:
+            self._entries[text] = entry
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def warm(self, texts: Iterable[str]) -> int:
+        """Precompute and pin results for fixed messages such as suggestion chips."""
+        count = 0
+        for text in texts:
+            entry = self._compute(text)
+            with self._lock:
+                self._pinned[text] = entry
+                self._entries.pop(text, None)
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the classifier is retrained."""
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Zero the hit and miss counters, e.g. after startup warm-up."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Report cache size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'pinned': len(self._pinned),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
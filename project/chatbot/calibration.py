@@ -0,0 +1,165 @@
+"""Calibrate the confidence thresholds that route queries to local answers or AI services."""
+
+import copy
+import json
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from chatbot.response_generator import DEFAULT_AI_CONFIDENCE_THRESHOLD, is_complex_query, requires_ai
+
+# Global thresholds compared against the calibrated ones in the coverage report
+REPORT_THRESHOLDS = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+# Highest threshold fitted for an intent, so a message whose keywords all point
+# at one intent (confidence 1.0) is never sent to an AI service
+MAX_THRESHOLD = 0.9
+
+
+def examples_from_training_data(training_data: Dict) -> List[Tuple[str, str]]:
+    """Use the training examples as a labelled query set."""
+    labelled = []
+    for intent, data in training_data.items():
+        for example in data.get('examples', []):
+            labelled.append((example, intent))
+    return labelled
+
+
+def load_labelled_queries(path: str) -> List[Tuple[str, str]]:
+    """Load labelled queries from a JSONL file with 'query' and 'intent' fields."""
+    labelled = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            labelled.append((record['query'], record['intent']))
+    return labelled
+
+
+def collect_predictions(labelled_queries: Iterable[Tuple[str, str]], nlp_processor, classifier) -> List[Dict]:
+    """Classify every labelled query once so thresholds can be swept cheaply."""
+    predictions = []
+    for query, label in labelled_queries:
+        result = classifier.classify(nlp_processor.process(query))
+        predictions.append({
+            'query': query,
+            'label': label,
+            'intent': result['intent'],
+            'confidence': result['confidence'],
+        })
+    return predictions
+
+
+def held_out_predictions(training_data: Dict, nlp_processor, classifier_factory: Callable,
+                         folds: int = 5) -> List[Dict]:
+    """Predict every training example with a classifier trained without it.
+
+    Examples are split into ``folds`` groups by a hash of their text; each group
+    is classified by a classifier trained on the others, so thresholds are not
+    fitted on the examples the classifier learned from.
+    """
+    def fold_of(example: str) -> int:
+        return zlib.crc32(example.encode('utf-8')) % folds
+
+    predictions = []
+    for fold in range(folds):
+        held_out = []
+        reduced = copy.deepcopy(training_data)
+        for intent, data in reduced.items():
+            examples = data.get('examples', [])
+            held_out.extend((example, intent) for example in examples if fold_of(example) == fold)
+            data['examples'] = [example for example in examples if fold_of(example) != fold]
+        classifier = classifier_factory()
+        classifier.train(reduced)
+        predictions.extend(collect_predictions(held_out, nlp_processor, classifier))
+    return predictions
+
+
+def _served_locally(prediction: Dict, thresholds: Dict[str, float], default: float) -> bool:
+    """Check whether a prediction would be answered from local templates."""
+    intent = prediction['intent']
+    threshold = thresholds.get(intent, default)
+    return not requires_ai(intent, prediction['confidence'], prediction['query'], threshold)
+
+
+def fit_intent_thresholds(predictions: List[Dict], target_precision: float = 0.9,
+                          min_support: int = 3,
+                          default: float = DEFAULT_AI_CONFIDENCE_THRESHOLD,
+                          max_threshold: float = MAX_THRESHOLD) -> Dict[str, float]:
+    """Find the lowest threshold per intent whose local answers reach the target precision.
+
+    Intents with fewer than ``min_support`` predictions keep the default threshold.
+    Thresholds are capped at ``max_threshold``, which intents that never reach the
+    target also get, so unambiguous messages are still answered locally.
+    """
+    by_intent: Dict[str, List[Dict]] = {}
+    for prediction in predictions:
+        # Complex queries go to AI regardless of confidence, so they do not inform thresholds
+        if prediction['intent'] == 'unknown' or is_complex_query(prediction['query']):
+            continue
+        by_intent.setdefault(prediction['intent'], []).append(prediction)
+
+    thresholds = {}
+    for intent, items in by_intent.items():
+        if len(items) < min_support:
+            continue
+
+        items.sort(key=lambda p: p['confidence'], reverse=True)
+        best = None
+        correct = 0
+        for i, item in enumerate(items):
+            correct += item['label'] == intent
+            # Only cut between distinct confidence values
+            if i + 1 < len(items) and items[i + 1]['confidence'] == item['confidence']:
+                continue
+            if correct / (i + 1) >= target_precision:
+                best = item['confidence']
+
+        thresholds[intent] = min(best, max_threshold) if best is not None else max_threshold
+
+    return thresholds
+
+
+def evaluate(predictions: List[Dict], thresholds: Dict[str, float],
+             default: float = DEFAULT_AI_CONFIDENCE_THRESHOLD) -> Dict:
+    """Measure local coverage and precision for a set of thresholds."""
+    total = len(predictions)
+    local = [p for p in predictions if _served_locally(p, thresholds, default)]
+    correct = sum(1 for p in local if p['label'] == p['intent'])
+
+    return {
+        'queries': total,
+        'local': len(local),
+        'ai_calls': total - len(local),
+        'local_fraction': len(local) / total if total else 0.0,
+        'local_precision': correct / len(local) if local else 1.0,
+    }
+
+
+def coverage_report(predictions: List[Dict], calibrated: Optional[Dict[str, float]] = None,
+                    thresholds: Iterable[float] = REPORT_THRESHOLDS) -> List[Dict]:
+    """Report the share of traffic served locally at each global threshold and the calibrated set."""
+    rows = []
+    for threshold in thresholds:
+        row = evaluate(predictions, {}, default=threshold)
+        row['threshold'] = f"{threshold:.2f}"
+        rows.append(row)
+
+    if calibrated is not None:
+        row = evaluate(predictions, calibrated)
+        row['threshold'] = 'calibrated'
+        rows.append(row)
+
+    return rows
+
+
+def save_thresholds(path: str, thresholds: Dict[str, float], target_precision: float,
+                    default: float = DEFAULT_AI_CONFIDENCE_THRESHOLD) -> None:
+    """Write thresholds in the format read by ResponseGenerator.load_intent_thresholds."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'default': default,
+            'target_precision': target_precision,
+            'intents': thresholds,
+        }, f, indent=2, sort_keys=True)
@@ -1,15 +1,57 @@
-from typing import Dict, List, Optional
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+from chatbot.prompt_builder import estimate_tokens, format_turn, summarize_turns, truncate_to_tokens
 
 class ConversationManager:
-    """Manage conversation context and session state."""
+    """Manage conversation context and session state.
     
-    def __init__(self):
+    Sessions are read and updated under one lock, since background AI jobs
+    update them from worker threads while requests are being served.
+    """
+    
+    # Suggestions for sessions that have not asked anything yet
+    DEFAULT_SUGGESTIONS = [
+        "Tell me about admissions",
+        "What courses do you offer?",
+        "What are the campus facilities?",
+        "How much are the fees?"
+    ]
+    
+    # One suggestion per topic the user has not asked about
+    TOPIC_SUGGESTIONS = {
+        'admission': "What are the admission requirements?",
+        'fees': "Tell me about the fee structure",
+        'courses': "What programs do you offer?",
+        'facilities': "What facilities are available?",
+        'campus': "Tell me about campus life",
+        'placement': "How are the placement opportunities?",
+        'faculty': "Tell me about the faculty"
+    }
+    
+    INTEREST_SUGGESTIONS = {
+        'engineering': "What engineering programs do you offer?",
+        'accommodation': "Tell me about hostel facilities"
+    }
+    
+    # Used once every topic has been covered
+    FALLBACK_SUGGESTIONS = [
+        "Can you provide contact information?",
+        "Tell me about scholarships",
+        "What is campus life like?",
+        "Do you have sports facilities?"
+    ]
+    
+    def __init__(self, history_writer=None):
         self.sessions = {}
+        self._lock = threading.Lock()
         self.context_timeout = timedelta(minutes=30)  # Session timeout
+        # Optional HistoryWriter that persists every exchange for analytics
+        self.history_writer = history_writer
         
     def _cleanup_expired_sessions(self):
-        """Remove expired sessions to free memory."""
+        """Remove expired sessions to free memory; the caller holds the lock."""
         current_time = datetime.now()
         expired_sessions = []
         
@@ -21,46 +63,78 @@ class ConversationManager:
             del self.sessions[session_id]
     
     def _get_or_create_session(self, session_id: str) -> Dict:
-        """Get existing session or create new one."""
+        """Get existing session or create new one; the caller holds the lock."""
         self._cleanup_expired_sessions()
         
         if session_id not in self.sessions:
-            self.sessions[session_id] = {
+            session = {
                 'conversation_history': [],
                 'user_interests': set(),
                 'asked_topics': set(),
+                'last_intent': None,
                 'last_activity': datetime.now(),
-                'message_count': 0
+                'message_count': 0,
+                # Rolling summary of the turns that no longer fit in AI prompts
+                'memory': {'summarized': 0, 'questions': [], 'summary': ''}
             }
+            self._refresh_suggestions(session)
+            self.sessions[session_id] = session
         
         return self.sessions[session_id]
     
-    def update_context(self, session_id: str, user_message: str, bot_response: str):
+    def update_context(self, session_id: str, user_message: str, bot_response: str,
+                       intent: Optional[str] = None, confidence: Optional[float] = None,
+                       source: Optional[str] = None):
         """Update conversation context with new exchange."""
-        session = self._get_or_create_session(session_id)
-        
-        # Add to conversation history
-        session['conversation_history'].append({
-            'user_message': user_message,
-            'bot_response': bot_response,
-            'timestamp': datetime.now()
-        })
-        
-        # Update activity timestamp
-        session['last_activity'] = datetime.now()
-        session['message_count'] += 1
-        
-        # Extract and store user interests (simple keyword extraction)
-        interests = self._extract_interests(user_message)
-        session['user_interests'].update(interests)
+        timestamp = datetime.now()
         
-        # Track asked topics
-        topics = self._extract_topics(user_message)
-        session['asked_topics'].update(topics)
+        # Persist in the background; never waits on disk
+        if self.history_writer is not None:
+            self.history_writer.append({
+                'session_id': session_id,
+                'timestamp': timestamp.isoformat(),
+                'user_message': user_message,
+                'bot_response': bot_response,
+                'intent': intent,
+                'confidence': confidence,
+                'source': source
+            })
         
-        # Limit history to last 20 exchanges to manage memory
-        if len(session['conversation_history']) > 20:
-            session['conversation_history'] = session['conversation_history'][-20:]
+        with self._lock:
+            session = self._get_or_create_session(session_id)
+            
+            # Add to conversation history
+            session['conversation_history'].append({
+                'user_message': user_message,
+                'bot_response': bot_response,
+                'timestamp': timestamp
+            })
+            
+            # Short replies to a template answer are resolved against its intent; what
+            # a "yes" agrees to after an AI answer is unknown
+            session['last_intent'] = intent if source != 'ai' else None
+            
+            # Update activity timestamp
+            session['last_activity'] = datetime.now()
+            session['message_count'] += 1
+            
+            # Extract and store user interests (simple keyword extraction)
+            interests = self._extract_interests(user_message)
+            new_interests = interests - session['user_interests']
+            session['user_interests'].update(interests)
+            
+            # Track asked topics
+            topics = self._extract_topics(user_message)
+            new_topics = topics - session['asked_topics']
+            session['asked_topics'].update(topics)
+            
+            # Suggestions only change when a new topic or interest appears
+            if new_interests or new_topics:
+                self._refresh_suggestions(session)
+            
+            # Limit history to last 20 exchanges to manage memory
+            if len(session['conversation_history']) > 20:
+                session['conversation_history'] = session['conversation_history'][-20:]
     
     def _extract_interests(self, message: str) -> set:
         """Extract user interests from message."""
@@ -104,76 +178,131 @@ class ConversationManager:
     
     def get_context(self, session_id: str) -> Dict:
         """Get current conversation context for a session."""
-        session = self._get_or_create_session(session_id)
-        return {
-            'history_length': len(session['conversation_history']),
-            'user_interests': list(session['user_interests']),
-            'asked_topics': list(session['asked_topics']),
-            'message_count': session['message_count'],
-            'session_duration': datetime.now() - session['last_activity']
-        }
+        with self._lock:
+            session = self._get_or_create_session(session_id)
+            return {
+                'history_length': len(session['conversation_history']),
+                'user_interests': list(session['user_interests']),
+                'asked_topics': list(session['asked_topics']),
+                'message_count': session['message_count'],
+                'session_duration': datetime.now() - session['last_activity']
+            }
     
-    def get_suggestions(self, session_id: str) -> List[str]:
-        """Get contextual suggestions based on conversation history."""
-        if session_id not in self.sessions:
-            return [
-                "Tell me about admissions",
-                "What courses do you offer?",
-                "What are the campus facilities?",
-                "How much are the fees?"
-            ]
-        
-        session = self.sessions[session_id]
-        asked_topics = session['asked_topics']
-        user_interests = session['user_interests']
-        
-        # Generate suggestions based on what hasn't been asked yet
-        all_topics = {'admission', 'fees', 'courses', 'facilities', 'campus', 'placement', 'faculty'}
-        unasked_topics = all_topics - asked_topics
-        
+    def get_last_intent(self, session_id: str) -> Optional[str]:
+        """Intent of the session's previous message, if the session is still active."""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None or datetime.now() - session['last_activity'] > self.context_timeout:
+                return None
+            return session['last_intent']
+    
+    @staticmethod
+    def _etag(suggestions: Sequence[str]) -> str:
+        return hashlib.sha1('\n'.join(suggestions).encode('utf-8')).hexdigest()[:16]
+    
+    def _build_suggestions(self, asked_topics: set, user_interests: set) -> List[str]:
+        """Build contextual suggestions from the topics and interests seen so far."""
         suggestions = []
         
-        # Add topic-based suggestions
-        topic_suggestions = {
-            'admission': "What are the admission requirements?",
-            'fees': "Tell me about the fee structure",
-            'courses': "What programs do you offer?",
-            'facilities': "What facilities are available?",
-            'campus': "Tell me about campus life",
-            'placement': "How are the placement opportunities?",
-            'faculty': "Tell me about the faculty"
-        }
-        
-        for topic in list(unasked_topics)[:3]:
-            suggestions.append(topic_suggestions[topic])
+        # Add topic-based suggestions, in a fixed order so the list is stable
+        unasked_topics = [topic for topic in self.TOPIC_SUGGESTIONS if topic not in asked_topics]
+        for topic in unasked_topics[:3]:
+            suggestions.append(self.TOPIC_SUGGESTIONS[topic])
         
         # Add interest-based suggestions
         if 'engineering' in user_interests and 'courses' not in asked_topics:
-            suggestions.append("What engineering programs do you offer?")
+            suggestions.append(self.INTEREST_SUGGESTIONS['engineering'])
         
         if 'accommodation' in user_interests and 'facilities' not in asked_topics:
-            suggestions.append("Tell me about hostel facilities")
+            suggestions.append(self.INTEREST_SUGGESTIONS['accommodation'])
         
         # Default suggestions if none generated
         if not suggestions:
-            suggestions = [
-                "Can you provide contact information?",
-                "Tell me about scholarships",
-                "What is campus life like?",
-                "Do you have sports facilities?"
-            ]
+            suggestions = list(self.FALLBACK_SUGGESTIONS)
         
         return suggestions[:4]  # Limit to 4 suggestions
     
+    def _refresh_suggestions(self, session: Dict) -> None:
+        """Recompute a session's suggestions and their ETag after its context changed."""
+        suggestions = tuple(self._build_suggestions(session['asked_topics'], session['user_interests']))
+        # Replace both in one assignment so readers never see a mismatched pair
+        session['suggestions'] = (suggestions, self._etag(suggestions))
+    
+    def get_suggestions_with_etag(self, session_id: str) -> Tuple[List[str], str]:
+        """Return the precomputed suggestions for a session and an ETag for the list."""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return list(self.DEFAULT_SUGGESTIONS), self._etag(self.DEFAULT_SUGGESTIONS)
+            suggestions, etag = session['suggestions']
+        return list(suggestions), etag
+    
+    def get_suggestions(self, session_id: str) -> List[str]:
+        """Get contextual suggestions based on conversation history."""
+        return self.get_suggestions_with_etag(session_id)[0]
+    
+    @classmethod
+    def suggestion_texts(cls) -> List[str]:
+        """Every suggestion string this manager can hand to the UI."""
+        return (list(cls.DEFAULT_SUGGESTIONS) + list(cls.TOPIC_SUGGESTIONS.values()) +
+                list(cls.INTEREST_SUGGESTIONS.values()) + list(cls.FALLBACK_SUGGESTIONS))
+    
     def reset_context(self, session_id: str):
         """Reset conversation context for a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        with self._lock:
+            self.sessions.pop(session_id, None)
+    
+    def get_prompt_context(self, session_id: str, token_budget: int = 120, max_turn_tokens: int = 30,
+                           summary_token_budget: int = 40) -> Dict:
+        """Recent turns for an AI prompt within ``token_budget``, plus a summary of older ones.
+        
+        The newest turns that fit are sent as they are (each side cut to
+        ``max_turn_tokens``). Turns that no longer fit are folded into the
+        session's summary once, when they drop out; the summary is cached and
+        never covers a turn that is still sent in full.
+        """
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return {'summary': '', 'turns': [], 'tokens': 0}
+            
+            history = session['conversation_history']
+            memory = session['memory']
+            # Turn number of history[0]; history only keeps the last 20 exchanges
+            first = session['message_count'] - len(history)
+            start = max(memory['summarized'] - first, 0)
+            
+            turns = []
+            used = 0
+            keep_from = len(history)
+            for index in range(len(history) - 1, start - 1, -1):
+                turn = format_turn(history[index], max_turn_tokens)
+                cost = estimate_tokens(turn)
+                if used + cost > token_budget:
+                    break
+                turns.append(turn)
+                used += cost
+                keep_from = index
+            
+            dropped = history[start:keep_from]
+            if dropped:
+                questions = memory['questions'] + [truncate_to_tokens(turn['user_message'], 12) for turn in dropped]
+                memory['questions'] = questions[-10:]
+                memory['summarized'] = first + keep_from
+                memory['summary'] = summarize_turns(memory['questions'], summary_token_budget)
+            
+            turns.reverse()
+            return {
+                'summary': memory['summary'],
+                'turns': turns,
+                'tokens': used + estimate_tokens(memory['summary'])
+            }
     
     def get_recent_context(self, session_id: str, limit: int = 5) -> List[Dict]:
         """Get recent conversation history."""
-        if session_id not in self.sessions:
-            return []
-        
-        history = self.sessions[session_id]['conversation_history']
-        return history[-limit:] if history else []
\ No newline at end of file
+        with self._lock:
+            if session_id not in self.sessions:
+                return []
+            
+            history = self.sessions[session_id]['conversation_history']
+            return history[-limit:] if history else []
\ No newline at end of file
@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Key marking the end of an alias in a trie node
+_END = ''
+
+
+class EntityRecognizer:
+    """Find named entities (departments, exams) by their aliases in one pass.
+
+    Aliases are stored in a token trie. Scanning a message walks the trie from
+    each position and keeps the longest alias ending there, so "cse ai ml" wins
+    over "cse". The cost depends on the message length and the longest alias,
+    not on how many aliases are registered.
+    """
+
+    def __init__(self, tokenize):
+        self.tokenize = tokenize
+        self.root: Dict = {}
+
+    def add(self, label: str, canonical: str, alias: str) -> None:
+        """Register ``alias`` as a name for ``canonical`` of entity type ``label``."""
+        tokens = self.tokenize(alias)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = (label, canonical)
+
+    def add_table(self, label: str, aliases: Dict[str, Iterable[str]]) -> None:
+        """Register every canonical name (and its aliases) in an alias table."""
+        for canonical, names in aliases.items():
+            self.add(label, canonical, canonical)
+            for alias in names:
+                self.add(label, canonical, alias)
+
+    def vocabulary(self) -> List[str]:
+        """Every token that appears in a registered alias."""
+        words = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for token, child in node.items():
+                if token != _END:
+                    words.append(token)
+                    stack.append(child)
+        return words
+
+    def find(self, tokens: List[str]) -> List[Tuple[str, str, int, int]]:
+        """Return ``(label, canonical, start, end)`` token spans, longest match first, left to right."""
+        matches = []
+        position = 0
+        while position < len(tokens):
+            node = self.root
+            longest: Optional[Tuple[str, str, int]] = None
+            index = position
+            while index < len(tokens) and tokens[index] in node:
+                node = node[tokens[index]]
+                index += 1
+                if _END in node:
+                    longest = (*node[_END], index)
+            if longest:
+                label, canonical, end = longest
+                matches.append((label, canonical, position, end))
+                position = end
+            else:
+                position += 1
+        return matches
+
+    def extract(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """Group the distinct canonical names found in ``tokens`` by entity type."""
+        entities: Dict[str, List[str]] = {}
+        for label, canonical, _, _ in self.find(tokens):
+            found = entities.setdefault(label, [])
+            if canonical not in found:
+                found.append(canonical)
+        return entities
@@ -0,0 +1,219 @@
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+HISTORY_COLUMNS = ('session_id', 'timestamp', 'user_message', 'bot_response', 'intent', 'confidence', 'source')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT,
+    timestamp TEXT,
+    user_message TEXT,
+    bot_response TEXT,
+    intent TEXT,
+    confidence REAL,
+    source TEXT
+)
+"""
+
+_INSERT = f"INSERT INTO exchanges ({', '.join(HISTORY_COLUMNS)}) VALUES ({', '.join('?' * len(HISTORY_COLUMNS))})"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the history database in WAL mode, creating the table if needed."""
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL with NORMAL sync survives process crashes; only power loss can drop the last batch
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(_SCHEMA)
+    connection.commit()
+    return connection
+
+
+class HistoryWriter:
+    """Append-only conversation history written behind the request path.
+
+    ``append`` only puts the record on a bounded buffer; a background thread
+    inserts buffered records in batches, one transaction per batch. When the
+    buffer is full new records are dropped and counted rather than making the
+    caller wait. Buffered records are flushed when the process exits.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.5,
+                 max_buffer: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: queue.Queue = queue.Queue(maxsize=max_buffer)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._counters = {'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+
+    def _ensure_started(self) -> None:
+        """Start the writer lazily, and again in a forked child whose thread did not survive."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Records buffered by the parent belong to the parent's writer
+                self._buffer = queue.Queue(maxsize=self.max_buffer)
+            self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self.close)
+
+    def append(self, record: Dict) -> bool:
+        """Buffer one exchange for writing; returns False if it was dropped."""
+        self._ensure_started()
+        if not self._thread.is_alive():
+            # The writer could not open the database; nothing would ever be written
+            with self._lock:
+                self._counters['dropped'] += 1
+            return False
+        try:
+            self._buffer.put_nowait(tuple(record.get(column) for column in HISTORY_COLUMNS))
+        except queue.Full:
+            with self._lock:
+                self._counters['dropped'] += 1
+            return False
+        return True
+
+    def _run(self) -> None:
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as e:
+            print(f"History writer could not open {self.path}: {e}")
+            with self._lock:
+                self._counters['errors'] += 1
+            self._discard_buffer()
+            return
+        stopping = False
+        while not stopping:
+            try:
+                item = self._buffer.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            rows: List[tuple] = []
+            waiters: List[threading.Event] = []
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._buffer.get_nowait()
+                except queue.Empty:
+                    break
+
+            if rows:
+                self._write(connection, rows)
+            for waiter in waiters:
+                waiter.set()
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, rows: List[tuple]) -> None:
+        try:
+            with connection:
+                connection.executemany(_INSERT, rows)
+        except sqlite3.Error as e:
+            print(f"Failed to write {len(rows)} history records: {e}")
+            with self._lock:
+                self._counters['errors'] += 1
+            return
+        with self._lock:
+            self._counters['written'] += len(rows)
+            self._counters['batches'] += 1
+
+    def _discard_buffer(self) -> None:
+        """Count records that will never be written as dropped."""
+        dropped = 0
+        while True:
+            try:
+                item = self._buffer.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                dropped += 1
+        with self._lock:
+            self._counters['dropped'] += dropped
+
+    def _signal(self, item, deadline: Optional[float]) -> bool:
+        """Put a control item on the buffer while the writer thread is alive to take it."""
+        while self._thread is not None and self._thread.is_alive():
+            wait = self.flush_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            try:
+                self._buffer.put(item, timeout=wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything appended so far has been written.
+
+        Returns False if the timeout passes or the writer thread is not running
+        (not started in this process, or closed).
+        """
+        if self._pid != os.getpid():
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        if not self._signal(done, deadline):
+            return False
+        while not done.wait(self.flush_interval):
+            if not self._thread.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush buffered records and stop the writer thread."""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._signal(None, deadline):
+            self._thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._pid = None
+
+    def stats(self) -> Dict:
+        """Report written, dropped and pending record counts."""
+        with self._lock:
+            return {
+                **self._counters,
+                'pending': self._buffer.qsize(),
+                'max_buffer': self.max_buffer
+            }
+
+
+def iter_exchanges(path: str, session_id: Optional[str] = None) -> Iterator[Dict]:
+    """Read persisted exchanges in the order they were written."""
+    connection = connect(path)
+    try:
+        query = f"SELECT {', '.join(HISTORY_COLUMNS)} FROM exchanges"
+        params: tuple = ()
+        if session_id is not None:
+            query += " WHERE session_id = ?"
+            params = (session_id,)
+        for row in connection.execute(query + " ORDER BY id", params):
+            yield dict(zip(HISTORY_COLUMNS, row))
+    finally:
+        connection.close()
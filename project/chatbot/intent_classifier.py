@@ -1,22 +1,94 @@
 import re
-from typing import Dict, Set
+from typing import Dict, List, Optional, Set
+from chatbot.stemmer import stem
+from chatbot.training_data import FOLLOW_UP_INTENTS
+
+# Phrases that only agree to hear more about the previous answer; a reply made
+# up entirely of these ("yes please", "ok, tell me more") is agreement
+AFFIRMATIVE_PHRASES = {
+    ('yes',), ('yeah',), ('yep',), ('yup',), ('sure',), ('ok',), ('okay',), ('alright',),
+    ('definitely',), ('please',), ('pls',), ('more',), ('continue',),
+    ('of', 'course'), ('go', 'on'), ('tell', 'me', 'more')
+}
+MAX_AFFIRMATIVE_PHRASE = max(len(phrase) for phrase in AFFIRMATIVE_PHRASES)
+
+# Openings of elliptical questions that continue the previous one ("what about hostel?")
+FOLLOW_UP_OPENERS = {('and',), ('also',), ('what', 'about'), ('how', 'about'), ('what', 'of')}
+
+# Intents that are small talk rather than a question about the college; a message
+# that also names a topic ("hi, what are the fees?") is about the topic
+CONVERSATIONAL_INTENTS = {'greeting', 'goodbye'}
+
+# Previous intents a short reply cannot continue
+NON_CONTINUABLE_INTENTS = {'unknown', 'greeting', 'goodbye'}
+
+def agreement_phrases(words: List[str]) -> Optional[List[tuple]]:
+    """Split a reply into agreement phrases, or return None if it says anything else."""
+    phrases = []
+    index = 0
+    while index < len(words):
+        for length in range(min(MAX_AFFIRMATIVE_PHRASE, len(words) - index), 0, -1):
+            phrase = tuple(words[index:index + length])
+            if phrase in AFFIRMATIVE_PHRASES:
+                phrases.append(phrase)
+                index += length
+                break
+        else:
+            return None
+    return phrases or None
 
 class IntentClassifier:
     """A simple keyword-based intent classifier."""
 
-    def __init__(self):
+    def __init__(self, max_intents: int = 3):
         self.intent_keywords: Dict[str, Set[str]] = {}
         self.all_keywords: Set[str] = set()
         self.trained = False
+        # Most intents reported for a compound question; each one after the first
+        # needs this many keywords of its own, or a distinctive one
+        self.max_intents = max_intents
+        self.min_extra_keywords = 2
+        self.distinctive_keywords: Dict[str, Set[str]] = {}
+        # Short replies resolved against the previous exchange
+        self.follow_up_intents = dict(FOLLOW_UP_INTENTS)
+        self.max_follow_up_words = 6
+        self.follow_up_confidence = 0.6
 
     def train(self, training_data: Dict) -> None:
         """Train the classifier with keywords from the training data."""
         for intent, data in training_data.items():
-            keywords = set(data.get('keywords', []))
+            # Stem keywords the same way NLPProcessor stems query tokens
+            keywords = {stem(keyword.lower()) for keyword in data.get('keywords', [])}
             self.intent_keywords[intent] = keywords
             self.all_keywords.update(keywords)
+        self._find_distinctive_keywords(training_data)
         self.trained = True
 
+    def _find_distinctive_keywords(self, training_data: Dict) -> None:
+        """Mark the keywords that point at their intent rather than being everyday words.
+
+        A keyword is distinctive for an intent when at least as many of that intent's
+        examples use it as the examples of all other intents ('scholarship' is, but
+        'need' appears mostly in questions about other topics).
+        """
+        example_stems = {
+            intent: [{stem(word) for word in re.findall(r"[a-z0-9]+", example.lower())}
+                     for example in data.get('examples', [])]
+            for intent, data in training_data.items()
+        }
+        for intent, keywords in self.intent_keywords.items():
+            distinctive = set()
+            for keyword in keywords:
+                own = sum(keyword in example for example in example_stems.get(intent, ()))
+                other = sum(
+                    keyword in example
+                    for other_intent, examples in example_stems.items() if other_intent != intent
+                    for example in examples
+                )
+                if own >= other:
+                    distinctive.add(keyword)
+            self.distinctive_keywords[intent] = distinctive
+
     def classify(self, processed_input: Dict) -> Dict:
         """Classify the intent of the processed input text based on keywords."""
         if not self.trained:
@@ -25,20 +97,29 @@ class IntentClassifier:
         clean_tokens = set(processed_input.get('clean_tokens', []))
         
         if not clean_tokens:
-            return {'intent': 'unknown', 'confidence': 0.0, 'all_scores': {}}
+            return {'intent': 'unknown', 'confidence': 0.0, 'all_scores': {},
+                    'intents': [], 'combined_confidence': 0.0}
 
         intent_scores = {}
+        intent_matches = {}
         for intent, keywords in self.intent_keywords.items():
             matching_keywords = clean_tokens.intersection(keywords)
             score = len(matching_keywords)
             intent_scores[intent] = score
+            if matching_keywords:
+                intent_matches[intent] = matching_keywords
 
-        # Find the best intent
+        # Find the best intent; on equal scores, a topic over small talk, then the
+        # one matched by distinctive keywords
         if not any(intent_scores.values()):
             best_intent = 'unknown'
             max_score = 0
         else:
-            best_intent = max(intent_scores, key=intent_scores.get)
+            best_intent = max(
+                intent_scores,
+                key=lambda intent: (intent_scores[intent], intent not in CONVERSATIONAL_INTENTS,
+                                    self._distinctive_count(intent, intent_matches))
+            )
             max_score = intent_scores[best_intent]
         
         total_score = sum(intent_scores.values())
@@ -58,8 +139,117 @@ class IntentClassifier:
              best_intent = 'unknown'
              confidence = 0.0
 
+        positions = {}
+        for index, token in enumerate(processed_input.get('clean_tokens', [])):
+            positions.setdefault(token, index)
+        intents = self._cover_intents(intent_matches, positions)
+        covered_score = sum(item['score'] for item in intents)
+
         return {
             'intent': best_intent,
             'confidence': confidence,
-            'all_scores': intent_scores
-        }
\ No newline at end of file
+            'all_scores': intent_scores,
+            'intents': intents,
+            'combined_confidence': covered_score / total_score if total_score else 0.0
+        }
+
+    def _cover_intents(self, intent_matches: Dict[str, Set[str]], positions: Dict[str, int]) -> List[Dict]:
+        """Pick the intents that together explain the matched keywords.
+
+        Greedily takes the intent covering the most keywords not yet explained,
+        so a compound question ("fees and scholarships?") yields one intent per
+        part, while a keyword shared by several intents does not add the others.
+        An intent after the first must explain ``min_extra_keywords`` keywords
+        or a distinctive one, so "what documents are needed" does not also ask
+        about scholarships because of 'need'. A keyword distinctive for another
+        matched intent is left to that intent, so 'hostel' in "hostel and sports
+        facilities" asks about hostels even though it is a facility keyword too.
+        ``position`` is where the intent's first keyword appears in the message.
+        """
+        uncovered = set().union(*intent_matches.values()) if intent_matches else set()
+        candidates = {}
+        for intent, matches in intent_matches.items():
+            claimed = set()
+            for other in intent_matches:
+                if other != intent:
+                    claimed |= intent_matches[other] & self.distinctive_keywords.get(other, set())
+            own = matches - (claimed - self.distinctive_keywords.get(intent, set()))
+            if own:
+                candidates[intent] = own
+        owned = dict(candidates)
+        chosen = []
+        while uncovered and candidates and len(chosen) < self.max_intents:
+            best = max(
+                candidates,
+                key=lambda intent: (len(candidates[intent] & uncovered),
+                                    self._distinctive_count(intent, candidates, uncovered),
+                                    len(candidates[intent]))
+            )
+            explained = candidates.pop(best) & uncovered
+            if not explained:
+                break
+            weak = len(explained) < self.min_extra_keywords and not explained & self.distinctive_keywords.get(best, set())
+            if chosen and weak:
+                continue
+            chosen.append({
+                'intent': best,
+                'score': len(intent_matches[best]),
+                'keywords': sorted(intent_matches[best]),
+                'position': min(positions.get(token, 0) for token in owned[best])
+            })
+            uncovered -= owned[best]
+        return chosen
+
+    def _distinctive_count(self, intent: str, intent_matches: Dict[str, Set[str]],
+                           among: Optional[Set[str]] = None) -> int:
+        """Number of the intent's matched keywords (optionally within ``among``) that are distinctive."""
+        matches = intent_matches.get(intent, set())
+        if among is not None:
+            matches = matches & among
+        return len(matches & self.distinctive_keywords.get(intent, set()))
+
+    def _is_agreement(self, words: List[str], processed_input: Dict) -> bool:
+        """A reply of agreement phrases that names no topic ("course?" is classified normally).
+
+        Keywords inside a multi-word idiom such as "of course" do not name a topic.
+        """
+        phrases = agreement_phrases(words)
+        if phrases is None:
+            return False
+        idiom_stems = {stem(word) for phrase in phrases if len(phrase) > 1 for word in phrase}
+        matched = set(processed_input.get('clean_tokens', [])) & self.all_keywords
+        return matched <= idiom_stems
+
+    def resolve_follow_up(self, intent_result: Dict, processed_input: Dict,
+                          last_intent: Optional[str]) -> Dict:
+        """Read a short reply as a continuation of the previous exchange.
+
+        "yes" or "tell me more" after an answer about ``last_intent`` asks for the
+        intent that answer leads to (``follow_up_intents``). "what about hostel?"
+        keeps its own intent, and "and for ECE?" (no intent, but a department or
+        exam) takes ``last_intent``. Returns a new result with ``follow_up`` set to
+        ``last_intent``, or ``intent_result`` itself when the message is not a follow-up.
+        """
+        if not last_intent or last_intent in NON_CONTINUABLE_INTENTS:
+            return intent_result
+        words = re.findall(r"[a-z']+", processed_input.get('original_text', '').lower())
+        if not words or len(words) > self.max_follow_up_words:
+            return intent_result
+
+        intent = intent_result['intent']
+        entities = processed_input.get('entities', {})
+        if self._is_agreement(words, processed_input):
+            intent = self.follow_up_intents.get(last_intent, last_intent)
+        elif not (tuple(words[:1]) in FOLLOW_UP_OPENERS or tuple(words[:2]) in FOLLOW_UP_OPENERS):
+            return intent_result
+        elif intent == 'unknown':
+            if not (entities.get('departments') or entities.get('exams')):
+                return intent_result
+            intent = last_intent
+
+        return {
+            **intent_result,
+            'intent': intent,
+            'confidence': max(intent_result['confidence'], self.follow_up_confidence),
+            'follow_up': last_intent
+        }
@@ -0,0 +1,352 @@
+import json
+import math
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Statuses after which a job no longer changes
+FINISHED_STATUSES = ('done', 'failed')
+
+_JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    owner TEXT,
+    status TEXT,
+    result TEXT,
+    error TEXT,
+    updated REAL
+)
+"""
+
+class Job:
+    """A unit of background work and its outcome."""
+
+    def __init__(self, func: Callable[[], Any], priority: int, owner: Optional[str], created_at: float):
+        self.id = secrets.token_hex(8)
+        self.func = func
+        self.priority = priority
+        self.owner = owner
+        self.status = 'pending'
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'result': self.result if self.status == 'done' else None,
+            'error': self.error
+        }
+
+    def to_record(self) -> Dict:
+        """The job's state as saved in a JobStore."""
+        return {**self.to_dict(), 'owner': self.owner}
+
+    @classmethod
+    def from_record(cls, record: Dict) -> 'Job':
+        """A read-only copy of a job saved by another process."""
+        job = cls(None, 0, record.get('owner'), 0.0)
+        job.id = record['job_id']
+        job.status = record['status']
+        job.result = record.get('result')
+        job.error = record.get('error')
+        if job.status in FINISHED_STATUSES:
+            job.done.set()
+        return job
+
+
+class SQLiteJobStore:
+    """Job states in a SQLite file shared by the worker processes on one host.
+
+    A job runs in the process that accepted it; saving its state here lets any
+    worker answer a poll for it. Rows are deleted ``result_ttl`` seconds after
+    their last update.
+    """
+
+    def __init__(self, path: str, result_ttl: float = 300.0):
+        self.path = path
+        self.result_ttl = result_ttl
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, opened again in a forked child."""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_JOB_SCHEMA)
+            connection.commit()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def save(self, record: Dict) -> None:
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, owner, status, result, error, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (record['job_id'], record['owner'], record['status'], json.dumps(record['result']),
+                 record['error'], now)
+            )
+            if record['status'] in FINISHED_STATUSES:
+                connection.execute("DELETE FROM jobs WHERE updated < ?", (now - self.result_ttl,))
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT owner, status, result, error FROM jobs WHERE job_id = ? AND updated >= ?",
+            (job_id, time.time() - self.result_ttl)
+        ).fetchone()
+        if row is None:
+            return None
+        owner, status, result, error = row
+        return {'job_id': job_id, 'owner': owner, 'status': status, 'result': json.loads(result), 'error': error}
+
+    def delete(self, job_id: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+
+class RedisJobStore:
+    """Job states kept in Redis, shared by workers on every host."""
+
+    def __init__(self, client, result_ttl: float = 300.0, prefix: str = 'chatbot:job:'):
+        self.client = client
+        self.result_ttl = result_ttl
+        self.prefix = prefix
+
+    def save(self, record: Dict) -> None:
+        self.client.set(self.prefix + record['job_id'], json.dumps(record), ex=math.ceil(self.result_ttl))
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + job_id)
+        return json.loads(raw) if raw else None
+
+    def delete(self, job_id: str) -> None:
+        self.client.delete(self.prefix + job_id)
+
+
+def create_job_store(path: Optional[str] = None, redis_url: Optional[str] = None, result_ttl: float = 300.0):
+    """Build a store shared between worker processes: Redis when a URL is given, else a SQLite file.
+
+    The store is opened once here. Returns None when neither is configured or
+    the one configured cannot be opened, so jobs stay in the process that runs them.
+    """
+    if redis_url:
+        if REDIS_AVAILABLE:
+            client = redis.Redis.from_url(redis_url)
+            try:
+                client.ping()
+                return RedisJobStore(client, result_ttl)
+            except redis.RedisError as e:
+                print(f"Warning: cannot reach Redis at {redis_url} ({e}); AI jobs are shared through SQLite only.")
+        else:
+            print("Warning: redis package not installed; AI jobs are shared through SQLite only.")
+    if path:
+        store = SQLiteJobStore(path, result_ttl)
+        try:
+            store._connection()
+            return store
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: cannot open AI job store {path} ({e}); AI answers are returned in the request.")
+    return None
+
+
+class FallbackJobQueue:
+    """Bounded priority queue with a worker pool for slow AI fallbacks.
+
+    Lower priority values run first. When ``max_pending`` jobs are waiting, new
+    submissions are rejected (and counted as drops) so callers can degrade
+    instead of queueing unbounded work. Finished jobs are kept for
+    ``result_ttl`` seconds so clients can collect them.
+
+    Jobs run in the process that accepted them. With a ``store`` (see
+    create_job_store) every state change is saved there too, so ``get`` and
+    ``wait`` also find jobs accepted by other worker processes.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 100, result_ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic, store=None, poll_interval: float = 0.25):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.clock = clock
+        self.store = store
+        self.poll_interval = poll_interval
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=max_pending)
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'dropped': 0, 'running': 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _ensure_started(self) -> None:
+        """Start workers lazily, and again in a forked child whose threads did not survive."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"ai-fallback-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def _cleanup_expired(self) -> None:
+        now = self.clock()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _save(self, job: Job) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save(job.to_record())
+        except Exception as e:
+            print(f"Failed to save job {job.id}: {e}")
+
+    def submit(self, func: Callable[[], Any], priority: int = 0, owner: Optional[str] = None) -> Optional[Job]:
+        """Queue a job; returns None when the queue is full."""
+        self._ensure_started()
+        job = Job(func, priority, owner, self.clock())
+        # Saved before a worker can pick it up, so 'pending' never overwrites a later state
+        self._save(job)
+        with self._lock:
+            self._cleanup_expired()
+            self._seq += 1
+            try:
+                self._queue.put_nowait((priority, self._seq, job))
+            except queue.Full:
+                self._counters['dropped'] += 1
+                dropped = True
+            else:
+                self._jobs[job.id] = job
+                self._counters['submitted'] += 1
+                dropped = False
+        if dropped:
+            if self.store is not None:
+                try:
+                    self.store.delete(job.id)
+                except Exception as e:
+                    print(f"Failed to delete job {job.id}: {e}")
+            return None
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Find a job of this process, or one saved in the store by another process."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None or self.store is None:
+            return job
+        try:
+            record = self.store.load(job_id)
+        except Exception as e:
+            print(f"Failed to load job {job_id}: {e}")
+            return None
+        return Job.from_record(record) if record else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """Block until a job finishes or the timeout passes; returns its latest state.
+
+        Jobs of other processes are polled from the store every ``poll_interval`` seconds.
+        """
+        job = self.get(job_id)
+        if job is None or job.done.is_set():
+            return job
+        with self._lock:
+            local = job_id in self._jobs
+        if local:
+            job.done.wait(timeout)
+            return job
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not job.done.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+            job = self.get(job_id) or job
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+
+            started = self.clock()
+            with self._lock:
+                job.status = 'running'
+                job.started_at = started
+                waited = started - job.created_at
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+                self._counters['running'] += 1
+            self._save(job)
+
+            try:
+                result = job.func()
+                status, error = 'done', None
+            except Exception as e:
+                result, status, error = None, 'failed', str(e)
+
+            with self._lock:
+                job.result = result
+                job.status = status
+                job.error = error
+                job.finished_at = self.clock()
+                self._counters['running'] -= 1
+                self._counters['completed' if status == 'done' else 'failed'] += 1
+            self._save(job)
+            job.done.set()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop workers after the queued jobs finish."""
+        if self._pid != os.getpid():
+            return
+        for _ in self._threads:
+            with self._lock:
+                self._seq += 1
+                seq = self._seq
+            # Sentinels sort after every real job
+            self._queue.put((float('inf'), seq, None))
+        for thread in self._threads:
+            thread.join(timeout)
+        self._pid = None
+
+    def stats(self) -> Dict:
+        """Report queue depth, wait times and drop counts."""
+        with self._lock:
+            started = self._counters['completed'] + self._counters['failed'] + self._counters['running']
+            return {
+                **self._counters,
+                'depth': self._queue.qsize(),
+                'max_pending': self.max_pending,
+                'workers': self.workers,
+                'avg_wait_ms': self._wait_total / started * 1000 if started else 0.0,
+                'max_wait_ms': self._wait_max * 1000
+            }
@@ -0,0 +1,286 @@
+"""General English vocabulary used to tell real words from misspellings.
+
+The spelling corrector only knows the words the classifier can match, so on
+its own it would "correct" any ordinary word that happens to be one edit away
+from a keyword (food -> good, hotel -> hostel). Tokens found here are left as
+typed. Base forms are listed; regular inflections are recognised by their suffix.
+"""
+
+from typing import FrozenSet, Iterable, Iterator
+
+COMMON_WORDS = """
+a able about above abroad absence absent absolute absolutely absorb abstract abuse academic academy accent
+accept acceptable acceptance access accessible accident accommodate accommodation accompany accomplish
+accord according account accountant accounting accuracy accurate accuse achieve achievement acid acknowledge
+acquire across act action active activity actor actress actual actually ad adapt add addition additional
+address adequate adjust adjustment administration administrator admire admission admit adopt adult advance
+advanced advantage adventure advertise advertisement advice advise adviser advisor affair affect afford
+afraid after afternoon afterwards again against age agency agenda agent aggressive ago agree agreement
+agriculture ahead aid aim air aircraft airline airport alarm album alcohol alike alive all allow allowance
+almost alone along alongside already also alter alternative although altogether always amazing ambition
+ambulance among amount amuse analyse analysis analyst analyze ancient and anger angle angry animal announce
+announcement annual another answer anxiety anxious any anybody anyhow anymore anyone anything anyway anywhere
+apart apartment apologize apology apparent apparently appeal appear appearance apple application apply
+appoint appointment appreciate approach appropriate approval approve approximately april architect
+architecture area argue argument arise arm army around arrange arrangement arrest arrival arrive art
+article artificial artist artistic as ashamed aside ask asleep aspect assess assessment assets assign
+assignment assist assistance assistant associate association assume assumption assure at athlete
+atmosphere attach attack attempt attend attendance attention attitude attorney attract attraction
+attractive audience august aunt author authority auto automatic autumn available average avoid awake
+award aware away awful awkward baby back background backward bad badly bag bake balance ball ban band bank
+bar base baseball basic basically basis basket basketball bath bathroom battery battle bay be beach bean
+bear beat beautiful beauty because become bed bedroom beef beer before begin beginning behalf behave
+behavior behaviour behind being belief believe bell belong below belt bench bend beneath benefit beside
+besides best bet better between beyond bicycle big bike bill billion bin biology bird birth birthday bit
+bite bitter black blade blame blank blanket blind block blog blood blow blue board boat body boil bold bomb
+bond bone bonus book boost boot border bored boring born borrow boss both bother bottle bottom bound bowl
+box boy boyfriend brain branch brand brave bread break breakfast breath breathe brick bridge brief briefly
+bright brilliant bring broad broadcast brother brown brush budget build building bullet bunch burn burst
+bus business busy but butter button buy buyer by cabin cabinet cable cafe cafeteria cake calculate
+calculation calendar call calm camera camp campaign can canal cancel cancer candidate candle candy cap
+capable capacity capital captain capture car carbon card care career careful carefully careless carpet
+carry case cash cast castle casual cat catch category cause ceiling celebrate celebration cell cent
+center central centre century ceremony certain certainly chain chair chairman challenge chamber champion
+championship chance change channel chapter character characteristic charge charity chart chase cheap
+cheat check cheek cheese chef chemical chemistry chest chicken chief child childhood chip chocolate choice
+choose church cigarette cinema circle circuit circumstance citizen city civil claim class classic classroom
+clean clear clearly clerk clever click client climate climb clinic clock close closed closely clothes
+clothing cloud club clue coach coaching coal coast coat code coffee cognitive coin cold collapse collar
+colleague collect collection college colour color column combination combine come comedy comfort
+comfortable command comment commercial commission commit commitment committee common communicate
+communication community company compare comparison compete competition competitive complain complaint
+complete completely complex complicated component compose composition comprehensive computer concentrate
+concept concern concerned concert conclude conclusion concrete condition conduct conference confidence
+confident confirm conflict confuse confused confusion congress connect connection conscious consequence
+conservative consider considerable consideration consist consistent constant constantly construct
+construction consult consultant consume consumer contact contain container contemporary content contest
+context continent continue continuous contract contrast contribute contribution control controversial
+convenient conversation convert convince cook cookie cooking cool cooperate cope copy core corn corner
+corporate correct correctly cost costume cottage cotton couch could council count counter country county
+couple courage course court cousin cover crack craft crash crazy cream create creation creative creature
+credit crew crime criminal crisis criteria criterion critic critical criticism criticize crop cross crowd
+crucial cruel cry cultural culture cup cupboard curious currency current currently curriculum curtain
+curve custom customer cut cute cycle dad daily damage dance dancer danger dangerous dark data database
+date daughter day dead deadline deal dealer dear death debate debt decade december decent decide decision
+deck declare decline decorate decrease deep deeply defeat defence defend defense define definitely
+definition degree delay deliberately delicate delicious delight deliver delivery demand democracy
+democratic demonstrate dentist deny depart department departure depend dependent deposit depressed
+depression depth describe description desert deserve design designer desire desk desperate despite
+destination destroy destruction detail detailed detect detective determine develop development device
+devote diagram dialogue diamond diary dictionary die diet differ difference different differently
+difficult difficulty dig digital dimension dinner direct direction directly director dirt dirty disability
+disadvantage disagree disappear disappoint disappointed disaster discipline discount discover discovery
+discrimination discuss discussion disease dish dismiss display distance distant distinct distinguish
+distribute distribution district disturb divide division divorce do doctor document documentary dog
+dollar domestic dominate door double doubt down download downstairs downtown dozen draft drag drama
+dramatic draw drawer drawing dream dress drink drive driver drop drug drum dry due dull during dust duty
+each eager ear early earn earth ease easily east eastern easy eat economic economics economy edge edit
+edition editor educate educated education educational effect effective effectively efficiency efficient
+effort egg eight eighteen eighty either elderly elect election electric electrical electricity electronic
+electronics element elementary elephant eleven else elsewhere email embarrassed emerge emergency emotion
+emotional emphasis empire employ employee employer employment empty enable encounter encourage end
+enemy energy engage engine engineer engineering enhance enjoy enormous enough enquiry enroll enrol
+enrolment enrollment ensure enter enterprise entertain entertainment enthusiasm entire entirely entrance
+entry envelope environment environmental episode equal equally equipment equivalent era error escape
+especially essay essential establish estate estimate ethnic evaluate evaluation even evening event
+eventually ever every everybody everyday everyone everything everywhere evidence evil exact exactly exam
+examination examine example excellent except exception exchange excited excitement exciting exclude excuse
+executive exercise exhibition exist existence exit expand expect expectation expected expedition expense
+expensive experience experienced experiment expert explain explanation explode explore explosion export
+expose express expression extend extension extensive extent external extra extraordinary extreme extremely
+eye face facility fact factor factory faculty fail failure fair fairly faith fall false familiar family
+famous fan fancy fantastic far farm farmer fashion fast fat father fault favour favor favourite favorite
+fear feature february federal fee feed feedback feel feeling fellow female fence festival few fewer field
+fifteen fifth fifty fight fighting figure file fill film final finally finance financial find finding fine
+finger finish fire firm first firstly fish fit fitness five fix flag flat flight float flood floor flow
+flower fly focus fold folk follow following food foot football for force foreign forest forever forget
+forgive fork form formal former formula forth fortnight fortune forty forward found foundation four
+fourteen fourth frame free freedom freeze frequency frequent frequently fresh friday fridge friend friendly
+friendship frighten from front fruit frustrated fuel full fully fun function fund fundamental funding
+funny furniture further furthermore future gain gallery game gap garage garden gas gate gather general
+generally generate generation generous gentle gentleman genuine get giant gift girl girlfriend give glad
+glass global glove go goal god gold golden golf good goodbye goods govern government governor grab grade
+gradually graduate graduation grain grand grandfather grandmother grant graph grass grateful great green
+grey gray grocery ground group grow growth guarantee guard guess guest guidance guide guilty guitar gun guy
+gym habit hair half hall hand handle hang happen happy harbour harbor hard hardly harm hat hate have he
+head headline health healthy hear hearing heart heat heaven heavy height hello help helpful hence her here
+hero herself hesitate hi hide high highlight highly highway hill him himself hire his historic historical
+history hit hobby hold hole holiday hollow holy home homework honest honour honor hope horrible horror horse
+hospital host hostel hot hotel hour house household housing how however huge human humour humor hundred
+hungry hunt hurry hurt husband ice idea ideal identify identity if ignore ill illegal illness illustrate
+image imagination imagine immediate immediately immigrant impact implement implication imply import
+importance important impose impossible impress impression impressive improve improvement in inch incident
+include including income increase increasingly incredible indeed independence independent index indicate
+indication individual indoor industrial industry inevitable infant infection influence inform informal
+information infrastructure ingredient initial initially initiative injure injury inner innocent innovation
+input inquiry insect inside insight insist inspector inspire install instance instant instead institute
+institution instruction instructor instrument insurance intellectual intelligence intelligent intend
+intense intention interest interested interesting internal international internet interpret interrupt
+interval interview into introduce introduction invent invention invest investigate investigation
+investment invitation invite involve iron island issue it item its itself jacket january jazz jeans job
+join joint joke journal journalist journey joy judge judgement judgment juice july jump june junior jury
+just justice justify keen keep key keyboard kick kid kill kilometre kilometer kind king kiss kitchen knee
+knife knock know knowledge lab label laboratory labour labor lack lady lake land landscape language laptop
+large largely last late lately later latest laugh launch law lawyer lay layer lazy lead leader leadership
+leaf league lean learn learning least leather leave lecture lecturer left leg legal leisure lemon lend
+length less lesson let letter level liberal library licence license lid lie life lift light like likely
+limit limited line link lip list listen literally literature little live lively living load loan local
+locate location lock logic logical lonely long look loose lord lose loss lost lot loud love lovely low
+lower luck lucky lunch machine mad magazine magic mail main mainly maintain maintenance major majority make
+male mall man manage management manager manner manufacture many map march mark market marketing marriage
+married marry mass massive master match mate material mathematics maths math matter maximum may maybe mayor
+me meal mean meaning means meanwhile measure meat mechanic mechanical mechanism medal media medical
+medicine medium meet meeting member membership memory mental mention menu mere merely merit mess message
+metal method metre meter middle midnight might mild mile military milk mind mine minimum minister ministry
+minor minority minute mirror miss missing mission mistake mix mixture mobile model modern modest mom moment
+monday money monitor month monthly mood moon moral more moreover morning mortgage most mostly mother motion
+motor mountain mouse mouth move movement movie much mud multiple mum murder muscle museum music musical
+musician must my myself mystery nail name narrow nation national native natural naturally nature near
+nearby nearly neat necessarily necessary neck need needle negative neighbour neighbor neighbourhood neither
+nephew nerve nervous net network never nevertheless new news newspaper next nice niece night nine nineteen
+ninety no nobody noise noisy none nor normal normally north northern nose not note nothing notice novel
+november now nowhere nuclear number nurse nut object objective obligation observation observe obtain
+obvious obviously occasion occasionally occupation occupy occur ocean october odd of off offence offense
+offer office officer official often oil okay old on once one online only onto open opening operate
+operation operator opinion opponent opportunity oppose opposite option or orange order ordinary
+organisation organization organise organize origin original originally other otherwise ought our
+ourselves out outcome outdoor outside oven over overall overcome overseas owe own owner ownership pace
+pack package page pain painful paint painter painting pair palace pale pan panel panic paper parade
+paragraph parent park parking parliament part participant participate particular particularly partly
+partner partnership party pass passage passenger passion passport past path patience patient pattern pause
+pay payment peace peaceful peak pen penalty pencil people pepper per percent percentage perfect perfectly
+perform performance perhaps period permanent permission permit person personal personality personally
+perspective persuade pet phase phenomenon philosophy phone photo photograph photographer photography phrase
+physical physically physics piano pick picture piece pig pile pill pilot pin pink pipe pitch pity place
+plain plan plane planet planning plant plastic plate platform play player pleasant please pleased pleasure
+plenty plot plus pocket poem poet poetry point pole police policy polite political politician politics
+pollution pool poor pop popular population port portion portrait pose position positive possess
+possession possibility possible possibly post poster pot potato potential pound pour poverty powder power
+powerful practical practice practise praise pray prayer precious precise precisely predict prefer
+preference pregnant preparation prepare prepared presence present presentation preserve president press
+pressure pretend pretty prevent previous previously price pride priest primary prime prince princess
+principal principle print printer prior priority prison prisoner private prize probably problem procedure
+proceed process produce producer product production profession professional professor profile profit
+program programme programming progress project promise promote promotion prompt proof proper properly
+property proportion proposal propose prospect protect protection protest proud prove provide provided
+provision pub public publication publish pull punishment pupil purchase pure purple purpose pursue push
+put qualification qualified qualify quality quantity quarter queen question queue quick quickly quiet
+quietly quit quite quiz quote race racing radio rail railway rain raise range rank rapid rapidly rare
+rarely rate rather raw reach react reaction read reader reading ready real realistic reality realise
+realize really reason reasonable reasonably recall receipt receive recent recently reception recipe
+recognise recognize recommend recommendation record recording recover recovery recruit recruitment red
+reduce reduction refer reference reflect reflection reform refrigerator refuse regard region regional
+register registration regret regular regularly regulation reject relate relation relationship relative
+relatively relax relaxed release relevant relief religion religious rely remain remaining remark
+remarkable remember remind remote remove rent repair repeat replace reply report reporter represent
+representative reputation request require requirement rescue research researcher reservation reserve
+resident resign resist resolve resort resource respect respond response responsibility responsible rest
+restaurant restore restrict restriction result retain retire retirement return reveal revenue reverse
+review revise revision revolution reward rhythm rice rich rid ride right ring rise risk river road rob
+robot rock role roll romantic roof room root rope rough round route routine row royal rub rubbish rude
+ruin rule run runner rural rush sad safe safety sail salad salary sale salt same sample sand sandwich
+satellite satisfaction satisfied satisfy saturday sauce save saving say scale scandal scare scared scene
+schedule scheme scholar scholarship school science scientific scientist scope score scream screen screw
+sea search season seat second secondary secondly secret secretary section sector secure security see seed
+seek seem select selection self sell semester seminar send senior sense sensible sensitive sentence
+separate september sequence series serious seriously servant serve service session set setting settle
+seven seventeen seventy several severe sex shade shadow shake shall shallow shame shape share sharp she
+sheep sheet shelf shell shelter shift shine ship shirt shock shoe shoot shop shopping short shortly shot
+should shoulder shout show shower shut shy sick side sight sign signal signature significant significantly
+silence silent silk silly silver similar similarly simple simply since sincere sing singer single sink sir
+sister sit site situation six sixteen sixty size skill skilled skin skirt sky sleep slice slide slight
+slightly slip slow slowly small smart smell smile smoke smooth snake snow so social society sock soft
+software soil soldier solid solution solve some somebody somehow someone something sometimes somewhat
+somewhere son song soon sorry sort soul sound soup source south southern space spare speak speaker special
+specialist specific specifically speech speed spell spelling spend spirit spite split spoil sponsor spoon
+sport spot spread spring square stable staff stage stair stake stamp stand standard star stare start state
+statement station statistic status stay steady steal steam steel step stick still stock stomach stone stop
+storage store storm story straight strange stranger strategy stream street strength stress stretch strict
+strike string strip stroke strong strongly structure struggle student studio study stuff stupid style
+subject submit substance succeed success successful successfully such suck sudden suddenly suffer
+sufficient sugar suggest suggestion suit suitable summary summer sun sunday super supermarket supply support
+supporter suppose sure surely surface surgery surprise surprised surprising surround survey survive suspect
+swap sweet swim swimming switch symbol sympathy system table tablet tail take tale talent talk tall tank
+tap target task taste tax taxi tea teach teacher teaching team tear technical technique technology teenager
+telephone television tell temperature temporary ten tend tendency tennis tension tent term terrible
+terribly territory test text than thank thanks that the theatre theater their them theme themselves then
+theory therapy there therefore these they thick thief thin thing think thinking third thirsty thirteen
+thirty this thorough those though thought thousand thread threat threaten three throat through throughout
+throw thursday thus ticket tidy tie tight till time timetable tiny tip tired title to today toe together
+toilet tomato tomorrow tone tongue tonight too tool tooth top topic total totally touch tough tour tourism
+tourist toward towards towel tower town toy track trade tradition traditional traffic train trainer
+training transfer transform translate translation transport transportation trap travel treat treatment
+tree trend trial trick trip troop trouble trousers truck true truly trust truth try tuesday tuition tune
+turn tutor twelve twenty twice twin two type typical typically tyre ugly ultimate ultimately unable uncle
+under undergraduate underground understand understanding unemployed unemployment unexpected unfair
+unfortunately uniform union unique unit united universe university unknown unless unlike unlikely until
+unusual up update upon upper upset upstairs urban urge urgent us use used useful user usual usually
+vacation valley valuable value van variety various vary vast vegetable vehicle venue version very via
+victim victory video view village violence violent virtual virus visa visible vision visit visitor visual
+vital voice volume volunteer vote wage wait waiter wake walk wall wallet want war warm warn warning wash
+waste watch water wave way we weak wealth weapon wear weather web website wedding wednesday week weekday
+weekend weekly weigh weight welcome welfare well west western wet what whatever wheel when whenever where
+whereas wherever whether which while whisper white who whoever whole whom whose why wide widely wife wild
+will willing win wind window wine wing winner winter wire wise wish with withdraw within without witness
+woman wonder wonderful wood wooden word work worker working workshop world worried worry worse worst worth
+would wound wrap write writer writing wrong yard yeah year yellow yes yesterday yet you young youth
+yourself zero zone
+"""
+
+# Irregular forms the stemmer cannot map back to a listed word
+IRREGULAR_FORMS = """
+am are is was were been being did does done had has having went gone came come made said told paid laid
+gave given took taken got gotten saw seen knew known thought brought bought caught taught sought fought
+found felt left kept meant met sent spent lent built lost won sold held stood understood wrote written
+ran rode ridden spoke spoken broke broken chose chosen drove driven ate eaten fell fallen flew flown grew
+grown threw thrown wore worn began begun drank drunk sang sung swam swum rang rung sat slept led fed read
+heard hid hidden shook shaken stole stolen woke woken forgot forgotten forgave forgiven rose risen
+children men women people feet teeth mice better best worse worst more most less least fewer further
+farther elder eldest i my mine he him his she her hers we our ours they their theirs it its you your
+yours this these those an
+"""
+
+# Academic terms and abbreviations common in admission enquiries
+ACADEMIC_TERMS = """
+btech mtech mba mca bsc msc ba ma bcom mcom phd bba bca be me diploma polytechnic hod cgpa gpa sgpa ug pg
+semester syllabus curriculum intake lateral entry counselling counseling hostel mess canteen placement
+placements internship cutoff rank merit quota nri aicte naac nba ugc jntu autonomous affiliated
+"""
+
+
+# (suffix, replacement) pairs that turn a regular inflection back into its base form
+INFLECTIONS = [
+    ('ies', 'y'), ('ied', 'y'), ('ier', 'y'), ('iest', 'y'), ('ily', 'y'),
+    ('ing', ''), ('ing', 'e'), ('ed', ''), ('ed', 'e'), ('es', ''), ('s', ''),
+    ('er', ''), ('er', 'e'), ('est', ''), ('est', 'e'), ('ly', ''), ('ment', ''), ('ness', ''),
+]
+
+
+def build_lexicon(*word_lists: str) -> FrozenSet[str]:
+    words = set()
+    for word_list in word_lists:
+        words.update(word_list.split())
+    return frozenset(words)
+
+
+ENGLISH_WORDS = build_lexicon(COMMON_WORDS, IRREGULAR_FORMS, ACADEMIC_TERMS)
+
+
+def base_forms(token: str) -> Iterator[str]:
+    """Candidate base forms of a possibly inflected word ("hotels" -> "hotel", "stopped" -> "stop")."""
+    for suffix, replacement in INFLECTIONS:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            base = token[:-len(suffix)]
+            yield base + replacement
+            if not replacement and len(base) > 2 and base[-1] == base[-2]:
+                yield base[:-1]
+
+
+class Lexicon:
+    """Membership test for real words, including regular inflections of listed words."""
+
+    def __init__(self, words: Iterable[str] = ENGLISH_WORDS):
+        self.words = frozenset(words)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.words or any(base in self.words for base in base_forms(token))
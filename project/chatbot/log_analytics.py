@@ -0,0 +1,215 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import math
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Prefix of the structured events written to the chat_events logger
+EVENT_MARKER = '{"event"'
+
+# Line written by chat() before structured events existed
+LEGACY_LINE = re.compile(
+    r"Session (?P<session>\S+): Intent=(?P<intent>\S+), "
+    r"Confidence=(?P<confidence>[\d.]+)(?:, Source=(?P<source>\S+))?"
+)
+
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def open_log(path: str) -> TextIO:
+    """Open a plain or gzip/bz2/xz compressed log as text; ``-`` reads stdin."""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    for suffix, opener in _OPENERS.items():
+        if path.endswith(suffix):
+            return opener(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def parse_line(line: str) -> Optional[Dict]:
+    """Parse a structured chat event or a legacy interaction line."""
+    start = line.find(EVENT_MARKER)
+    if start != -1:
+        try:
+            event = json.loads(line[start:])
+        except ValueError:
+            return None
+        return event if event.get('event') == 'chat' else None
+
+    match = LEGACY_LINE.search(line)
+    if match:
+        return {
+            'event': 'chat',
+            'session': match.group('session'),
+            'intent': match.group('intent'),
+            'confidence': float(match.group('confidence').rstrip('.')),
+            'source': match.group('source') or 'unknown'
+        }
+    return None
+
+
+def iter_events(paths: Iterable[str]) -> Iterator[Dict]:
+    """Stream chat events from log files one line at a time."""
+    for path in paths:
+        with open_log(path) as handle:
+            for line in handle:
+                event = parse_line(line)
+                if event is not None:
+                    yield event
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram; percentiles are accurate to within ``growth``.
+
+    Memory is fixed by the value range, not by the number of samples.
+    """
+
+    def __init__(self, min_value: float = 0.01, max_value: float = 600000.0, growth: float = 1.05):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts = [0] * (self._bucket(max_value) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_growth) + 1
+
+    def add(self, value: float) -> None:
+        index = min(self._bucket(value), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0-100)."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * q / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.max, self.min_value * self.growth ** index)
+        return self.max
+
+
+class HeavyHitters:
+    """Approximate top-k counter in fixed memory (Misra-Gries).
+
+    Counts are lower bounds; any key seen more than total / capacity times is
+    guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, str] = {}
+
+    def add(self, key: str, example: str) -> None:
+        if key in self.counts:
+            self.counts[key] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = 1
+            self.examples[key] = example
+        else:
+            # Every eviction pays for an earlier insert, so this is amortised O(1)
+            for existing in list(self.counts):
+                self.counts[existing] -= 1
+                if not self.counts[existing]:
+                    del self.counts[existing]
+                    del self.examples[existing]
+
+    def top(self, k: int) -> List[Tuple[str, int, str]]:
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(key, count, self.examples[key]) for key, count in ranked]
+
+
+class ChatLogAnalyzer:
+    """Aggregate chat events in constant memory."""
+
+    def __init__(self, normalize=None, max_intents: int = 200, cluster_capacity: int = 1000):
+        self.normalize = normalize
+        self.max_intents = max_intents
+        self.events = 0
+        self.intents: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        # Size of the prompts sent to AI providers (events with prompt_tokens)
+        self.prompts = 0
+        self.prompt_tokens = 0
+        self.max_prompt_tokens = 0
+        self.unknown_queries = HeavyHitters(cluster_capacity)
+        self.unknown_without_text = 0
+
+    def add(self, event: Dict) -> None:
+        self.events += 1
+        intent = event.get('intent') or 'unknown'
+        if intent not in self.intents and len(self.intents) >= self.max_intents:
+            intent = '(other)'
+        self.intents[intent] = self.intents.get(intent, 0) + 1
+
+        source = event.get('source') or 'unknown'
+        self.sources[source] = self.sources.get(source, 0) + 1
+
+        latency = event.get('latency_ms')
+        if latency is not None:
+            self.latency.add(float(latency))
+
+        prompt_tokens = event.get('prompt_tokens')
+        if prompt_tokens is not None:
+            self.prompts += 1
+            self.prompt_tokens += int(prompt_tokens)
+            self.max_prompt_tokens = max(self.max_prompt_tokens, int(prompt_tokens))
+
+        if intent == 'unknown':
+            message = event.get('message')
+            if not message:
+                self.unknown_without_text += 1
+            else:
+                key = self.normalize(message) if self.normalize else message.lower().strip()
+                self.unknown_queries.add(key or message.lower().strip(), message)
+
+    def consume(self, events: Iterable[Dict]) -> 'ChatLogAnalyzer':
+        for event in events:
+            self.add(event)
+        return self
+
+    def report(self, top: int = 10) -> Dict:
+        total = self.events
+        return {
+            'events': total,
+            'intents': dict(sorted(self.intents.items(), key=lambda item: -item[1])),
+            'sources': dict(sorted(self.sources.items(), key=lambda item: -item[1])),
+            'ai_fallback_rate': self.sources.get('ai', 0) / total if total else 0.0,
+            'unknown_rate': self.intents.get('unknown', 0) / total if total else 0.0,
+            'latency_ms': {
+                'count': self.latency.total,
+                'mean': self.latency.sum / self.latency.total if self.latency.total else 0.0,
+                'p50': self.latency.percentile(50),
+                'p90': self.latency.percentile(90),
+                'p99': self.latency.percentile(99),
+                'max': self.latency.max
+            },
+            'prompt_tokens': {
+                'count': self.prompts,
+                'mean': self.prompt_tokens / self.prompts if self.prompts else 0.0,
+                'max': self.max_prompt_tokens
+            },
+            'unknown_clusters': [
+                {'key': key, 'count': count, 'example': example}
+                for key, count, example in self.unknown_queries.top(top)
+            ]
+        }
@@ -1,11 +1,33 @@
 import re
 import string
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
+from chatbot.entity_recognizer import EntityRecognizer
+from chatbot.lexicon import Lexicon
+from chatbot.spell_corrector import SpellCorrector
+from chatbot.stemmer import stem
+from chatbot.training_data import TRAINING_DATA, DEPARTMENT_ALIASES, EXAM_ALIASES
+
+# Pattern entities, scanned together in one pass. Each pattern is tried at word
+# boundaries, and earlier entries win where several match at the same position
+# (a year is not also reported as a number). Inner groups must be non-capturing.
+ENTITY_PATTERNS = [
+    ('emails', r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'),
+    ('percentages', r'\d+(?:\.\d+)?\s?%'),
+    ('years', r'(?:19|20)\d{2}\b'),
+    ('numbers', r'\d+(?:\.\d+)?\b'),
+]
+
+
+def compile_entity_patterns(patterns: List[Tuple[str, str]]) -> re.Pattern:
+    """Combine ``(type, pattern)`` pairs into one regex with a named group per type."""
+    alternatives = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns)
+    return re.compile(rf'\b(?:{alternatives})')
+
 
 class NLPProcessor:
     """Natural Language Processing component for text preprocessing and analysis."""
     
-    def __init__(self):
+    def __init__(self, training_data: Optional[Dict] = None):
         self.stop_words = {
             'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
             'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 
@@ -20,29 +42,6 @@ class NLPProcessor:
             'further', 'then', 'once'
         }
         
-        # Simple lemmatization map for common plural/synonym forms
-        self.lemma_map = {
-            'admissions': 'admission',
-            'requirements': 'requirement',
-            'exams': 'exam',
-            'fees': 'fee',
-            'payments': 'payment',
-            'courses': 'course',
-            'programs': 'program',
-            'subjects': 'subject',
-            'facilities': 'facility',
-            'libraries': 'library',
-            'labs': 'lab',
-            'hostels': 'hostel',
-            'campuses': 'campus',
-            'teachers': 'teacher',
-            'professors': 'professor',
-            'companies': 'company',
-            'salaries': 'salary',
-            'placements': 'placement',
-            'scholarships': 'scholarship'
-        }
-
         # College-specific keywords and their categories
         self.keyword_categories = {
             'admission': ['admission', 'apply', 'application', 'eligibility', 'requirement', 
@@ -64,6 +63,38 @@ class NLPProcessor:
             'deadline': ['deadline', 'date', 'closing', 'last'],
             'entrance': ['entrance', 'exam', 'test', 'cutoff', 'eamcet', 'ecet']
         }
+        
+        # Keywords are matched against stemmed tokens
+        self.keyword_stems = {
+            category: {stem(keyword) for keyword in keywords}
+            for category, keywords in self.keyword_categories.items()
+        }
+        
+        self.entity_pattern = compile_entity_patterns(ENTITY_PATTERNS)
+        
+        # Department and exam names, matched on the raw tokens before spelling correction
+        self.entity_recognizer = EntityRecognizer(self.tokenize)
+        self.entity_recognizer.add_table('departments', DEPARTMENT_ALIASES)
+        self.entity_recognizer.add_table('exams', EXAM_ALIASES)
+        
+        # Spelling correction over the vocabulary the classifier can match; real
+        # English words outside it are left as typed
+        self.spell_corrector = SpellCorrector(known_words=Lexicon())
+        self._build_vocabulary(training_data if training_data is not None else TRAINING_DATA)
+    
+    def _build_vocabulary(self, training_data: Dict) -> None:
+        """Index keywords and example words for spelling correction."""
+        for data in training_data.values():
+            # Keywords decide classification, so they win ties against example words
+            self.spell_corrector.build(data.get('keywords', []), count=10)
+            for example in data.get('examples', []):
+                self.spell_corrector.build(self.tokenize(example))
+        
+        for keywords in self.keyword_categories.values():
+            self.spell_corrector.build(keywords, count=10)
+        
+        # Keep misspelt department names close to the real ones instead of other words
+        self.spell_corrector.build(self.entity_recognizer.vocabulary(), count=10)
     
     def tokenize(self, text: str) -> List[str]:
         """Tokenize text into individual words."""
@@ -75,9 +106,16 @@ class NLPProcessor:
         tokens = [token.strip() for token in text.split() if token.strip()]
         return tokens
     
-    def lemmatize_tokens(self, tokens: List[str]) -> List[str]:
-        """Apply simple lemma mapping to tokens."""
-        return [self.lemma_map.get(token, token) for token in tokens]
+    def correct_spelling(self, tokens: List[str]) -> List[str]:
+        """Replace misspelt tokens with the closest known vocabulary word."""
+        return [
+            token if token in self.stop_words or token.isdigit() else self.spell_corrector.correct(token)
+            for token in tokens
+        ]
+    
+    def stem_tokens(self, tokens: List[str]) -> List[str]:
+        """Reduce tokens to their Porter stems, leaving stop words intact."""
+        return [token if token in self.stop_words else stem(token) for token in tokens]
 
     def remove_stop_words(self, tokens: List[str]) -> List[str]:
         """Remove common stop words from tokens."""
@@ -87,29 +125,38 @@ class NLPProcessor:
         """Extract and categorize keywords from tokens."""
         categorized_keywords = {}
         
-        for category, keywords in self.keyword_categories.items():
+        for category, keywords in self.keyword_stems.items():
             found_keywords = [token for token in tokens if token in keywords]
             if found_keywords:
                 categorized_keywords[category] = found_keywords
         
         return categorized_keywords
     
-    def extract_entities(self, text: str) -> Dict[str, List[str]]:
-        """Extract named entities like numbers, emails, etc."""
-        entities = {
-            'numbers': re.findall(r'\b\d+\b', text),
-            'emails': re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
-            'years': re.findall(r'\b(19|20)\d{2}\b', text),
-            'percentages': re.findall(r'\b\d+(\.\d+)?%\b', text)
-        }
+    def find_entities(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """Scan the text once for pattern entities, as ``(type, value, start, end)`` spans."""
+        return [
+            (match.lastgroup, match.group(), match.start(), match.end())
+            for match in self.entity_pattern.finditer(text)
+        ]
+    
+    def extract_entities(self, text: str, tokens: Optional[List[str]] = None,
+                         spans: Optional[List[Tuple[str, str, int, int]]] = None) -> Dict[str, List[str]]:
+        """Extract named entities like numbers, emails, departments and exams."""
+        if tokens is None:
+            tokens = self.tokenize(text)
+        if spans is None:
+            spans = self.find_entities(text)
         
-        # Remove empty lists
-        return {k: v for k, v in entities.items() if v}
+        entities: Dict[str, List[str]] = {}
+        for entity_type, value, _, _ in spans:
+            entities.setdefault(entity_type, []).append(value)
+        entities.update(self.entity_recognizer.extract(tokens))
+        return entities
     
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate simple similarity between two texts based on common words."""
-        tokens1 = set(self.remove_stop_words(self.tokenize(text1)))
-        tokens2 = set(self.remove_stop_words(self.tokenize(text2)))
+        tokens1 = set(self.stem_tokens(self.remove_stop_words(self.tokenize(text1))))
+        tokens2 = set(self.stem_tokens(self.remove_stop_words(self.tokenize(text2))))
         
         if not tokens1 or not tokens2:
             return 0.0
@@ -121,11 +168,13 @@ class NLPProcessor:
     
     def process(self, text: str) -> Dict:
         """Main processing function that returns comprehensive text analysis."""
-        tokens = self.tokenize(text)
-        tokens = self.lemmatize_tokens(tokens)
+        raw_tokens = self.tokenize(text)
+        tokens = self.correct_spelling(raw_tokens)
+        tokens = self.stem_tokens(tokens)
         clean_tokens = self.remove_stop_words(tokens)
         keywords = self.extract_keywords(clean_tokens)
-        entities = self.extract_entities(text)
+        entity_spans = self.find_entities(text)
+        entities = self.extract_entities(text, raw_tokens, entity_spans)
         
         return {
             'original_text': text,
@@ -133,6 +182,7 @@ class NLPProcessor:
             'clean_tokens': clean_tokens,
             'keywords': keywords,
             'entities': entities,
+            'entity_spans': entity_spans,
             'word_count': len(tokens),
             'clean_word_count': len(clean_tokens)
         }
\ No newline at end of file
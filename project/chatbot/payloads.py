@@ -0,0 +1,68 @@
+import gzip
+from typing import Any
+
+from flask import Request, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Bodies smaller than this are sent as is; a header-sized saving is not worth the CPU
+DEFAULT_COMPRESS_MIN_SIZE = 1024
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson, straight to bytes.
+
+    Types orjson does not know go through the default provider's conversions
+    (dates, decimals, UUIDs, dataclasses). Only install it when
+    ``ORJSON_AVAILABLE`` is true.
+    """
+
+    def _options(self, sort_keys: bool, indent: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def compress_response(response: Response, request: Request, min_size: int = DEFAULT_COMPRESS_MIN_SIZE,
+                      level: int = 6) -> Response:
+    """Gzip a large JSON body when the client accepts it.
+
+    Streamed responses (server-sent events), already encoded ones and ones with
+    an ETag (whose validator describes the uncompressed body) are left alone.
+    """
+    if (response.direct_passthrough or response.is_streamed
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers or 'ETag' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if request.accept_encodings['gzip'] <= 0:
+        return response
+
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=level))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
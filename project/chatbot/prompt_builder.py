@@ -0,0 +1,81 @@
+import math
+from typing import Dict, List, Sequence
+
+# Rough size of a token for English text; close enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+PROMPT_INSTRUCTIONS = (
+    "You answer prospective students of {name}. Use the facts below if relevant, "
+    "else give brief general guidance. Redirect non-college questions politely. "
+    "Answer in at most {max_words} words."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about ``max_tokens`` tokens, at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    text = ' '.join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0] + '…'
+
+
+def format_turn(turn: Dict, max_tokens: int) -> str:
+    """One exchange from the conversation history, each side cut to ``max_tokens``."""
+    return (f"Student: {truncate_to_tokens(turn['user_message'], max_tokens)}\n"
+            f"Assistant: {truncate_to_tokens(turn['bot_response'], max_tokens)}")
+
+
+def summarize_turns(questions: Sequence[str], token_budget: int) -> str:
+    """Summarize earlier exchanges as the newest of their questions that fit the budget."""
+    prefix = "Earlier the student asked: "
+    used = estimate_tokens(prefix)
+    kept = []
+    for question in reversed(questions):
+        cost = estimate_tokens(question) + 1
+        if used + cost > token_budget:
+            break
+        kept.append(question)
+        used += cost
+    return prefix + "; ".join(reversed(kept)) + "." if kept else ""
+
+
+def build_prompt(user_message: str, college_name: str, snippets: List[str],
+                 token_budget: int = 200, max_words: int = 120,
+                 history: Sequence[str] = (), summary: str = "") -> str:
+    """Build an AI prompt with as many relevant facts as fit in the token budget.
+
+    Snippets are expected in relevance order; the instructions and the question
+    are always included, so the budget only limits how many facts are attached.
+    ``history`` (formatted recent turns) and ``summary`` come from
+    ConversationManager.get_prompt_context, which applies their own budget.
+    """
+    header = PROMPT_INSTRUCTIONS.format(name=college_name, max_words=max_words)
+    question = f'Question: "{user_message}"'
+    used = estimate_tokens(header) + estimate_tokens(question)
+
+    facts = []
+    for snippet in snippets:
+        line = f"- {snippet}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget:
+            break
+        facts.append(line)
+        used += cost
+
+    parts = [header]
+    if facts:
+        parts.append("College facts:\n" + "\n".join(facts))
+    if summary:
+        parts.append(summary)
+    if history:
+        parts.append("Recent conversation:\n" + "\n".join(history))
+    parts.append(question)
+    return "\n\n".join(parts)
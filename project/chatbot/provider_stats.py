@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Callable, Dict, List, Sequence
+
+
+class ProviderStats:
+    """Exponentially weighted latency and success rate per AI provider or model.
+
+    Attempts are ordered by expected seconds per successful answer (mean attempt
+    latency divided by success rate), which minimises the expected time to an
+    answer when they are tried one after another. Each key keeps a fast average
+    (weight ``alpha``) and a slow long-run one (weight ``baseline_alpha``). Without
+    new attempts the fast estimate drifts back to the long-run one with a
+    half-life of ``half_life`` seconds, so a provider that had a slow or failing
+    stretch is tried again once its usual performance would beat the current
+    favourite, while a provider that is always slow is not promoted by idling.
+    A key not tried for ``explore_interval`` seconds is looked at again as if it
+    were new, in case it has recovered. Keys never tried start at the prior
+    (``prior_latency``, always successful).
+    """
+
+    def __init__(self, alpha: float = 0.1, baseline_alpha: float = 0.02, half_life: float = 60.0,
+                 explore_interval: float = 600.0, listed_order_margin: float = 0.35,
+                 prior_latency: float = 1.0, min_latency: float = 0.05, min_success_rate: float = 0.01,
+                 clock: Callable[[], float] = time.monotonic):
+        # Weight of the newest attempt; higher adapts faster but is noisier
+        self.alpha = alpha
+        self.baseline_alpha = baseline_alpha
+        self.half_life = half_life
+        self.explore_interval = explore_interval
+        self.listed_order_margin = listed_order_margin
+        self.prior_latency = prior_latency
+        # Floors, so an instant failure (e.g. no API key) does not look cheap
+        self.min_latency = min_latency
+        self.min_success_rate = min_success_rate
+        self.clock = clock
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float, success: bool) -> None:
+        """Fold one attempt's latency (successful or not) and outcome into the averages."""
+        now = self.clock()
+        outcome = 1.0 if success else 0.0
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = {
+                    'latency': seconds, 'success_rate': outcome,
+                    'baseline_latency': seconds, 'baseline_success_rate': outcome,
+                    'attempts': 1, 'updated': now
+                }
+                return
+            if now - stats['updated'] >= self.explore_interval:
+                # After a long gap the fast averages are stale; start them again from this attempt
+                stats['latency'], stats['success_rate'] = seconds, outcome
+            else:
+                stats['latency'] += self.alpha * (seconds - stats['latency'])
+                stats['success_rate'] += self.alpha * (outcome - stats['success_rate'])
+            stats['baseline_latency'] += self.baseline_alpha * (seconds - stats['baseline_latency'])
+            stats['baseline_success_rate'] += self.baseline_alpha * (outcome - stats['baseline_success_rate'])
+            stats['attempts'] += 1
+            stats['updated'] = now
+
+    def expected_cost(self, key: str) -> float:
+        """Expected seconds per successful answer."""
+        stats = self._stats.get(key)
+        if stats is None:
+            return self.prior_latency
+        idle = max(self.clock() - stats['updated'], 0.0)
+        weight = 0.5 ** (idle / self.half_life)
+        latency = stats['baseline_latency'] + (stats['latency'] - stats['baseline_latency']) * weight
+        success_rate = stats['baseline_success_rate'] + (stats['success_rate'] - stats['baseline_success_rate']) * weight
+        cost = max(latency, self.min_latency) / max(success_rate, self.min_success_rate)
+        if idle >= self.explore_interval:
+            # Not tried for a while: its averages may be out of date in either direction
+            return min(cost, self.prior_latency)
+        return cost
+
+    def order(self, names: Sequence[str], prefix: str = '') -> List[str]:
+        """Sort names by expected cost of ``prefix + name``; ties keep the given order.
+
+        Each position down the given list adds ``listed_order_margin`` to a name's
+        cost (as a fraction), so a later name only moves ahead when it is clearly
+        cheaper, not on noise in the averages.
+        """
+        weights = {name: (1.0 + self.listed_order_margin) ** index for index, name in enumerate(names)}
+        return sorted(names, key=lambda name: self.expected_cost(prefix + name) * weights[name])
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                key: {
+                    'latency_s': round(stats['latency'], 3),
+                    'success_rate': round(stats['success_rate'], 3),
+                    'attempts': int(stats['attempts'])
+                }
+                for key, stats in self._stats.items()
+            }
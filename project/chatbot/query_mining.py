@@ -0,0 +1,353 @@
+import copy
+import math
+import operator
+import random
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from chatbot.retrieval import content_tokens
+
+# Vectors are hashed into this many dimensions
+HASH_DIMENSIONS = 1 << 18
+
+# Question and domain words too common to identify what a cluster is about
+GENERIC_WORDS = {
+    'how', 'when', 'where', 'why', 'from', 'time', 'today', 'many', 'much', 'good',
+    'best', 'get', 'college', 'campus', 'rgm', 'student', 'students'
+}
+
+SparseVector = Dict[int, float]
+
+
+def _hash(feature: str) -> int:
+    # crc32 rather than hash() so vectors are stable across runs
+    return zlib.crc32(feature.encode('utf-8')) % HASH_DIMENSIONS
+
+
+class NgramVectorizer:
+    """Hashed, IDF-weighted word and character n-gram vectors.
+
+    Word unigrams and bigrams of the stemmed content tokens capture the topic;
+    character trigrams of each token make misspellings land near each other.
+    """
+
+    def __init__(self, nlp_processor):
+        self.nlp_processor = nlp_processor
+        self.idf: Dict[int, float] = {}
+
+    def tokens(self, text: str) -> List[str]:
+        nlp = self.nlp_processor
+        return content_tokens(nlp.stem_tokens(nlp.remove_stop_words(nlp.tokenize(text))))
+
+    def features(self, text: str) -> Dict[int, int]:
+        tokens = self.tokens(text)
+        grams = list(tokens)
+        grams.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        for token in tokens:
+            padded = f"#{token}#"
+            grams.extend(f"#c{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            index = _hash(gram)
+            counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def fit(self, texts: List[str]) -> None:
+        """Learn document frequencies from the texts to be clustered."""
+        document_frequency: Dict[int, int] = {}
+        for text in texts:
+            for index in self.features(text):
+                document_frequency[index] = document_frequency.get(index, 0) + 1
+        total = len(texts)
+        self.idf = {
+            index: math.log((1 + total) / (1 + df)) + 1
+            for index, df in document_frequency.items()
+        }
+
+    def transform(self, text: str) -> SparseVector:
+        """Unit-length vector with sublinear term frequency."""
+        vector = {
+            index: (1 + math.log(count)) * self.idf.get(index, 1.0)
+            for index, count in self.features(text).items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        return {index: value / norm for index, value in vector.items()} if norm else {}
+
+
+class _Centroid:
+    """Sparse centroid stored as scale * values, so updates cost O(len(x))."""
+
+    def __init__(self, vector: SparseVector):
+        self.values = dict(vector)
+        self.scale = 1.0
+        self.norm_sq = sum(value * value for value in vector.values())
+        self.count = 1
+
+    def dot(self, vector: SparseVector) -> float:
+        values = self.values
+        return self.scale * sum(values.get(index, 0.0) * value for index, value in vector.items())
+
+    def similarity(self, vector: SparseVector) -> float:
+        return self.dot(vector) / math.sqrt(self.norm_sq) if self.norm_sq > 0 else 0.0
+
+    def update(self, vector: SparseVector, rate: float) -> None:
+        """Move towards ``vector``: c = (1 - rate) * c + rate * x."""
+        dot = self.dot(vector)
+        x_norm_sq = sum(value * value for value in vector.values())
+        self.norm_sq = ((1 - rate) ** 2 * self.norm_sq + 2 * (1 - rate) * rate * dot
+                        + rate * rate * x_norm_sq)
+        self.scale *= (1 - rate)
+        if self.scale < 1e-9:
+            self.values = {index: value * self.scale for index, value in self.values.items()}
+            self.scale = 1.0
+        for index, value in vector.items():
+            self.values[index] = self.values.get(index, 0.0) + rate * value / self.scale
+
+
+class MiniBatchKMeans:
+    """Mini-batch k-means (Sculley, 2010) on unit-length sparse vectors.
+
+    Points are assigned by cosine similarity, and each centroid moves towards
+    its assigned points with a per-centroid learning rate of 1 / count. A few
+    full passes at the end recompute each centroid from all its points, which
+    undoes drift from early mini-batches when the data fits in memory.
+    """
+
+    def __init__(self, clusters: int, batch_size: int = 256, iterations: int = 20,
+                 refine_passes: int = 2, init_sample: int = 1000, seed: int = 13):
+        self.clusters = clusters
+        self.batch_size = batch_size
+        self.iterations = iterations
+        self.refine_passes = refine_passes
+        self.init_sample = init_sample
+        self.random = random.Random(seed)
+        self.centroids: List[_Centroid] = []
+        self.inertia = float('inf')
+
+    def _initialize(self, vectors: List[SparseVector], weights: List[float]) -> None:
+        """k-means++ seeding on a sample, weighted by how often each query was seen."""
+        if len(vectors) > self.init_sample:
+            sample = self.random.choices(range(len(vectors)), weights=weights, k=self.init_sample)
+            vectors = [vectors[i] for i in sample]
+            weights = [1.0] * len(vectors)
+        first = self.random.choices(range(len(vectors)), weights=weights)[0]
+        self.centroids = [_Centroid(vectors[first])]
+        distances = [max(0.0, 1 - self.centroids[0].similarity(v)) for v in vectors]
+        while len(self.centroids) < self.clusters:
+            scores = [d * d * w for d, w in zip(distances, weights)]
+            if not any(scores):
+                break
+            chosen = self.random.choices(range(len(vectors)), weights=scores)[0]
+            centroid = _Centroid(vectors[chosen])
+            self.centroids.append(centroid)
+            distances = [min(d, max(0.0, 1 - centroid.similarity(v))) for d, v in zip(distances, vectors)]
+
+    def fit(self, vectors: List[SparseVector], weights: Optional[List[float]] = None) -> 'MiniBatchKMeans':
+        weights = weights or [1.0] * len(vectors)
+        self._initialize(vectors, weights)
+        population = range(len(vectors))
+        for _ in range(self.iterations):
+            batch = self.random.choices(population, weights=weights, k=min(self.batch_size, len(vectors)))
+            assignments = [(self.nearest(vectors[i])[0], i) for i in batch]
+            for cluster, i in assignments:
+                centroid = self.centroids[cluster]
+                centroid.count += 1
+                centroid.update(vectors[i], 1.0 / centroid.count)
+        
+        for _ in range(self.refine_passes):
+            self._refine(vectors, weights)
+        return self
+
+    def _refine(self, vectors: List[SparseVector], weights: List[float]) -> None:
+        sums: Dict[int, SparseVector] = {}
+        totals: Dict[int, float] = {}
+        self.inertia = 0.0
+        for vector, weight in zip(vectors, weights):
+            cluster, similarity = self.nearest(vector)
+            self.inertia += weight * (1 - similarity)
+            total = sums.setdefault(cluster, {})
+            for index, value in vector.items():
+                total[index] = total.get(index, 0.0) + weight * value
+            totals[cluster] = totals.get(cluster, 0.0) + weight
+
+        for cluster, total in sums.items():
+            count = self.centroids[cluster].count
+            centroid = _Centroid({index: value / totals[cluster] for index, value in total.items()})
+            centroid.count = count
+            self.centroids[cluster] = centroid
+
+    def nearest(self, vector: SparseVector) -> Tuple[int, float]:
+        best, best_similarity = 0, -1.0
+        features = list(vector)
+        weights = list(vector.values())
+        zeros = [0.0] * len(features)
+        for index, centroid in enumerate(self.centroids):
+            if centroid.norm_sq <= 0:
+                continue
+            dot = sum(map(operator.mul, map(centroid.values.get, features, zeros), weights))
+            similarity = centroid.scale * dot / math.sqrt(centroid.norm_sq)
+            if similarity > best_similarity:
+                best, best_similarity = index, similarity
+        return best, best_similarity
+
+
+def cluster_queries(query_counts: Dict[str, int], nlp_processor, clusters: Optional[int] = None,
+                    min_similarity: float = 0.2, restarts: int = 3, seed: int = 13) -> List[Dict]:
+    """Group queries into clusters ranked by total volume.
+
+    k-means is run from ``restarts`` different seeds and the result with the
+    lowest inertia kept. Queries less similar than ``min_similarity`` to every centroid are
+    left out rather than forced into a cluster.
+    """
+    vectorizer = NgramVectorizer(nlp_processor)
+    texts = [text for text in query_counts if vectorizer.tokens(text)]
+    if not texts:
+        return []
+    vectorizer.fit(texts)
+    vectors = [vectorizer.transform(text) for text in texts]
+    weights = [float(query_counts[text]) for text in texts]
+
+    k = clusters or max(1, min(50, round(1.5 * math.sqrt(len(texts)))))
+    model = min(
+        (MiniBatchKMeans(min(k, len(texts)), seed=seed + run).fit(vectors, weights) for run in range(restarts)),
+        key=lambda candidate: candidate.inertia
+    )
+
+    groups: Dict[int, List[Tuple[str, int, float]]] = {}
+    for text, vector in zip(texts, vectors):
+        cluster, similarity = model.nearest(vector)
+        if similarity >= min_similarity:
+            groups.setdefault(cluster, []).append((text, query_counts[text], similarity))
+
+    results = []
+    for members in groups.values():
+        members.sort(key=lambda member: (-member[2], -member[1]))
+        volume = sum(count for _, count, _ in members)
+        results.append({
+            'volume': volume,
+            'queries': [(text, count) for text, count, _ in members],
+            'cohesion': sum(similarity * count for _, count, similarity in members) / volume,
+            'terms': _top_terms(members, vectorizer)
+        })
+    results.sort(key=lambda cluster: -cluster['volume'])
+    return results
+
+
+def _top_terms(members: List[Tuple[str, int, float]], vectorizer: NgramVectorizer) -> List[Tuple[str, str, float]]:
+    """Stems shared by the cluster as (stem, most common surface word, share of volume)."""
+    volume = sum(count for _, count, _ in members)
+    stem_volume: Dict[str, int] = {}
+    surfaces: Dict[str, Dict[str, int]] = {}
+    nlp = vectorizer.nlp_processor
+    for text, count, _ in members:
+        words = nlp.remove_stop_words(nlp.tokenize(text))
+        for word, stemmed in zip(words, nlp.stem_tokens(words)):
+            surfaces.setdefault(stemmed, {}).setdefault(word, 0)
+            surfaces[stemmed][word] += count
+        for stemmed in set(vectorizer.tokens(text)):
+            stem_volume[stemmed] = stem_volume.get(stemmed, 0) + count
+
+    ranked = sorted(stem_volume.items(), key=lambda item: (-item[1], item[0]))
+    return [
+        (stemmed, max(surfaces.get(stemmed, {stemmed: 1}).items(), key=lambda item: item[1])[0], share / volume)
+        for stemmed, share in ranked
+    ]
+
+
+def _intent_vocabulary(training_data: Dict, responses: Dict, tokens: Callable[[str], List[str]]) -> Dict[str, set]:
+    vocabulary = {}
+    for intent, data in training_data.items():
+        words = set()
+        for text in list(data.get('examples', [])) + list(data.get('keywords', [])) + list(responses.get(intent, [])):
+            words.update(tokens(text))
+        vocabulary[intent] = words
+    return vocabulary
+
+
+def propose_training_updates(clusters: List[Dict], training_data: Dict, responses: Dict,
+                             nlp_processor, min_term_share: float = 0.5,
+                             max_keywords: int = 3, max_examples: int = 3) -> List[Dict]:
+    """Suggest keywords and examples that would let each cluster be answered locally.
+
+    Only terms used by at least ``min_term_share`` of the cluster's traffic
+    count, and generic words are ignored. A cluster is matched to an intent
+    whose examples, keywords and response templates contain its dominant term
+    and at least half of its terms, preferring the one that shares the most
+    specific terms; other clusters are proposed as new intents. Terms that are
+    not already a keyword of any intent are proposed as keywords.
+    """
+    vectorizer = NgramVectorizer(nlp_processor)
+    vocabulary = _intent_vocabulary(training_data, responses, vectorizer.tokens)
+    existing_keywords = {
+        stemmed
+        for data in training_data.values()
+        for stemmed in vectorizer.tokens(' '.join(data.get('keywords', [])))
+    }
+
+    # Terms found in many intents' vocabularies say little about which one fits
+    intent_count = len(vocabulary)
+    specificity: Dict[str, float] = {}
+    for words in vocabulary.values():
+        for word in words:
+            specificity[word] = specificity.get(word, 0) + 1
+    specificity = {word: math.log(1 + intent_count / df) for word, df in specificity.items()}
+
+    proposals = []
+    for cluster in clusters:
+        common = [
+            (stemmed, word) for stemmed, word, share in cluster['terms']
+            if share >= min_term_share and word not in GENERIC_WORDS and len(word) > 2
+        ]
+        best_intent = None
+        if common:
+            dominant = common[0][0]
+            overlap = {
+                intent: sum(specificity[stemmed] for stemmed, _ in common if stemmed in words)
+                for intent, words in vocabulary.items()
+                if dominant in words and 2 * sum(1 for stemmed, _ in common if stemmed in words) >= len(common)
+            }
+            if overlap:
+                best_intent = max(overlap, key=overlap.get)
+
+        keywords = [word for stemmed, word in common if stemmed not in existing_keywords][:max_keywords]
+        examples = [
+            text for text, _ in cluster['queries']
+            if text not in training_data.get(best_intent, {}).get('examples', [])
+        ][:max_examples]
+
+        proposals.append({
+            'intent': best_intent,
+            'new_intent': None if best_intent else '_'.join(word for _, word in common[:2]) or 'misc',
+            'volume': cluster['volume'],
+            'cohesion': cluster['cohesion'],
+            'keywords': keywords,
+            'examples': examples,
+            'queries': cluster['queries']
+        })
+    return proposals
+
+
+def apply_proposals(training_data: Dict, proposals: Iterable[Dict]) -> Dict:
+    """Copy of the training data with proposals for existing intents merged in."""
+    updated = copy.deepcopy(training_data)
+    for proposal in proposals:
+        intent = proposal['intent']
+        if intent is None:
+            continue
+        data = updated[intent]
+        data['keywords'] = list(data.get('keywords', [])) + [
+            keyword for keyword in proposal['keywords'] if keyword not in data.get('keywords', [])
+        ]
+        data['examples'] = list(data.get('examples', [])) + proposal['examples']
+    return updated
+
+
+def ai_routed_volume(query_counts: Dict[str, int], nlp_processor, classifier, response_generator) -> int:
+    """Traffic that the given pipeline would still send to the AI services."""
+    volume = 0
+    for text, count in query_counts.items():
+        processed_input = nlp_processor.process(text)
+        intent_result = classifier.classify(processed_input)
+        if response_generator.try_local_response(intent_result, processed_input) is None:
+            volume += count
+    return volume
@@ -1,32 +1,161 @@
 import random
 import os
 import time
+import json
 import logging
-from typing import Dict, List
-from chatbot.training_data import RESPONSES, SUGGESTIONS, COLLEGE_INFO
+import threading
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from chatbot.admission import AdmissionController
+from chatbot.analysis_cache import freeze
+from chatbot.intent_classifier import CONVERSATIONAL_INTENTS
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.retrieval import KnowledgeRetriever, build_passages, content_tokens
+from chatbot.prompt_builder import build_prompt, estimate_tokens
+from chatbot.provider_stats import ProviderStats
+from chatbot.retry import AIServiceError, Deadline, DeadlineExceeded, call_with_retries
+from chatbot.training_data import (
+    RESPONSES, SUGGESTIONS, COLLEGE_INFO, FAQ,
+    DEPARTMENT_INFO, DEPARTMENT_RESPONSES, EXAM_INFO, EXAM_RESPONSES, NOT_PUBLISHED
+)
 
 # Configure logging for AI service monitoring
 ai_logger = logging.getLogger('ai_services')
 
+# Default confidence below which a query is routed to the AI services
+DEFAULT_AI_CONFIDENCE_THRESHOLD = 0.6
+
+# AI providers and Gemini models, in the order tried before any latency is known
+AI_PROVIDERS = ["Gemini", "ChatGPT", "Perplexity"]
+GEMINI_MODELS = ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-pro"]
+
+# Answers given when no AI service could answer; neither is an AI answer
+AI_UNAVAILABLE_RESPONSE = "I'm sorry, I don't have information about that topic in my knowledge base, and I'm unable to connect to external AI services right now. Please contact our admissions office for more specific information."
+AI_FAILED_RESPONSE = "I'm sorry, I'm having trouble connecting to my knowledge base right now. Please try again later or contact our admissions office directly for assistance."
+
+# Suggestions shown after an AI answer; the frontend uses the same list on start
+AI_FALLBACK_SUGGESTIONS = [
+    "Tell me about admissions",
+    "What courses do you offer?",
+    "What are the fees?",
+    "Show me campus facilities"
+]
+
+# Question patterns that need reasoning beyond the local templates
+COMPLEX_QUERY_PATTERNS = [
+    'compare', 'difference', 'vs', 'versus', 'which is better',
+    'pros and cons', 'advantages', 'disadvantages', 'explain',
+    'how does', 'what if', 'why', 'when should', 'where can',
+    'latest trends', 'current market', 'analysis', 'research'
+]
+
+
+def is_complex_query(user_message: str) -> bool:
+    """Check whether a message is too long or analytical for a template answer."""
+    message_lower = user_message.lower()
+    return (
+        len(user_message.split()) > 20 or  # Very complex queries only
+        any(keyword in message_lower for keyword in COMPLEX_QUERY_PATTERNS)
+    )
+
+
+def requires_ai(intent: str, confidence: float, user_message: str, threshold: float) -> bool:
+    """Decide whether a classified message should be answered by an AI service."""
+    return (
+        confidence < threshold or
+        intent == 'unknown' or
+        is_complex_query(user_message)
+    )
+
 # Import AI services
 try:
     from openai import OpenAI
     import google.generativeai as genai
     import requests
-    import json
     from dotenv import load_dotenv
     AI_SERVICES_AVAILABLE = True
 except ImportError:
     AI_SERVICES_AVAILABLE = False
     print("Warning: AI services not available. Install openai, google-generativeai, and requests packages.")
 
+class TokenStream:
+    """Forward streamed answer text to a listener across attempts and providers.
+    
+    When a new attempt starts after an earlier one already sent text, the
+    listener gets ``None`` so it can discard the partial answer.
+    """
+    
+    def __init__(self, listener: Callable[[Optional[str]], None]):
+        self.listener = listener
+        self.started = False
+    
+    def __call__(self, text: str) -> None:
+        self.started = True
+        self.listener(text)
+    
+    def restart(self) -> None:
+        if self.started:
+            self.started = False
+            self.listener(None)
+
+
 class ResponseGenerator:
     """Generate appropriate responses based on classified intents."""
     
-    def __init__(self):
+    def __init__(self, nlp_processor: Optional[NLPProcessor] = None):
         self.responses = RESPONSES
         self.suggestions = SUGGESTIONS
         self.college_info = COLLEGE_INFO
+        self.faq = FAQ
+        
+        # Per-department and per-exam tables for answers that name one
+        self.department_info = DEPARTMENT_INFO
+        self.department_responses = DEPARTMENT_RESPONSES
+        self.exam_info = EXAM_INFO
+        self.exam_responses = EXAM_RESPONSES
+        self.exam_programs = self._index_exam_programs()
+        
+        # Retrieval over the knowledge base answers factual questions without AI
+        self.nlp_processor = nlp_processor or NLPProcessor()
+        self.build_knowledge_index()
+        
+        # Routing thresholds; per-intent values come from calibration
+        self.confidence_threshold = DEFAULT_AI_CONFIDENCE_THRESHOLD
+        self.intent_thresholds: Dict[str, float] = {}
+        
+        # Compound questions ("fees and scholarships?") are answered from several templates
+        self.multi_intent_threshold = DEFAULT_AI_CONFIDENCE_THRESHOLD
+        self.max_slot_entities = 3
+        
+        # Complete payloads for fixed queries such as suggestion chips
+        self.precomputed_responses: Dict[str, Tuple[Mapping, Mapping]] = {}
+        
+        # Prompt size limits and per-provider token accounting for AI fallbacks
+        self.prompt_token_budget = 200
+        self.prompt_snippets = 2
+        self.max_completion_tokens = 300
+        self.token_usage: Dict[str, Dict[str, int]] = {}
+        self._usage_lock = threading.Lock()
+        
+        # Time budget for one message across all providers, retries and models
+        self.ai_deadline_seconds = 20.0
+        self.ai_attempt_timeout = 10.0
+        self.ai_max_retries = 2
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+        self.jitter = random.random
+        
+        # Try the provider (and Gemini model) expected to answer soonest first
+        self.adaptive_provider_order = True
+        self.provider_stats = ProviderStats(clock=lambda: self.clock())
+        
+        # Per-session rate limits and concurrency caps on the AI path
+        self.admission_controller: Optional[AdmissionController] = None
+        
+        # Recent turns and a rolling summary from this ConversationManager go into AI prompts
+        self.conversation_manager = None
+        self.history_token_budget = 120
+        self.summary_token_budget = 40
         
         # Initialize AI services if available
         if AI_SERVICES_AVAILABLE:
@@ -78,8 +207,161 @@ class ResponseGenerator:
             print(f"Error setting up AI services: {e}")
             self.ai_services_configured = False
     
-    def _format_response(self, response_template: str) -> str:
-        """Format the response template with college information."""
+    def set_intent_thresholds(self, thresholds: Dict[str, float]) -> None:
+        """Use calibrated per-intent confidence thresholds for AI routing."""
+        self.intent_thresholds = dict(thresholds)
+    
+    def load_intent_thresholds(self, path: str) -> bool:
+        """Load calibrated thresholds written by scripts/calibrate_thresholds.py."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not load intent thresholds from {path}: {e}")
+            return False
+        
+        self.confidence_threshold = data.get('default', self.confidence_threshold)
+        self.set_intent_thresholds(data.get('intents', {}))
+        return True
+    
+    def get_threshold(self, intent: str) -> float:
+        """Get the confidence threshold for serving an intent locally."""
+        return self.intent_thresholds.get(intent, self.confidence_threshold)
+    
+    def should_use_ai(self, intent_result: Dict, processed_input: Dict) -> bool:
+        """Decide whether a classified message should go to the AI services."""
+        intent = intent_result.get('intent', 'unknown')
+        if intent_result.get('follow_up') and intent != 'unknown':
+            # Resolved from the previous exchange (IntentClassifier.resolve_follow_up)
+            return is_complex_query(processed_input.get('original_text', ''))
+        return requires_ai(
+            intent,
+            intent_result.get('confidence', 0.0),
+            processed_input.get('original_text', ''),
+            self.get_threshold(intent)
+        )
+    
+    def build_knowledge_index(self) -> None:
+        """(Re)build the retrieval index from the college info, responses and FAQ."""
+        passages = build_passages(self.college_info, self.responses, self.faq, self._format_response)
+        self.retriever = KnowledgeRetriever(self.nlp_processor, passages)
+    
+    def _keyword_coverage(self, intent_result: Dict, processed_input: Dict) -> float:
+        """Fraction of the query's content words that matched the intent's keywords."""
+        clean_tokens = set(content_tokens(processed_input.get('clean_tokens', [])))
+        if not clean_tokens:
+            return 0.0
+        score = intent_result.get('all_scores', {}).get(intent_result.get('intent'), 0)
+        return score / len(clean_tokens)
+    
+    def _answer_from_knowledge_base(self, intent_result: Dict, processed_input: Dict,
+                                    use_ai: bool = True) -> Optional[Dict]:
+        """Answer a factual question from the best matching knowledge base passage.
+        
+        For queries that would get a template answer, the passage is only used when it
+        covers more of the query than the intent keywords did (e.g. 'security' alone
+        should not turn a question about the Cyber Security department into a hostel answer).
+        """
+        if is_complex_query(processed_input.get('original_text', '')):
+            return None
+        
+        passage = self.retriever.answer(processed_input)
+        if not passage:
+            return None
+        if not use_ai and passage['coverage'] <= self._keyword_coverage(intent_result, processed_input):
+            return None
+        
+        intent = intent_result.get('intent', 'unknown')
+        suggestions = self.suggestions.get(intent, self.suggestions.get('default', []))
+        return {
+            'response': passage['text'],
+            'suggestions': random.sample(suggestions, min(3, len(suggestions))),
+            'confidence': passage['coverage'],
+            'intent': 'knowledge_base',
+            # Still a local answer to callers and analytics; local_source says how it was found
+            'source': 'local',
+            'local_source': 'retrieval'
+        }
+    
+    def suggestion_texts(self) -> List[str]:
+        """Every suggestion string this generator can hand to the UI."""
+        texts = list(AI_FALLBACK_SUGGESTIONS)
+        for suggestions in self.suggestions.values():
+            texts.extend(suggestions)
+        return texts
+    
+    def precompute_responses(self, texts: Iterable[str], analyze: Callable,
+                             warm_ai: bool = False) -> Dict[str, int]:
+        """Build complete response payloads for fixed queries such as suggestion chips.
+        
+        ``analyze`` maps a message to its (processed_input, intent_result) pair.
+        Queries that route to AI are only stored when ``warm_ai`` is set and an AI
+        service actually answered; the others count as skipped, and calling again
+        with ``warm_ai`` retries just those. Call without it after reloading the
+        knowledge base; the table is swapped in one assignment so readers never
+        see a partial table.
+        """
+        table = dict(self.precomputed_responses) if warm_ai else {}
+        counts = {'local': 0, 'ai': 0, 'skipped': 0}
+        
+        for text in texts:
+            if text in table:
+                continue
+            processed_input, intent_result = analyze(text)
+            response_data = self.try_local_response(intent_result, processed_input)
+            if response_data is None:
+                if not warm_ai:
+                    counts['skipped'] += 1
+                    continue
+                response_data = self.generate_response(intent_result, processed_input, session_id=None, exempt=True)
+                if response_data.get('source') != 'ai':
+                    # AI was unreachable; try again on a live request instead of caching the fallback
+                    counts['skipped'] += 1
+                    continue
+            
+            table[text] = (intent_result, freeze(response_data))
+            counts['ai' if response_data.get('source') == 'ai' else 'local'] += 1
+        
+        self.precomputed_responses = table
+        return counts
+    
+    def get_precomputed_response(self, text: str) -> Optional[Tuple[Mapping, Mapping]]:
+        """Look up the (intent_result, response_data) pair for a precomputed query."""
+        return self.precomputed_responses.get(text)
+    
+    def _index_exam_programs(self) -> Dict[str, List[str]]:
+        """Map each entrance exam to the departments that admit through it."""
+        programs: Dict[str, List[str]] = {exam: [] for exam in self.exam_info}
+        for department, details in self.department_info.items():
+            for exam in details.get('entrance_exams', []):
+                programs.setdefault(exam, []).append(department)
+        return programs
+    
+    def _department_slots(self, department: str) -> Dict[str, str]:
+        details = self.department_info[department]
+        return {
+            'department': department,
+            'short_name': details.get('short_name', department),
+            'degree': details.get('degree', ''),
+            'duration': details.get('duration', ''),
+            'entrance_exams': ', '.join(details.get('entrance_exams', []))
+        }
+    
+    def _fees_published(self) -> bool:
+        fees = self.college_info.get('fees', {})
+        return all(fees.get(key, NOT_PUBLISHED) != NOT_PUBLISHED for key in ('tuition_per_year', 'other_fees'))
+    
+    def _exam_slots(self, exam: str) -> Dict[str, str]:
+        details = self.exam_info[exam]
+        return {
+            'exam': exam,
+            'full_name': details.get('full_name', exam),
+            'admits': details.get('admits', 'admission'),
+            'programs': ', '.join(self.exam_programs.get(exam, []))
+        }
+    
+    def _format_response(self, response_template: str, slots: Optional[Dict[str, str]] = None) -> str:
+        """Format the response template with college information and any entity slots."""
         try:
             # Ensure all required keys are present before formatting
             info = {key: self.college_info.get(key, f"[{key.upper()}_INFO_MISSING]") for key in self.college_info}
@@ -99,121 +381,252 @@ class ResponseGenerator:
                 campus_size=info.get('campus_size'),
                 admissions=admissions_info,
                 fees=fees_info,
-                departments=', '.join(info.get('departments', []))
+                departments=', '.join(info.get('departments', [])),
+                **(slots or {})
             )
         except (KeyError, TypeError) as e:
             # Log the error for debugging
             print(f"Error formatting response: {e}")
             return "Sorry, I'm having trouble retrieving the information right now."
     
-    def _fallback_to_ai(self, user_message: str) -> str:
-        """Fallback to AI services when local data doesn't have the answer."""
-        if not AI_SERVICES_AVAILABLE:
-            return "I'm sorry, I don't have information about that topic in my knowledge base, and I'm unable to connect to external AI services right now. Please contact our admissions office for more specific information."
+    def _record_usage(self, service_name: str, prompt: str, completion: str,
+                      prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None) -> None:
+        """Accumulate token counts per provider, estimating when the API reports none."""
+        prompt_tokens = prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt)
+        completion_tokens = completion_tokens if completion_tokens is not None else estimate_tokens(completion)
+        with self._usage_lock:
+            usage = self.token_usage.setdefault(
+                service_name, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+            )
+            usage['calls'] += 1
+            usage['prompt_tokens'] += prompt_tokens
+            usage['completion_tokens'] += completion_tokens
+    
+    def build_ai_prompt(self, user_message: str, processed_input: Optional[Dict] = None,
+                        conversation: Optional[Dict] = None) -> str:
+        """Build a prompt carrying only the knowledge base snippets relevant to the message.
         
-        # Create a context-aware prompt for college-related questions
-        context_prompt = f"""You are a helpful assistant for RGM College of Engineering and Technology. 
-        A student is asking: "{user_message}"
+        ``conversation`` is the session's prompt context (ConversationManager.get_prompt_context).
+        """
+        if processed_input is None:
+            processed_input = self.nlp_processor.process(user_message)
         
-        Please provide a helpful, accurate response about college-related topics. If the question is not about college, education, or academic matters, politely redirect them to ask about college-related topics.
+        results = self.retriever.search(list(processed_input.get('clean_tokens', [])), top_k=self.prompt_snippets)
+        # Keep snippets that are clearly relevant, not just the best of a weak set
+        snippets = [
+            result['text'] for result in results
+            if result['score'] >= 2.0 and result['score'] >= 0.5 * results[0]['score']
+        ]
+        conversation = conversation or {}
+        return build_prompt(
+            user_message, self.college_info.get('name', 'the college'), snippets,
+            token_budget=self.prompt_token_budget,
+            history=conversation.get('turns', ()), summary=conversation.get('summary', '')
+        )
+    
+    def _fallback_to_ai(self, user_message: str, processed_input: Optional[Dict] = None,
+                        deadline: Optional[Deadline] = None,
+                        on_token: Optional[Callable[[Optional[str]], None]] = None,
+                        prompt: Optional[str] = None) -> str:
+        """Fallback to AI services when local data doesn't have the answer.
         
-        Keep your response concise, friendly, and informative. If you don't know specific details about RGM College, provide general guidance about the topic."""
+        With ``on_token`` the answer is streamed from the provider as it is generated
+        (see TokenStream); the returned text is still the complete answer.
+        """
+        if not AI_SERVICES_AVAILABLE:
+            return AI_UNAVAILABLE_RESPONSE
         
-        # Try multiple AI services in order of preference
-        ai_services = [
-            ("Gemini", self._try_gemini),
-            ("ChatGPT", self._try_chatgpt),
-            ("Perplexity", self._try_perplexity)
-        ]
+        # Attach the relevant college facts so providers can answer specifically and briefly
+        context_prompt = prompt or self.build_ai_prompt(user_message, processed_input)
+        ai_logger.info(f"AI prompt for query: {user_message[:50]}... ~{estimate_tokens(context_prompt)} tokens")
         
-        for service_name, service_func in ai_services:
+        # One budget covers every provider, so a message never waits longer than this
+        deadline = deadline or Deadline(self.ai_deadline_seconds, clock=self.clock)
+        stream = TokenStream(on_token) if on_token else None
+        
+        # Try the AI services, fastest expected first
+        ai_services = {
+            "Gemini": self._try_gemini,
+            "ChatGPT": self._try_chatgpt,
+            "Perplexity": self._try_perplexity
+        }
+        
+        for service_name in self._attempt_order(AI_PROVIDERS):
+            if deadline.expired():
+                ai_logger.warning(f"AI deadline reached before trying {service_name} for query: {user_message[:50]}...")
+                break
+            started = self.clock()
             try:
-                response = self._retry_ai_service(service_func, context_prompt, service_name)
+                response = self._retry_ai_service(ai_services[service_name], context_prompt, service_name, deadline, stream)
                 if response and response.strip():
+                    self.provider_stats.record(service_name, self.clock() - started, True)
                     print(f"Successfully got response from {service_name}")
                     ai_logger.info(f"AI service {service_name} responded successfully for query: {user_message[:50]}...")
                     return response
             except Exception as e:
+                self.provider_stats.record(service_name, self.clock() - started, False)
                 print(f"{service_name} API failed with error: {e}")
                 ai_logger.error(f"AI service {service_name} failed for query: {user_message[:50]}... Error: {str(e)}")
                 continue
         
         # If all AI services fail, return a helpful fallback message
-        return "I'm sorry, I'm having trouble connecting to my knowledge base right now. Please try again later or contact our admissions office directly for assistance."
+        return AI_FAILED_RESPONSE
     
-    def _retry_ai_service(self, service_func, prompt: str, service_name: str, max_retries: int = 2) -> str:
-        """Retry AI service calls with exponential backoff."""
-        for attempt in range(max_retries + 1):
-            try:
-                response = service_func(prompt)
-                if response and response.strip():
-                    return response
-                elif attempt < max_retries:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    print(f"{service_name} returned empty response, retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"Empty response after {max_retries + 1} attempts")
-            except Exception as e:
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    print(f"{service_name} failed (attempt {attempt + 1}), retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise e
+    def _attempt_order(self, names: List[str], prefix: str = '') -> List[str]:
+        """Order providers or models by expected latency (see ProviderStats), or as listed."""
+        if not self.adaptive_provider_order:
+            return list(names)
+        return self.provider_stats.order(names, prefix)
+    
+    def _retry_ai_service(self, service_func, prompt: str, service_name: str, deadline: Deadline,
+                          stream: Optional[TokenStream] = None) -> str:
+        """Call an AI service, retrying transient failures with jittered backoff within the deadline."""
+        def attempt(deadline: Deadline) -> str:
+            if stream:
+                stream.restart()
+                response = service_func(prompt, deadline, on_token=stream)
+            else:
+                response = service_func(prompt, deadline)
+            if not response or not response.strip():
+                # An empty answer is a content decision, not a transient fault
+                raise AIServiceError(f"Empty response from {service_name}", retryable=False)
+            return response
+        
+        def log_retry(attempt_number: int, delay: float, error: Exception):
+            print(f"{service_name} failed (attempt {attempt_number}), retrying in {delay:.2f}s...")
+        
+        return call_with_retries(
+            attempt, deadline, max_retries=self.ai_max_retries,
+            sleep=self.sleep, jitter=self.jitter, on_retry=log_retry
+        )
     
-    def _try_gemini(self, prompt: str) -> str:
+    def _collect_stream(self, pieces: Iterable[Optional[str]], on_token: Callable[[str], None],
+                        deadline: Deadline) -> str:
+        """Forward streamed text to ``on_token`` as it arrives and return the whole answer."""
+        parts = []
+        for piece in pieces:
+            if deadline.expired():
+                raise DeadlineExceeded("Deadline reached while streaming the answer")
+            if piece:
+                parts.append(piece)
+                on_token(piece)
+        return ''.join(parts)
+    
+    def _try_gemini(self, prompt: str, deadline: Deadline,
+                    on_token: Optional[Callable[[str], None]] = None) -> str:
         """Try to get response from Google Gemini AI."""
         try:
-            # Try different Gemini models (using current model names)
-            models_to_try = ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-pro"]
+            # Try the Gemini models, fastest expected first
+            last_error = None
             
-            for model_name in models_to_try:
+            for model_name in self._attempt_order(GEMINI_MODELS, prefix="Gemini/"):
+                if deadline.expired():
+                    raise DeadlineExceeded(f"Deadline reached before trying Gemini model {model_name}")
+                started = self.clock()
                 try:
-                    gemini_model = genai.GenerativeModel(model_name)
-                    response = gemini_model.generate_content(prompt)
-                    if response and response.text:
-                        return response.text
+                    text = self._call_gemini_model(model_name, prompt, deadline, on_token)
                 except Exception as e:
+                    self.provider_stats.record(f"Gemini/{model_name}", self.clock() - started, False)
                     print(f"Gemini model {model_name} failed: {e}")
+                    last_error = e
                     continue
+                self.provider_stats.record(f"Gemini/{model_name}", self.clock() - started, bool(text))
+                if text:
+                    return text
             
-            raise Exception("All Gemini models failed")
+            raise AIServiceError("All Gemini models failed") from last_error
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            raise Exception(f"Gemini API error: {e}")
+            raise AIServiceError(f"Gemini API error: {e}") from e
+    
+    def _call_gemini_model(self, model_name: str, prompt: str, deadline: Deadline,
+                           on_token: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Ask one Gemini model; returns None when it gave no text."""
+        gemini_model = genai.GenerativeModel(model_name)
+        response = gemini_model.generate_content(
+            prompt,
+            generation_config={'max_output_tokens': self.max_completion_tokens},
+            request_options={'timeout': deadline.timeout(self.ai_attempt_timeout)},
+            stream=on_token is not None
+        )
+        if on_token:
+            text = self._collect_stream((chunk.text for chunk in response), on_token, deadline)
+            if text:
+                self._record_usage("Gemini", prompt, text)
+                return text
+        elif response and response.text:
+            metadata = getattr(response, 'usage_metadata', None)
+            self._record_usage(
+                "Gemini", prompt, response.text,
+                getattr(metadata, 'prompt_token_count', None),
+                getattr(metadata, 'candidates_token_count', None)
+            )
+            return response.text
+        return None
     
-    def _try_chatgpt(self, prompt: str) -> str:
+    def _try_chatgpt(self, prompt: str, deadline: Deadline,
+                     on_token: Optional[Callable[[str], None]] = None) -> str:
         """Try to get response from OpenAI ChatGPT."""
         try:
-            # Try with API key if available
+            # Retries are handled by _retry_ai_service within the deadline
             if hasattr(self, 'openai_api_key') and self.openai_api_key:
-                client = OpenAI(api_key=self.openai_api_key)
+                client = OpenAI(api_key=self.openai_api_key, max_retries=0)
             else:
                 # Try without explicit API key (uses environment variable or .env)
-                client = OpenAI()
+                client = OpenAI(max_retries=0)
             
             response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.7
+                max_tokens=self.max_completion_tokens,
+                temperature=0.7,
+                timeout=deadline.timeout(self.ai_attempt_timeout),
+                stream=on_token is not None
             )
             
+            if on_token:
+                content = self._collect_stream(
+                    (chunk.choices[0].delta.content if chunk.choices else None for chunk in response),
+                    on_token, deadline
+                )
+                if not content:
+                    raise AIServiceError("Empty response from ChatGPT", retryable=False)
+                self._record_usage("ChatGPT", prompt, content)
+                return content
+            
             if response and response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content
+                content = response.choices[0].message.content
+                usage = getattr(response, 'usage', None)
+                self._record_usage(
+                    "ChatGPT", prompt, content,
+                    getattr(usage, 'prompt_tokens', None),
+                    getattr(usage, 'completion_tokens', None)
+                )
+                return content
             else:
-                raise Exception("Empty response from ChatGPT")
+                raise AIServiceError("Empty response from ChatGPT", retryable=False)
                 
         except Exception as e:
-            raise Exception(f"ChatGPT API error: {e}")
+            raise AIServiceError(f"ChatGPT API error: {e}") from e
+    
+    def _perplexity_deltas(self, response) -> Iterable[Optional[str]]:
+        """Yield the text pieces of a streamed (server-sent events) Perplexity reply."""
+        for line in response.iter_lines():
+            if not line.startswith(b'data: '):
+                continue
+            data = line[len(b'data: '):]
+            if data == b'[DONE]':
+                break
+            choices = json.loads(data).get('choices') or [{}]
+            yield (choices[0].get('delta') or {}).get('content')
     
-    def _try_perplexity(self, prompt: str) -> str:
+    def _try_perplexity(self, prompt: str, deadline: Deadline,
+                        on_token: Optional[Callable[[str], None]] = None) -> str:
         """Try to get response from Perplexity AI."""
         try:
             if not hasattr(self, 'perplexity_api_key') or not self.perplexity_api_key:
-                raise Exception("Perplexity API key not configured")
+                raise AIServiceError("Perplexity API key not configured", retryable=False)
             
             headers = {
                 "Authorization": f"Bearer {self.perplexity_api_key}",
@@ -225,71 +638,56 @@ class ResponseGenerator:
                 "messages": [
                     {
                         "role": "system",
-                        "content": "You are a helpful assistant for RGM College of Engineering and Technology. Provide accurate, helpful responses about college-related topics. Keep responses concise and informative."
+                        "content": "You are a concise assistant for RGM College of Engineering and Technology."
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                "max_tokens": 500,
-                "temperature": 0.7
+                "max_tokens": self.max_completion_tokens,
+                "temperature": 0.7,
+                "stream": on_token is not None
             }
             
             response = requests.post(
                 "https://api.perplexity.ai/chat/completions",
                 headers=headers,
                 json=data,
-                timeout=15  # Reduced timeout for better responsiveness
+                timeout=deadline.timeout(self.ai_attempt_timeout),
+                stream=on_token is not None
             )
             
-            if response.status_code == 200:
+            if response.status_code == 200 and on_token:
+                content = self._collect_stream(self._perplexity_deltas(response), on_token, deadline)
+                if not content:
+                    raise AIServiceError("Empty response from Perplexity", retryable=False)
+                self._record_usage("Perplexity", prompt, content)
+                return content
+            elif response.status_code == 200:
                 result = response.json()
                 if result.get('choices') and result['choices'][0].get('message'):
-                    return result['choices'][0]['message']['content']
+                    content = result['choices'][0]['message']['content']
+                    usage = result.get('usage') or {}
+                    self._record_usage(
+                        "Perplexity", prompt, content,
+                        usage.get('prompt_tokens'), usage.get('completion_tokens')
+                    )
+                    return content
                 else:
-                    raise Exception("Invalid response format from Perplexity")
+                    raise AIServiceError("Invalid response format from Perplexity", retryable=False)
             else:
-                raise Exception(f"Perplexity API returned status {response.status_code}: {response.text}")
+                raise AIServiceError(
+                    f"Perplexity API returned status {response.status_code}: {response.text}",
+                    status_code=response.status_code
+                )
                 
         except Exception as e:
-            raise Exception(f"Perplexity API error: {e}")
+            raise AIServiceError(f"Perplexity API error: {e}") from e
 
-    def generate_response(self, intent_result: Dict, processed_input: Dict, session_id: str) -> Dict:
-        """Generate an appropriate response based on the classified intent."""
+    def generate_local_response(self, intent_result: Dict) -> Dict:
+        """Answer from the response templates of the classified intent."""
         intent = intent_result.get('intent', 'unknown')
-        confidence = intent_result.get('confidence', 0.0)
-        user_message = processed_input.get('original_text', '')
-        
-        # Smart AI fallback logic - use AI for complex queries, low confidence, or unknown intents
-        should_use_ai = (
-            confidence < 0.6 or  # Lower threshold to use more local responses
-            intent == 'unknown' or  # Unknown intent
-            len(user_message.split()) > 20 or  # Very complex queries only
-            any(keyword in user_message.lower() for keyword in [
-                'compare', 'difference', 'vs', 'versus', 'which is better',
-                'pros and cons', 'advantages', 'disadvantages', 'explain',
-                'how does', 'what if', 'why', 'when should', 'where can',
-                'latest trends', 'current market', 'analysis', 'research'
-            ])  # Complex question patterns
-        )
-        
-        if should_use_ai:
-            print(f"🤖 Attempting AI fallback - Confidence: {confidence:.2f}, Intent: {intent}")
-            ai_response = self._fallback_to_ai(user_message)
-            if ai_response and not ai_response.startswith("I'm sorry, I don't have information"):
-                return {
-                    'response': ai_response,
-                    'suggestions': [
-                        "Tell me about admissions",
-                        "What courses do you offer?",
-                        "What are the fees?",
-                        "Show me campus facilities"
-                    ],
-                    'confidence': 0.9,  # High confidence for AI responses
-                    'intent': 'ai_fallback',
-                    'source': 'ai'
-                }
         
         # Use local responses for high confidence matches
         response_templates = self.responses.get(intent, self.responses['unknown'])
@@ -304,7 +702,177 @@ class ResponseGenerator:
         return {
             'response': final_response,
             'suggestions': random.sample(suggestions, min(3, len(suggestions))),
-            'confidence': confidence,
+            'confidence': intent_result.get('confidence', 0.0),
             'intent': intent,
             'source': 'local'
-        }
\ No newline at end of file
+        }
+    
+    def generate_composed_response(self, intent_result: Dict, processed_input: Dict) -> Optional[Dict]:
+        """Answer a question about several topics from each topic's templates.
+        
+        Used when the classifier found two or more intents that together explain
+        the matched keywords; returns None for single-topic or analytical questions.
+        """
+        # Answer the parts in the order the user asked them
+        intents = [
+            item['intent'] for item in sorted(intent_result.get('intents', ()), key=lambda item: item['position'])
+            if item['intent'] not in CONVERSATIONAL_INTENTS
+        ]
+        if len(intents) < 2:
+            return None
+        if intent_result.get('combined_confidence', 0.0) < self.multi_intent_threshold:
+            return None
+        if is_complex_query(processed_input.get('original_text', '')):
+            return None
+        
+        parts = [
+            self._format_response(random.choice(self.responses.get(intent, self.responses['unknown'])))
+            for intent in intents
+        ]
+        
+        # Take suggestions from each topic in turn so every part of the question gets one
+        suggestions = []
+        pools = [random.sample(pool, len(pool)) for pool in (self.suggestions.get(intent, []) for intent in intents)]
+        for round_robin in zip(*pools):
+            for suggestion in round_robin:
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
+        
+        return {
+            'response': "\n\n".join(parts),
+            'suggestions': suggestions[:3],
+            'confidence': intent_result['combined_confidence'],
+            'intent': intents[0],
+            'intents': intents,
+            'source': 'local'
+        }
+    
+    def generate_slot_response(self, intent_result: Dict, processed_input: Dict) -> Optional[Dict]:
+        """Answer a question that names a department or exam ("fees for CSE", "EAMCET cutoff").
+        
+        Uses the entity's template for the classified intent, or its overview when the
+        intent is unknown; returns None when nothing is named or the intent has no
+        entity template (a hostel question mentioning CSE is answered as usual).
+        """
+        entities = processed_input.get('entities', {})
+        departments = [name for name in entities.get('departments', ()) if name in self.department_info]
+        exams = [name for name in entities.get('exams', ()) if name in self.exam_info]
+        if not departments and not exams:
+            return None
+        if is_complex_query(processed_input.get('original_text', '')):
+            return None
+        
+        if departments:
+            responses, names, slot_builder, label = self.department_responses, departments, self._department_slots, 'department_info'
+        else:
+            responses, names, slot_builder, label = self.exam_responses, exams, self._exam_slots, 'exam_info'
+        
+        intent = intent_result.get('intent', 'unknown')
+        candidates = [intent] + [item['intent'] for item in intent_result.get('intents', ())]
+        key = next((candidate for candidate in candidates if candidate in responses), None)
+        if key is None:
+            if intent != 'unknown':
+                return None
+            key = 'default'
+        
+        parts = []
+        for name in names[:self.max_slot_entities]:
+            slots = slot_builder(name)
+            template_key = key
+            if 'programs' in slots and not slots['programs']:
+                # An exam no department lists only gets the overview
+                template_key = 'default'
+            elif template_key == 'fee_info' and not self._fees_published():
+                # Quoting "Contact office for details" as a fee reads like an amount
+                template_key = 'fee_info_unpublished'
+            parts.append(self._format_response(random.choice(responses[template_key]), slots))
+        
+        suggestions = self.suggestions.get(key, self.suggestions.get('default', []))
+        return {
+            'response': "\n\n".join(parts),
+            'suggestions': random.sample(suggestions, min(3, len(suggestions))),
+            'confidence': intent_result.get('confidence', 0.0),
+            'intent': key if key != 'default' else label,
+            'source': 'local'
+        }
+    
+    def try_local_response(self, intent_result: Dict, processed_input: Dict) -> Optional[Dict]:
+        """Answer without AI if possible; returns None when the message needs an AI service."""
+        composed_response = self.generate_composed_response(intent_result, processed_input)
+        if composed_response:
+            return composed_response
+        
+        slot_response = self.generate_slot_response(intent_result, processed_input)
+        if slot_response:
+            return slot_response
+        
+        # Smart AI fallback logic - use AI for complex queries, low confidence, or unknown intents
+        use_ai = self.should_use_ai(intent_result, processed_input)
+        
+        # Factual lookups are answered locally from the knowledge base when it matches well;
+        # a resolved follow-up ("yes") has too few words of its own to retrieve with
+        if not intent_result.get('follow_up'):
+            knowledge_response = self._answer_from_knowledge_base(intent_result, processed_input, use_ai)
+            if knowledge_response:
+                return knowledge_response
+        
+        if use_ai:
+            return None
+        return self.generate_local_response(intent_result)
+    
+    def generate_response(self, intent_result: Dict, processed_input: Dict, session_id: Optional[str],
+                          on_token: Optional[Callable[[Optional[str]], None]] = None,
+                          client_key: Optional[str] = None, exempt: bool = False) -> Dict:
+        """Generate an appropriate response based on the classified intent.
+        
+        ``on_token`` receives AI answers as they stream in; local answers are only returned.
+        AI fallbacks are rate limited per ``client_key`` (default: the session id);
+        ``exempt`` skips the rate limit for internal callers such as warm-up.
+        """
+        local_response = self.try_local_response(intent_result, processed_input)
+        if local_response:
+            return local_response
+        
+        intent = intent_result.get('intent', 'unknown')
+        confidence = intent_result.get('confidence', 0.0)
+        user_message = processed_input.get('original_text', '')
+        
+        if self.admission_controller:
+            admission = self.admission_controller.admit(client_key or session_id, exempt=exempt)
+        else:
+            admission = nullcontext()
+        with admission as rejection:
+            if rejection:
+                # Keep this client's load off the providers and answer locally
+                ai_logger.warning(f"AI fallback skipped for {client_key or session_id}: {rejection}")
+                return self.generate_local_response(intent_result)
+            
+            print(f"🤖 Attempting AI fallback - Confidence: {confidence:.2f}, Intent: {intent}")
+            conversation = None
+            if self.conversation_manager is not None:
+                conversation = self.conversation_manager.get_prompt_context(
+                    session_id, self.history_token_budget, summary_token_budget=self.summary_token_budget
+                )
+            prompt = self.build_ai_prompt(user_message, processed_input, conversation)
+            ai_response = self._fallback_to_ai(user_message, processed_input, on_token=on_token, prompt=prompt)
+        
+        if ai_response == AI_FAILED_RESPONSE:
+            # Every provider failed; tell the user, but not as an AI answer that could be cached
+            return {
+                'response': ai_response,
+                'suggestions': list(AI_FALLBACK_SUGGESTIONS),
+                'confidence': confidence,
+                'intent': intent,
+                'source': 'ai_unavailable'
+            }
+        if ai_response and ai_response != AI_UNAVAILABLE_RESPONSE:
+            return {
+                'response': ai_response,
+                'suggestions': list(AI_FALLBACK_SUGGESTIONS),
+                'confidence': 0.9,  # High confidence for AI responses
+                'intent': 'ai_fallback',
+                'source': 'ai',
+                'prompt_tokens': estimate_tokens(prompt)
+            }
+        
+        return self.generate_local_response(intent_result)
\ No newline at end of file
@@ -0,0 +1,170 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+from chatbot.stemmer import stem
+from chatbot.training_data import NOT_PUBLISHED
+
+# Intents whose templates carry no facts worth retrieving
+NON_FACTUAL_INTENTS = {'greeting', 'goodbye', 'unknown'}
+
+# Conversational words that say nothing about which passage is wanted
+FILLER_WORDS = {
+    'tell', 'know', 'want', 'like', 'show', 'give', 'please', 'details', 'detail',
+    'information', 'info', 'about', 'can', 'could', 'would', 'will', 'there', 'any'
+}
+FILLER_STEMS = {stem(word) for word in FILLER_WORDS}
+
+
+def content_tokens(tokens: List[str]) -> List[str]:
+    """Drop filler words from stemmed query tokens."""
+    return [token for token in tokens if token not in FILLER_STEMS]
+
+
+def _humanize(key: str) -> str:
+    return key.replace('_', ' ')
+
+
+def _join(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item) for item in value)
+    return str(value)
+
+
+def build_passages(college_info: Dict, responses: Dict, faq: Dict,
+                   format_template: Callable[[str], str]) -> List[Dict]:
+    """Flatten COLLEGE_INFO, response templates and FAQ entries into answerable passages.
+
+    Each passage has the ``text`` returned to the user, the ``index_text`` used
+    for matching and the ``source`` it came from.
+    """
+    passages = []
+    name = college_info.get('name', 'the college')
+
+    def add(text: str, source: str, index_text: Optional[str] = None):
+        passages.append({'text': text, 'index_text': index_text or text, 'source': source})
+
+    for key, value in college_info.items():
+        if key == 'name':
+            continue
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if sub_value == NOT_PUBLISHED:
+                    # "Fees tuition per year: Contact office for details." answers nothing
+                    continue
+                label = f"{_humanize(key).capitalize()} {_humanize(sub_key)}"
+                add(f"{label}: {_join(sub_value)}.", f"college_info.{key}.{sub_key}")
+        elif isinstance(value, list):
+            # One passage per item, so a question about a single department finds it
+            for item in value:
+                add(f"{item} is one of the {_humanize(key)} at {name}.", f"college_info.{key}")
+        else:
+            add(f"{_humanize(key).capitalize()} of {name}: {value}.", f"college_info.{key}")
+
+    for intent, templates in responses.items():
+        if intent in NON_FACTUAL_INTENTS:
+            continue
+        for template in templates:
+            add(format_template(template), f"responses.{intent}")
+
+    for question, answer in faq.items():
+        text = format_template(answer)
+        add(text, 'faq', index_text=f"{question} {text}")
+
+    return passages
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index.
+
+    Document length norms and per-posting term weights are computed at build
+    time, so a search only sums precomputed weights over the query's postings.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.doc_count = 0
+
+    def build(self, documents: List[List[str]]) -> None:
+        """Index tokenized documents; a document's id is its position in the list."""
+        self.doc_count = len(documents)
+        avg_length = sum(len(doc) for doc in documents) / self.doc_count if documents else 0.0
+
+        term_freqs: Dict[str, Dict[int, int]] = {}
+        for doc_id, tokens in enumerate(documents):
+            for token in tokens:
+                term_freqs.setdefault(token, {}).setdefault(doc_id, 0)
+                term_freqs[token][doc_id] += 1
+
+        norms = [
+            self.k1 * (1 - self.b + self.b * len(doc) / avg_length) if avg_length else self.k1
+            for doc in documents
+        ]
+
+        self.postings = {}
+        for term, docs in term_freqs.items():
+            df = len(docs)
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            self.postings[term] = [
+                (doc_id, idf * tf * (self.k1 + 1) / (tf + norms[doc_id]))
+                for doc_id, tf in docs.items()
+            ]
+
+    def search(self, query_tokens: List[str], top_k: int = 3) -> List[Tuple[int, float, int]]:
+        """Return (doc_id, score, matched_terms) for the best matching documents."""
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in set(query_tokens):
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(doc_id, score, matched[doc_id]) for doc_id, score in ranked]
+
+
+class KnowledgeRetriever:
+    """Answer factual questions directly from the local knowledge base."""
+
+    def __init__(self, nlp_processor, passages: List[Dict],
+                 min_score: float = 3.0, min_coverage: float = 0.6):
+        self.nlp_processor = nlp_processor
+        self.passages = passages
+        self.min_score = min_score
+        self.min_coverage = min_coverage
+        self.index = BM25Index()
+        self.index.build([self._index_tokens(p['index_text']) for p in passages])
+
+    def _index_tokens(self, text: str) -> List[str]:
+        nlp = self.nlp_processor
+        return nlp.stem_tokens(nlp.remove_stop_words(nlp.tokenize(text)))
+
+    def search(self, query_tokens: List[str], top_k: int = 3) -> List[Dict]:
+        """Rank passages for stemmed, stop-word-free query tokens."""
+        query_tokens = content_tokens(query_tokens)
+        distinct = set(query_tokens)
+        if not distinct:
+            return []
+        results = []
+        for doc_id, score, matched in self.index.search(query_tokens, top_k):
+            results.append({
+                **self.passages[doc_id],
+                'score': score,
+                'coverage': matched / len(distinct)
+            })
+        return results
+
+    def answer(self, processed_input: Dict) -> Optional[Dict]:
+        """Return the top passage if it matches the query strongly enough."""
+        query_tokens = list(processed_input.get('clean_tokens', []))
+        if not query_tokens:
+            return None
+
+        results = self.search(query_tokens, top_k=1)
+        if not results:
+            return None
+
+        best = results[0]
+        if best['score'] < self.min_score or best['coverage'] < self.min_coverage:
+            return None
+        return best
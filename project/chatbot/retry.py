@@ -0,0 +1,96 @@
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# HTTP statuses worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Exception class names used by the provider SDKs for transient failures
+RETRYABLE_ERROR_NAMES = (
+    'Timeout', 'ConnectionError', 'APIConnectionError', 'RateLimitError',
+    'InternalServerError', 'ServiceUnavailable', 'ResourceExhausted', 'DeadlineExceeded'
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's time budget runs out before it succeeds."""
+
+
+class AIServiceError(Exception):
+    """A provider failure, optionally carrying the HTTP status it returned."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: Optional[bool] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class Deadline:
+    """A fixed point in time by which a request must finish."""
+
+    def __init__(self, budget: float, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for one call: the remaining budget, but no more than ``cap``."""
+        return min(cap, self.remaining())
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Decide whether a failure is transient, following wrapped causes."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, DeadlineExceeded):
+            return False
+        retryable = getattr(error, 'retryable', None)
+        if retryable is not None:
+            return retryable
+        if isinstance(error, (TimeoutError, ConnectionError)):
+            return True
+        for attribute in ('status_code', 'code'):
+            status = getattr(error, attribute, None)
+            if isinstance(status, int) and status in RETRYABLE_STATUS_CODES:
+                return True
+        if any(name in type(error).__name__ for name in RETRYABLE_ERROR_NAMES):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def call_with_retries(func: Callable[[Deadline], T], deadline: Deadline, max_retries: int = 2,
+                      base_delay: float = 0.5, max_delay: float = 4.0,
+                      sleep: Callable[[float], None] = time.sleep,
+                      jitter: Callable[[], float] = random.random,
+                      on_retry: Optional[Callable[[int, float, Exception], None]] = None) -> T:
+    """Call ``func(deadline)``, retrying transient failures with full-jitter backoff.
+
+    Non-retryable errors are raised at once. A retry is only scheduled if its
+    delay ends before the deadline; ``func`` should bound its own calls with
+    ``deadline.timeout()`` so the whole sequence finishes within the budget.
+    """
+    attempt = 0
+    while True:
+        if deadline.expired():
+            raise DeadlineExceeded("Deadline reached before the call could start")
+        try:
+            return func(deadline)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = jitter() * min(max_delay, base_delay * 2 ** attempt)
+            if delay >= deadline.remaining():
+                raise DeadlineExceeded(f"No time left to retry after: {e}") from e
+            if on_retry:
+                on_retry(attempt + 1, delay, e)
+            sleep(delay)
+            attempt += 1
@@ -0,0 +1,137 @@
+from typing import Container, Dict, Iterable, List, Optional, Set
+
+class SpellCorrector:
+    """Spelling correction backed by a precomputed symmetric-delete index (SymSpell).
+
+    Every vocabulary word is indexed under all strings reachable by deleting up to
+    ``max_edit_distance`` characters. A lookup only generates the deletes of the
+    input token and reads candidates from the index, so its cost depends on the
+    token length rather than the vocabulary size.
+
+    Tokens in ``known_words`` (e.g. a general English lexicon) are real words
+    that just are not in the vocabulary; they are left alone instead of being
+    pulled to the nearest vocabulary word.
+    """
+
+    def __init__(self, max_edit_distance: int = 2, min_length: int = 4, long_length: int = 8,
+                 cache_size: int = 10000, known_words: Container[str] = ()):
+        self.max_edit_distance = max_edit_distance
+        self.min_length = min_length
+        self.long_length = long_length
+        self.cache_size = cache_size
+        self.known_words = known_words
+        self.words: Dict[str, int] = {}
+        self.deletes: Dict[str, List[str]] = {}
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def add_word(self, word: str, count: int = 1) -> None:
+        """Add a word to the vocabulary and index its deletes."""
+        if word in self.words:
+            self.words[word] += count
+            return
+
+        self.words[word] = count
+        for variant in self._deletes(word, self.max_edit_distance):
+            self.deletes.setdefault(variant, []).append(word)
+        self._cache.clear()
+
+    def build(self, words: Iterable[str], count: int = 1) -> None:
+        """Add many words to the vocabulary."""
+        for word in words:
+            self.add_word(word, count)
+
+    def _deletes(self, word: str, distance: int) -> Set[str]:
+        """Generate the word and every string reachable by up to `distance` deletes."""
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def max_distance_for(self, token: str) -> int:
+        """Allow fewer edits on short tokens to avoid false corrections."""
+        if len(token) < self.min_length:
+            return 0
+        if len(token) < self.long_length:
+            return min(1, self.max_edit_distance)
+        return self.max_edit_distance
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Find the closest vocabulary word within the allowed edit distance."""
+        if token in self.words:
+            return token
+        if token in self._cache:
+            return self._cache[token]
+        if token in self.known_words:
+            return None
+
+        max_distance = self.max_distance_for(token)
+        best = None
+        if max_distance:
+            best_key = None
+            seen = set()
+            for variant in self._deletes(token, max_distance):
+                for candidate in self.deletes.get(variant, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    if abs(len(candidate) - len(token)) > max_distance:
+                        continue
+                    distance = edit_distance(token, candidate, max_distance)
+                    if distance > max_distance:
+                        continue
+                    # Prefer fewer edits, then more frequent words, then alphabetical order
+                    key = (distance, -self.words[candidate], candidate)
+                    if best_key is None or key < best_key:
+                        best_key = key
+                        best = candidate
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[token] = best
+        return best
+
+    def correct(self, token: str) -> str:
+        """Return the corrected token, or the token itself if no correction is found."""
+        return self.lookup(token) or token
+
+
+def edit_distance(source: str, target: str, max_distance: int) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Returns ``max_distance + 1`` as soon as the distance is known to exceed the limit.
+    """
+    if source == target:
+        return 0
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+        row_min = current[0]
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,          # deletion
+                current[j - 1] + 1,       # insertion
+                previous[j - 1] + cost    # substitution
+            )
+            if (i > 1 and j > 1 and source[i - 1] == target[j - 2]
+                    and source[i - 2] == target[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)  # transposition
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1]
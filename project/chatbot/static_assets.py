@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+from flask import Request, Response, send_file
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Encodings written at build time, in order of preference, with their file suffixes
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.js', '.mjs', '.css', '.html', '.svg', '.json', '.map', '.txt', '.xml', '.ico', '.webmanifest'}
+
+# Vite writes content-hashed bundles as assets/<name>-<hash>.<ext>
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+# A hashed file never changes, so browsers may keep it for a year without asking;
+# anything else is revalidated with its ETag on every load
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output identical between builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_directory(root: str, min_size: int = 1024) -> Dict[str, int]:
+    """Write .gz (and .br when brotli is installed) next to each compressible file.
+
+    A variant is only kept when it is smaller than the original.
+    """
+    encodings = [(encoding, suffix) for encoding, suffix in ENCODINGS if encoding != 'br' or BROTLI_AVAILABLE]
+    totals = {'files': 0, 'original_bytes': 0}
+    for encoding, _ in encodings:
+        totals[f'{encoding}_bytes'] = 0
+
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            extension = os.path.splitext(filename)[1].lower()
+            if extension not in COMPRESSIBLE_EXTENSIONS or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            totals['files'] += 1
+            totals['original_bytes'] += len(data)
+            for encoding, suffix in encodings:
+                compressed = _compress(data, encoding)
+                if len(compressed) < len(data):
+                    with open(path + suffix, 'wb') as handle:
+                        handle.write(compressed)
+                    totals[f'{encoding}_bytes'] += len(compressed)
+                else:
+                    totals[f'{encoding}_bytes'] += len(data)
+    return totals
+
+
+class StaticAssets:
+    """Serve a built frontend, picking a precompressed variant per request.
+
+    Files are indexed once (content hash for the ETag, available variants), so a
+    request only negotiates ``Accept-Encoding`` and hands the file to the server.
+    Content-hashed bundles are cached as immutable; everything else, including
+    index.html, is revalidated with its ETag on each load.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets: Dict[str, Dict] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """(Re)index every file under the root, e.g. after a new build."""
+        self.assets = {}
+        if not os.path.isdir(self.root):
+            return
+        suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(suffixes):
+                    continue
+                relative = os.path.relpath(os.path.join(directory, filename), self.root)
+                self._index(relative.replace(os.sep, '/'))
+
+    def _index(self, filename: str) -> Optional[Dict]:
+        path = safe_join(self.root, filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as handle:
+            etag = hashlib.sha1(handle.read()).hexdigest()[:20]
+        entry = {
+            'path': path,
+            'etag': etag,
+            'mimetype': mimetypes.guess_type(path)[0] or 'application/octet-stream',
+            'variants': {
+                encoding: path + suffix
+                for encoding, suffix in ENCODINGS
+                if os.path.isfile(path + suffix)
+            },
+            'cache_control': IMMUTABLE_CACHE_CONTROL if HASHED_ASSET.match(filename) else REVALIDATE_CACHE_CONTROL
+        }
+        self.assets[filename] = entry
+        return entry
+
+    def negotiate(self, variants: Dict[str, str], request: Request) -> Optional[str]:
+        """Pick the preferred encoding that both the client and the build offer."""
+        for encoding, _ in ENCODINGS:
+            if encoding in variants and request.accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+    def serve(self, filename: str, request: Request) -> Optional[Response]:
+        """Build the response for ``filename``; returns None when there is no such file."""
+        entry = self.assets.get(filename) or self._index(filename)
+        if entry is None:
+            return None
+        variants = entry['variants']
+        encoding = self.negotiate(variants, request)
+        if encoding:
+            # Each encoding is a separate representation with its own validator
+            response = send_file(variants[encoding], mimetype=entry['mimetype'], etag=f"{entry['etag']}-{encoding}")
+            if response.status_code != 304:
+                response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_file(entry['path'], mimetype=entry['mimetype'], etag=entry['etag'])
+        if variants:
+            response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = entry['cache_control']
+        return response
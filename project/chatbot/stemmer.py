@@ -0,0 +1,167 @@
+from typing import Dict, List, Tuple
+
+class PorterStemmer:
+    """Suffix-stripping stemmer following the Porter (1980) algorithm.
+
+    Stems are memoized per token, so repeated vocabulary costs a dict lookup.
+    """
+
+    VOWELS = frozenset('aeiou')
+
+    STEP2_SUFFIXES: List[Tuple[str, str]] = [
+        ('ational', 'ate'), ('tional', 'tion'), ('enci', 'ence'), ('anci', 'ance'),
+        ('izer', 'ize'), ('bli', 'ble'), ('alli', 'al'), ('entli', 'ent'), ('eli', 'e'),
+        ('ousli', 'ous'), ('ization', 'ize'), ('ation', 'ate'), ('ator', 'ate'),
+        ('alism', 'al'), ('iveness', 'ive'), ('fulness', 'ful'), ('ousness', 'ous'),
+        ('aliti', 'al'), ('iviti', 'ive'), ('biliti', 'ble'), ('logi', 'log'),
+    ]
+
+    STEP3_SUFFIXES: List[Tuple[str, str]] = [
+        ('icate', 'ic'), ('ative', ''), ('alize', 'al'), ('iciti', 'ic'),
+        ('ical', 'ic'), ('ful', ''), ('ness', ''),
+    ]
+
+    STEP4_SUFFIXES: List[str] = [
+        'al', 'ance', 'ence', 'er', 'ic', 'able', 'ible', 'ant', 'ement', 'ment',
+        'ent', 'ion', 'ou', 'ism', 'ate', 'iti', 'ous', 'ive', 'ize',
+    ]
+
+    def __init__(self, cache_size: int = 50000):
+        self.cache_size = cache_size
+        self._cache: Dict[str, str] = {}
+        # Longest suffix first, so the first match is the one the algorithm requires
+        self._step2_rules = sorted(self.STEP2_SUFFIXES, key=lambda rule: len(rule[0]), reverse=True)
+        self._step3_rules = sorted(self.STEP3_SUFFIXES, key=lambda rule: len(rule[0]), reverse=True)
+        self._step4_rules = sorted(self.STEP4_SUFFIXES, key=len, reverse=True)
+
+    def stem(self, word: str) -> str:
+        """Stem a lowercase word, using the cache when possible."""
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+
+        result = self.stem_uncached(word)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[word] = result
+        return result
+
+    def stem_uncached(self, word: str) -> str:
+        """Stem a lowercase word without consulting the cache."""
+        if len(word) <= 2 or not word.isalpha():
+            return word
+
+        word = self._step1a(word)
+        word = self._step1b(word)
+        word = self._step1c(word)
+        word = self._step2_3(word, self._step2_rules)
+        word = self._step2_3(word, self._step3_rules)
+        word = self._step4(word)
+        word = self._step5(word)
+        return word
+
+    def _is_consonant(self, word: str, i: int) -> bool:
+        """A consonant is a non-vowel, with 'y' a consonant unless it follows one."""
+        letter = word[i]
+        if letter in self.VOWELS:
+            return False
+        if letter == 'y':
+            return i == 0 or not self._is_consonant(word, i - 1)
+        return True
+
+    def _measure(self, stem: str) -> int:
+        """Count the VC sequences in a stem ([C](VC)^m[V])."""
+        m = 0
+        previous_vowel = False
+        for i in range(len(stem)):
+            consonant = self._is_consonant(stem, i)
+            if consonant and previous_vowel:
+                m += 1
+            previous_vowel = not consonant
+        return m
+
+    def _has_vowel(self, stem: str) -> bool:
+        return any(not self._is_consonant(stem, i) for i in range(len(stem)))
+
+    def _ends_double_consonant(self, word: str) -> bool:
+        return (len(word) >= 2 and word[-1] == word[-2]
+                and self._is_consonant(word, len(word) - 1))
+
+    def _ends_cvc(self, word: str) -> bool:
+        """Check for consonant-vowel-consonant ending where the last is not w, x or y."""
+        return (len(word) >= 3
+                and self._is_consonant(word, len(word) - 3)
+                and not self._is_consonant(word, len(word) - 2)
+                and self._is_consonant(word, len(word) - 1)
+                and word[-1] not in 'wxy')
+
+    def _step1a(self, word: str) -> str:
+        if word.endswith('sses'):
+            return word[:-2]
+        if word.endswith('ies'):
+            return word[:-2]
+        if word.endswith('ss'):
+            return word
+        if word.endswith('s'):
+            return word[:-1]
+        return word
+
+    def _step1b(self, word: str) -> str:
+        if word.endswith('eed'):
+            return word[:-1] if self._measure(word[:-3]) > 0 else word
+
+        for suffix in ('ed', 'ing'):
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                if not self._has_vowel(stem):
+                    return word
+                if stem.endswith(('at', 'bl', 'iz')):
+                    return stem + 'e'
+                if self._ends_double_consonant(stem) and stem[-1] not in 'lsz':
+                    return stem[:-1]
+                if self._measure(stem) == 1 and self._ends_cvc(stem):
+                    return stem + 'e'
+                return stem
+        return word
+
+    def _step1c(self, word: str) -> str:
+        if word.endswith('y') and self._has_vowel(word[:-1]):
+            return word[:-1] + 'i'
+        return word
+
+    def _step2_3(self, word: str, rules: List[Tuple[str, str]]) -> str:
+        for suffix, replacement in rules:
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                return stem + replacement if self._measure(stem) > 0 else word
+        return word
+
+    def _step4(self, word: str) -> str:
+        for suffix in self._step4_rules:
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                if self._measure(stem) <= 1:
+                    return word
+                if suffix == 'ion' and not stem.endswith(('s', 't')):
+                    return word
+                return stem
+        return word
+
+    def _step5(self, word: str) -> str:
+        if word.endswith('e'):
+            stem = word[:-1]
+            m = self._measure(stem)
+            if m > 1 or (m == 1 and not self._ends_cvc(stem)):
+                word = stem
+        if word.endswith('ll') and self._measure(word) > 1:
+            word = word[:-1]
+        return word
+
+
+# Shared instance so training keywords and queries are stemmed identically
+porter_stemmer = PorterStemmer()
+
+
+def stem(word: str) -> str:
+    """Stem a word with the shared, memoized Porter stemmer."""
+    return porter_stemmer.stem(word)
@@ -145,6 +145,9 @@ TRAINING_DATA = {
     }
 }
 
+# Stands in for figures the college has not published; answers point to the office instead
+NOT_PUBLISHED = 'Contact office for details'
+
 # Additional data for enhancing responses
 COLLEGE_INFO = {
     'name': 'Rajeev Gandhi Memorial College of Engineering and Technology',
@@ -168,9 +171,9 @@ COLLEGE_INFO = {
         ]
     },
     'fees': {
-        'tuition_per_year': 'Contact office for details',
-        'other_fees': 'Contact office for details',
-        'hostel_fee': 'Contact office for details'
+        'tuition_per_year': NOT_PUBLISHED,
+        'other_fees': NOT_PUBLISHED,
+        'hostel_fee': NOT_PUBLISHED
     },
     'departments': [
         'Electronics & Communication Engineering',
@@ -187,6 +190,75 @@ COLLEGE_INFO = {
     ]
 }
 
+# Names students use for each department, matched by the entity recognizer
+DEPARTMENT_ALIASES = {
+    'Electronics & Communication Engineering': ['ece', 'electronics and communication', 'electronics & communication engineering'],
+    'Electrical & Electronics Engineering': ['eee', 'electrical', 'electrical and electronics', 'electrical & electronics engineering'],
+    'Civil Engineering': ['civil', 'civil engineering'],
+    'Mechanical Engineering': ['mech', 'mechanical', 'mechanical engineering'],
+    'Master of Business Administration': ['mba', 'business administration'],
+    'Master of Computer Applications': ['mca', 'computer applications'],
+    'Computer Science & Engineering': ['cse', 'computer science', 'computer science and engineering'],
+    'Computer Science & Engineering (Data Science)': ['data science', 'cse ds', 'cse data science', 'csd'],
+    'Computer Science & Engineering (AI & ML)': [
+        'aiml', 'ai ml', 'ai and ml', 'cse ai ml', 'cse aiml', 'csm',
+        'artificial intelligence and machine learning'
+    ],
+    'Computer Science & Engineering (Cyber Security)': ['cyber security', 'cybersecurity', 'cse cyber security', 'csc'],
+    'CSE & Business Systems': ['csbs', 'cse bs', 'business systems', 'cse business systems']
+}
+
+# Entrance exams and the names they are also known by
+EXAM_ALIASES = {
+    'EAMCET': ['eamcet', 'ap eamcet', 'eapcet', 'ap eapcet'],
+    'ECET': ['ecet', 'ap ecet'],
+    'PGECET': ['pgecet', 'pg ecet', 'ap pgecet'],
+    'ICET': ['icet', 'ap icet']
+}
+
+# Per-department details used to fill department slots in responses
+DEPARTMENT_INFO = {
+    'Electronics & Communication Engineering': {'short_name': 'ECE', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Electrical & Electronics Engineering': {'short_name': 'EEE', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Civil Engineering': {'short_name': 'Civil', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Mechanical Engineering': {'short_name': 'Mechanical', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Master of Business Administration': {'short_name': 'MBA', 'degree': 'MBA', 'duration': '2-year', 'entrance_exams': ['ICET']},
+    'Master of Computer Applications': {'short_name': 'MCA', 'degree': 'MCA', 'duration': '2-year', 'entrance_exams': ['ICET']},
+    'Computer Science & Engineering': {'short_name': 'CSE', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Computer Science & Engineering (Data Science)': {'short_name': 'CSE (Data Science)', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Computer Science & Engineering (AI & ML)': {'short_name': 'CSE (AI & ML)', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'Computer Science & Engineering (Cyber Security)': {'short_name': 'CSE (Cyber Security)', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']},
+    'CSE & Business Systems': {'short_name': 'CSBS', 'degree': 'B.Tech', 'duration': '4-year', 'entrance_exams': ['EAMCET', 'ECET']}
+}
+
+# What each entrance exam is used for
+EXAM_INFO = {
+    'EAMCET': {'full_name': 'Engineering, Agriculture and Medical Common Entrance Test', 'admits': 'first-year B.Tech admission'},
+    'ECET': {'full_name': 'Engineering Common Entrance Test', 'admits': 'lateral entry into second-year B.Tech for diploma holders'},
+    'PGECET': {'full_name': 'Post Graduate Engineering Common Entrance Test', 'admits': 'postgraduate engineering admission'},
+    'ICET': {'full_name': 'Integrated Common Entrance Test', 'admits': 'MBA and MCA admission'}
+}
+
+# Frequently asked factual questions, answered through local retrieval
+FAQ = {
+    "Is Cyber Security a separate department or branch?":
+        "Yes. Computer Science & Engineering (Cyber Security) is a separate department at {name}, alongside the Data Science and AI & ML specializations of CSE.",
+    "Is Data Science offered as a branch?":
+        "Yes. Computer Science & Engineering (Data Science) is offered as its own department at {name}.",
+    "Is AI and ML (artificial intelligence and machine learning) offered as a branch?":
+        "Yes. Computer Science & Engineering (AI & ML) is offered as its own department at {name}.",
+    "Do you offer MBA and MCA postgraduate programs?":
+        "Yes. {name} has a Master of Business Administration (MBA) department and a Master of Computer Applications (MCA) department.",
+    "When was the college established and what is its accreditation?":
+        "{name} was established in {established} and is accredited by {accreditation}.",
+    "What is the full address of the college?":
+        "The college is located at Nerawada 'X' Roads, Nandyal, Andhra Pradesh 518501.",
+    "Is there separate hostel accommodation for girls and boys?":
+        "Yes. Our hostels provide separate accommodation for male and female students with 24/7 security, WiFi, and study areas.",
+    "How many students and faculty members are there?":
+        "{name} has {student_count} students and {faculty_count} faculty members on a {campus_size} campus."
+}
+
 # Responses for the chatbot
 RESPONSES = {
     'greeting': [
@@ -256,6 +328,42 @@ RESPONSES = {
     ]
 }
 
+# Responses about a named department, by intent; 'default' is used when the intent is unknown
+DEPARTMENT_RESPONSES = {
+    'fee_info': [
+        "For the {duration} {degree} in {department}, the tuition fee per year is: {fees[tuition_per_year]}. Other fees: {fees[other_fees]}.",
+    ],
+    # Used instead of 'fee_info' while the fees in COLLEGE_INFO are NOT_PUBLISHED
+    'fee_info_unpublished': [
+        "Fees for the {duration} {degree} in {department} are not published here. Please contact the college office at +91 85142 75203 or principal.9@jntua.ac.in for the current fee structure.",
+    ],
+    'course_info': [
+        "{department} is a {duration} {degree} program at {name}. Admission is through {entrance_exams}.",
+    ],
+    'admission_info': [
+        "Admission to {department} ({degree}) is through {entrance_exams}. Applications open on {admissions[application_open_date]} and the final deadline is {admissions[final_deadline]}.",
+    ],
+    'entrance_exam_info': [
+        "Admission to {department} is through {entrance_exams}. Cutoff ranks vary every year by branch and category; please contact the admissions office for the latest cutoffs.",
+    ],
+    'default': [
+        "{department} is a {duration} {degree} program at {name}, with admission through {entrance_exams}. For seat intake and fees, please contact the admissions office.",
+    ]
+}
+
+# Responses about a named entrance exam, by intent
+EXAM_RESPONSES = {
+    'entrance_exam_info': [
+        "{exam} ({full_name}) is accepted for {admits}. Cutoff ranks vary every year by branch and category; please contact the admissions office for the latest cutoffs.",
+    ],
+    'admission_info': [
+        "{exam} scores are accepted for {admits} at {name}, covering: {programs}. Applications open on {admissions[application_open_date]}.",
+    ],
+    'default': [
+        "{exam} ({full_name}) is accepted at {name} for {admits}.",
+    ]
+}
+
 # Follow-up suggestions
 SUGGESTIONS = {
     'greeting': ["Tell me about admissions", "What courses do you offer?", "What are the fees?"],
@@ -272,4 +380,22 @@ SUGGESTIONS = {
     'application_deadline': ["When do applications open?", "Is there a late fee for submission?", "When will the results be announced?"],
     'entrance_exam_info': ["What is the exam pattern?", "Are there sample papers available?", "What are the typical cutoff scores?"],
     'default': ["What are the admission requirements?", "Tell me about the courses.", "What is the fee structure?"]
-}
\ No newline at end of file
+}
+
+# What a bare "yes" or "tell me more" asks for after an answer about each intent:
+# the question that answer ends with, or its first suggestion. Intents not listed
+# are answered again from their own templates.
+FOLLOW_UP_INTENTS = {
+    'admission_info': 'documents_required',
+    'documents_required': 'application_deadline',
+    'application_deadline': 'entrance_exam_info',
+    'entrance_exam_info': 'admission_info',
+    'fee_info': 'scholarship_info',
+    'scholarship_info': 'admission_info',
+    'course_info': 'faculty_info',
+    'faculty_info': 'course_info',
+    'facility_info': 'hostel_info',
+    'hostel_info': 'facility_info',
+    'campus_info': 'facility_info',
+    'placement_info': 'course_info'
+}
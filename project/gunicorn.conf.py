@@ -0,0 +1,50 @@
+"""Gunicorn settings for serving the chatbot in production.
+
+Run from the project root:
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app (NLP processor, trained classifier, templates, retrieval index and
+warmed caches) is loaded once in the master and shared with the workers
+copy-on-write.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Local answers are CPU-bound, so one process per core; threads per worker
+# cover requests waiting on AI providers. An open WebSocket holds a thread for
+# its lifetime, so app.py lets sockets take at most half of them
+# (WEBSOCKET_MAX_CONNECTIONS) and closes idle ones
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+
+# Build the models before forking so workers share their memory pages
+preload_app = True
+
+# Longer than the AI deadline (20s) so a slow fallback is not killed mid-answer
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    # Move the preloaded objects out of the collector's reach; otherwise the
+    # first collection in each worker touches them and un-shares their pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Froze {gc.get_freeze_count()} preloaded objects before forking {workers} workers")
+
+
+def post_fork(server, worker):
+    # Background threads must start in the worker: threads of the master are
+    # not copied by fork, and could leave locks they held locked in the child
+    import app
+    app.start_ai_warmup()
@@ -0,0 +1,81 @@
+"""Report intent mix, AI fallback rate, unknown-query clusters and latency from chat logs.
+
+Reads structured chat events (and the older "Session ...: Intent=..." lines)
+one line at a time, so memory stays constant however large the logs are.
+Files ending in .gz, .bz2 or .xz are decompressed on the fly; ``-`` reads stdin.
+
+Run from the project root:
+    python -m scripts.analyze_chat_logs logs/chat_events.log logs/chat_events.log.1.gz
+    python -m scripts.analyze_chat_logs --json --top 20 app.log
+"""
+
+import argparse
+import json
+
+from chatbot.log_analytics import ChatLogAnalyzer, iter_events
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.retrieval import content_tokens
+
+
+def make_normalizer():
+    """Group unknown queries by their distinct content-word stems."""
+    nlp = NLPProcessor()
+
+    def normalize(message):
+        tokens = nlp.stem_tokens(nlp.remove_stop_words(nlp.tokenize(message)))
+        return ' '.join(sorted(set(content_tokens(tokens))))
+
+    return normalize
+
+
+def print_report(report, top):
+    total = report['events']
+    print(f"Chat events: {total:,}")
+    if not total:
+        return
+
+    print(f"AI fallback rate: {report['ai_fallback_rate']:.1%}   Unknown intent rate: {report['unknown_rate']:.1%}")
+
+    print("\nIntents:")
+    for intent, count in report['intents'].items():
+        print(f"  {intent:<24} {count:>10,} {count / total:>7.1%}")
+
+    print("\nAnswer sources:")
+    for source, count in report['sources'].items():
+        print(f"  {source:<24} {count:>10,} {count / total:>7.1%}")
+
+    latency = report['latency_ms']
+    if latency['count']:
+        print(f"\nLatency (ms, {latency['count']:,} events): mean {latency['mean']:.1f}  "
+              f"p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  "
+              f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+
+    prompts = report['prompt_tokens']
+    if prompts['count']:
+        print(f"AI prompt tokens ({prompts['count']:,} calls): mean {prompts['mean']:.0f}  max {prompts['max']:,}")
+
+    if report['unknown_clusters']:
+        print(f"\nTop {top} unknown-query clusters (counts are lower bounds):")
+        for cluster in report['unknown_clusters']:
+            print(f"  {cluster['count']:>8,}  {cluster['key'] or '-':<32} e.g. \"{cluster['example']}\"")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help="log files (plain, .gz, .bz2, .xz) or - for stdin")
+    parser.add_argument('--top', type=int, default=10, help="number of unknown-query clusters to show")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    analyzer = ChatLogAnalyzer(normalize=make_normalizer())
+    analyzer.consume(iter_events(args.paths))
+    report = analyzer.report(top=args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
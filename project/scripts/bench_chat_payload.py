@@ -0,0 +1,98 @@
+"""Measure serialization time and bytes per /api/chat response.
+
+Compares Flask's default JSON provider with FastJSONProvider (orjson, when
+installed), and the raw body with the gzip body compress_response sends,
+for a short template answer, a composed answer and a long AI answer.
+
+Run from the project root:
+    python -m scripts.bench_chat_payload [--repeat N]
+"""
+
+import argparse
+import gzip
+import timeit
+from datetime import datetime
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from chatbot.conversation_manager import ConversationManager
+from chatbot.payloads import DEFAULT_COMPRESS_MIN_SIZE, ORJSON_AVAILABLE, FastJSONProvider
+from chatbot.response_generator import AI_FALLBACK_SUGGESTIONS
+from chatbot.training_data import RESPONSES, SUGGESTIONS
+
+AI_ANSWER = (
+    "Both branches lead to strong careers, but they suit different interests. "
+    "Computer Science & Engineering focuses on programming, algorithms, data structures "
+    "and systems, and graduates typically move into software development, data and cloud roles. "
+    "The AI & ML specialization adds machine learning, deep learning and data analysis on top of "
+    "the core CSE subjects, which helps if you want to work on intelligent systems or go on to "
+    "research. If you are unsure, core CSE keeps more options open, while AI & ML lets you "
+    "specialize earlier. Talk to the department about the electives and project work in each, "
+    "and consider which problems you enjoy solving. "
+) * 2
+
+
+def make_payload(response, suggestions, session_suggestions=False):
+    payload = {
+        'response': response,
+        'intent': 'fee_info',
+        'confidence': 0.8123,
+        'suggestions': list(suggestions),
+        'timestamp': datetime.now().isoformat()
+    }
+    if session_suggestions:
+        payload['suggestions_etag'] = '3f9a2c71d04be815'
+        payload['session_suggestions'] = list(ConversationManager.DEFAULT_SUGGESTIONS)
+    return payload
+
+
+def time_per_call(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = [('default', DefaultJSONProvider(app))]
+    if ORJSON_AVAILABLE:
+        providers.append(('orjson', FastJSONProvider(app)))
+    else:
+        print("orjson not installed; only the default provider is measured (pip install orjson)")
+
+    payloads = {
+        'template answer': make_payload(RESPONSES['fee_info'][0], SUGGESTIONS['fee_info']),
+        'composed answer': make_payload("\n\n".join(RESPONSES[intent][0] for intent in ('fee_info', 'scholarship_info')),
+                                        SUGGESTIONS['fee_info']),
+        'AI answer': make_payload(AI_ANSWER, AI_FALLBACK_SUGGESTIONS),
+        'AI answer + session': make_payload(AI_ANSWER, AI_FALLBACK_SUGGESTIONS, session_suggestions=True),
+    }
+
+    header = f"{'payload':<20} {'bytes':>6} {'gzip':>6}"
+    for name, _ in providers:
+        header += f" {name + ' µs':>11}"
+    header += f" {'gzip µs':>8}"
+    print(f"Responses of {DEFAULT_COMPRESS_MIN_SIZE} bytes or more are gzipped")
+    print(header)
+    with app.app_context():
+        for label, payload in payloads.items():
+            body = providers[0][1].response(payload).get_data()
+            compressed = gzip.compress(body, compresslevel=6)
+            line = f"{label:<20} {len(body):>6} {len(compressed):>6}"
+            for _, provider in providers:
+                line += f" {time_per_call(lambda: provider.response(payload).get_data(), args.repeat) * 1e6:>11.1f}"
+            line += f" {time_per_call(lambda: gzip.compress(body, compresslevel=6), args.repeat // 4) * 1e6:>8.1f}"
+            print(line)
+
+        encode = providers[0][1].response
+        separate = len(encode({'suggestions': list(ConversationManager.DEFAULT_SUGGESTIONS)}).get_data())
+        inline = len(encode(payloads['AI answer + session']).get_data()) - len(encode(payloads['AI answer']).get_data())
+        print(f"\nSession suggestions: a separate GET /api/suggestions is one more request with a {separate} byte body;"
+              f" inline they add {inline} bytes to the chat response (only the ETag while the list is unchanged)")
+
+
+if __name__ == '__main__':
+    main()
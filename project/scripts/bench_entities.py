@@ -0,0 +1,61 @@
+"""Measure pattern entity extraction on short and long messages.
+
+Compares the previous four separate re.findall scans with the single
+combined pass in NLPProcessor.find_entities, and shows what each returns.
+
+Run from the project root:
+    python -m scripts.bench_entities [--repeat N]
+"""
+
+import argparse
+import re
+import timeit
+
+from chatbot.nlp_processor import NLPProcessor
+
+SHORT = "My EAMCET rank is 12000, I scored 92.5% in 2024. Mail me at ravi.k@gmail.com"
+FILLER = "I want to know the fees for the computer science course and whether the hostel is available. "
+
+
+def legacy_entities(text):
+    """The four uncompiled scans extract_entities used to run."""
+    entities = {
+        'numbers': re.findall(r'\b\d+\b', text),
+        'emails': re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
+        'years': re.findall(r'\b(19|20)\d{2}\b', text),
+        'percentages': re.findall(r'\b\d+(\.\d+)?%\b', text)
+    }
+    return {k: v for k, v in entities.items() if v}
+
+
+def combined_entities(nlp, text):
+    entities = {}
+    for entity_type, value, _, _ in nlp.find_entities(text):
+        entities.setdefault(entity_type, []).append(value)
+    return entities
+
+
+def time_per_call(func, repeat):
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    nlp = NLPProcessor()
+
+    print(f"legacy:   {legacy_entities(SHORT)}")
+    print(f"combined: {combined_entities(nlp, SHORT)}")
+    print()
+    print(f"{'words':>7} {'legacy µs':>11} {'combined µs':>12} {'speedup':>8}")
+    for copies in (0, 10, 100):
+        text = SHORT + " " + (FILLER + SHORT + " ") * copies
+        repeat = max(10, args.repeat // (copies + 1))
+        legacy = time_per_call(lambda: legacy_entities(text), repeat)
+        combined = time_per_call(lambda: combined_entities(nlp, text), repeat)
+        print(f"{len(text.split()):>7} {legacy * 1e6:>11.1f} {combined * 1e6:>12.1f} {legacy / combined:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Measure sustained conversation-history writes.
+
+Compares committing every exchange on the request thread with the
+background HistoryWriter, and reports how long append() holds the caller.
+
+Run from the project root:
+    python -m scripts.bench_history_writer [--records N]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from chatbot.history_store import HISTORY_COLUMNS, HistoryWriter, connect
+
+_INSERT = f"INSERT INTO exchanges ({', '.join(HISTORY_COLUMNS)}) VALUES ({', '.join('?' * len(HISTORY_COLUMNS))})"
+
+
+def make_record(i):
+    return {
+        'session_id': f"session-{i % 500}",
+        'timestamp': datetime.now().isoformat(),
+        'user_message': "What is the fee structure for CSE?",
+        'bot_response': "The fee for B.Tech CSE is as per the AP EAPCET convener quota. " * 3,
+        'intent': 'fees_info',
+        'confidence': 0.82,
+        'source': 'local'
+    }
+
+
+def count_rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def bench_synchronous(path, records):
+    connection = connect(path)
+    start = time.perf_counter()
+    for record in records:
+        with connection:
+            connection.execute(_INSERT, tuple(record.get(column) for column in HISTORY_COLUMNS))
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed, elapsed
+
+
+def bench_write_behind(path, records, max_buffer):
+    writer = HistoryWriter(path, max_buffer=max_buffer)
+    start = time.perf_counter()
+    for record in records:
+        writer.append(record)
+    appended = time.perf_counter() - start
+    writer.close()
+    elapsed = time.perf_counter() - start
+    return appended, elapsed, writer.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+    records = [make_record(i) for i in range(args.records)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        sync_path = os.path.join(directory, 'sync.db')
+        behind_path = os.path.join(directory, 'behind.db')
+
+        _, sync_elapsed = bench_synchronous(sync_path, records)
+        appended, behind_elapsed, stats = bench_write_behind(behind_path, records, max_buffer=args.records)
+
+        print(f"Records: {args.records}")
+        print(f"{'mode':<22} {'records/s':>12} {'caller µs/record':>17} {'rows':>8}")
+        print(f"{'commit per exchange':<22} {args.records / sync_elapsed:>12,.0f} "
+              f"{sync_elapsed / args.records * 1e6:>17.1f} {count_rows(sync_path):>8}")
+        print(f"{'write-behind batches':<22} {args.records / behind_elapsed:>12,.0f} "
+              f"{appended / args.records * 1e6:>17.1f} {count_rows(behind_path):>8}")
+        print(f"Batches: {stats['batches']}, dropped: {stats['dropped']}")
+
+        # A buffer smaller than a burst drops the overflow instead of blocking
+        small_path = os.path.join(directory, 'small.db')
+        appended, _, stats = bench_write_behind(small_path, records, max_buffer=1000)
+        print(f"Burst into a 1000-record buffer: {appended / args.records * 1e6:.1f} µs/record, "
+              f"written {stats['written']}, dropped {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
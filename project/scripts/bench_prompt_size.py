@@ -0,0 +1,126 @@
+"""Compare AI fallback prompt sizes before and after retrieved-context prompts.
+
+Also follows one long conversation, comparing prompts that paste the whole
+history with the token-budgeted recent turns and rolling summary.
+
+Run from the project root:
+    python -m scripts.bench_prompt_size
+"""
+
+import timeit
+
+from chatbot.conversation_manager import ConversationManager
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.prompt_builder import estimate_tokens
+
+# Queries that route to AI today
+QUERIES = [
+    "What is artificial intelligence and how does it relate to computer science education?",
+    "Compare the advantages and disadvantages of studying engineering vs medicine",
+    "How does the job market look for computer science graduates in 2024?",
+    "What are the latest trends in renewable energy engineering?",
+    "Why should I choose CSE data science over AI & ML?",
+    "Explain the difference between ECET and EAMCET admission",
+    "Which is better for placements, ECE or EEE?",
+    "What if I miss the final deadline for applications?",
+    "where can I find the hostel fee structure",
+    "is MBA better than MCA for a career in analytics",
+]
+
+# Prompt sent by _fallback_to_ai before retrieved context was added
+LEGACY_PROMPT = """You are a helpful assistant for RGM College of Engineering and Technology. 
+        A student is asking: "{user_message}"
+        
+        Please provide a helpful, accurate response about college-related topics. If the question is not about college, education, or academic matters, politely redirect them to ask about college-related topics.
+        
+        Keep your response concise, friendly, and informative. If you don't know specific details about RGM College, provide general guidance about the topic."""
+
+LEGACY_MAX_TOKENS = 500
+
+# A conversation whose later questions depend on the earlier ones
+CONVERSATION = [
+    "Tell me about admissions",
+    "What documents are required?",
+    "Which branch is better for placements, ECE or EEE?",
+    "What about the fees for ECE?",
+    "Are scholarships available?",
+    "Do you have hostel facilities?",
+    "How far is the campus from the railway station?",
+    "Compare the hostel with renting a room near the campus",
+    "Which of the two branches has more research projects?",
+    "Can I switch between them after the first year?",
+    "What would the total cost be for four years with the hostel?",
+    "So which one would you suggest for me?",
+]
+
+
+def main():
+    nlp = NLPProcessor()
+    generator = ResponseGenerator(nlp)
+
+    rows = []
+    for query in QUERIES:
+        before = estimate_tokens(LEGACY_PROMPT.format(user_message=query))
+        prompt = generator.build_ai_prompt(query)
+        after = estimate_tokens(prompt)
+        facts = prompt.count("\n- ")
+        rows.append((query, before, after, facts))
+
+    print(f"{'query':<60} {'before':>7} {'after':>6} {'facts':>6}")
+    for query, before, after, facts in rows:
+        print(f"{query[:58]:<60} {before:>7} {after:>6} {facts:>6}")
+
+    mean_before = sum(r[1] for r in rows) / len(rows)
+    mean_after = sum(r[2] for r in rows) / len(rows)
+    print()
+    print(f"Mean prompt tokens: {mean_before:.0f} -> {mean_after:.0f} (budget {generator.prompt_token_budget})")
+    print(f"Completion cap:     {LEGACY_MAX_TOKENS} -> {generator.max_completion_tokens} tokens")
+    print(f"Worst-case tokens per call: {max(r[1] for r in rows) + LEGACY_MAX_TOKENS} -> "
+          f"{max(r[2] for r in rows) + generator.max_completion_tokens}")
+
+    print_conversation(generator)
+
+
+def conversation_prompts(generator):
+    """Prompt tokens at each turn: full history pasted vs budgeted memory."""
+    manager = ConversationManager()
+    session_id = 'bench'
+    rows = []
+    for question in CONVERSATION:
+        history = manager.get_recent_context(session_id, limit=20)
+        pasted = generator.build_ai_prompt(question) + "".join(
+            f"\nStudent: {turn['user_message']}\nAssistant: {turn['bot_response']}" for turn in history
+        )
+        summary_before = manager.sessions[session_id]['memory']['summary'] if session_id in manager.sessions else ''
+        context = manager.get_prompt_context(session_id, generator.history_token_budget,
+                                             summary_token_budget=generator.summary_token_budget)
+        prompt = generator.build_ai_prompt(question, conversation=context)
+        rows.append((question, len(history), estimate_tokens(pasted), estimate_tokens(prompt),
+                     len(context['turns']), context['summary'] != summary_before))
+
+        # Template answers are about as long as an AI answer capped at 120 words
+        answer = generator.generate_local_response({'intent': 'admission_info'})['response']
+        manager.update_context(session_id, question, answer, intent='admission_info', source='local')
+
+    seconds = min(timeit.repeat(
+        lambda: manager.get_prompt_context(session_id, generator.history_token_budget,
+                                           summary_token_budget=generator.summary_token_budget),
+        number=2000, repeat=3
+    )) / 2000
+    return rows, seconds
+
+
+def print_conversation(generator):
+    rows, seconds = conversation_prompts(generator)
+    print()
+    print(f"Conversation of {len(CONVERSATION)} turns (history budget {generator.history_token_budget}, "
+          f"summary budget {generator.summary_token_budget} tokens)")
+    print(f"{'turn':>4} {'history':>8} {'pasted':>7} {'budgeted':>9} {'recent':>7} {'summary':>8}")
+    for number, (_, history, pasted, budgeted, recent, summarized) in enumerate(rows, 1):
+        print(f"{number:>4} {history:>8} {pasted:>7} {budgeted:>9} {recent:>7} {'updated' if summarized else '':>8}")
+    print(f"Prompt context from the cached summary: {seconds * 1e6:.1f} µs per request")
+
+
+if __name__ == "__main__":
+    main()
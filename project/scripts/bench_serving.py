@@ -0,0 +1,105 @@
+"""Measure local-answer throughput as preloaded worker processes are added.
+
+The app is imported once and frozen, then worker processes are forked the
+same way gunicorn does with preload_app. Each worker posts labelled queries
+that are answered locally to /api/chat through the Flask test client.
+
+Run from the project root:
+    python -m scripts.bench_serving [--max-workers N] [--seconds S]
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import time
+
+LABELLED_QUERIES = os.path.join(os.path.dirname(__file__), 'data', 'labelled_queries.jsonl')
+
+
+def local_queries(app_module):
+    """Queries from the labelled set that are answered without AI."""
+    queries = []
+    with open(LABELLED_QUERIES, encoding='utf-8') as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            query = json.loads(line)['query']
+            processed_input, intent_result = app_module.analysis_cache.analyze(query)
+            if app_module.response_generator.try_local_response(intent_result, processed_input):
+                queries.append(query)
+    return queries
+
+
+def private_memory_kb():
+    """Memory this process does not share with others (Linux only)."""
+    try:
+        with open('/proc/self/smaps_rollup') as handle:
+            return sum(
+                int(line.split()[1]) for line in handle
+                if line.startswith(('Private_Clean:', 'Private_Dirty:'))
+            )
+    except OSError:
+        return None
+
+
+def worker(app_module, queries, seconds, start_at, results):
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['session_id'] = f'bench-{os.getpid()}'
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    count = 0
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        client.post('/api/chat', json={'message': queries[count % len(queries)]})
+        count += 1
+    results.put((count, private_memory_kb()))
+
+
+def run(app_module, queries, workers, seconds):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    start_at = time.time() + 0.5
+    processes = [
+        context.Process(target=worker, args=(app_module, queries, seconds, start_at, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    total = sum(count for count, _ in outcomes)
+    memory = [kb for _, kb in outcomes if kb is not None]
+    return total / seconds, (sum(memory) / len(memory) if memory else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    import app as app_module
+    queries = local_queries(app_module)
+
+    # Same as gunicorn.conf.py's when_ready hook
+    gc.collect()
+    gc.freeze()
+
+    print(f"Cores: {os.cpu_count()}, local queries: {len(queries)}, {args.seconds:.0f}s per run")
+    print(f"{'workers':>7} {'req/s':>10} {'speedup':>8} {'private MB/worker':>18}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        throughput, private_kb = run(app_module, queries, workers, args.seconds)
+        baseline = baseline or throughput
+        memory = f"{private_kb / 1024:.1f}" if private_kb is not None else "n/a"
+        print(f"{workers:>7} {throughput:>10,.0f} {throughput / baseline:>7.2f}x {memory:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark spelling correction accuracy and per-token cost.
+
+Compares the symmetric-delete index with a brute-force scan that computes the
+edit distance against every vocabulary word.
+
+Run from the project root:
+    python -m scripts.bench_spell_corrector
+"""
+
+import time
+
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.spell_corrector import edit_distance
+
+# (typed token, intended word)
+MISSPELLINGS = [
+    ("admision", "admission"), ("admisssion", "admission"), ("addmission", "admission"),
+    ("hostle", "hostel"), ("hostal", "hostel"), ("hostell", "hostel"),
+    ("scholorship", "scholarship"), ("scholarshp", "scholarship"), ("schlarship", "scholarship"),
+    ("placment", "placement"), ("plcement", "placement"), ("placemnt", "placement"),
+    ("libary", "library"), ("liberary", "library"), ("facilty", "facility"),
+    ("cuttof", "cutoff"), ("cutof", "cutoff"), ("entrence", "entrance"),
+    ("deadlin", "deadline"), ("dedline", "deadline"), ("cirriculum", "curriculum"),
+    ("recuirtment", "recruitment"), ("recrutment", "recruitment"), ("internhip", "internship"),
+    ("documnts", "documents"), ("certficate", "certificate"), ("transcrpit", "transcript"),
+    ("eligiblity", "eligibility"), ("applicaton", "application"), ("tution", "tuition"),
+    ("campas", "campus"), ("facluty", "faculty"), ("profesor", "professor"),
+    ("salry", "salary"), ("syllabis", "syllabus"), ("contcat", "contact"),
+]
+
+# Words outside the vocabulary that must be left alone, including real words one
+# edit away from a keyword (food/good, hotel/hostel, paid/aid, late/date)
+UNRELATED = [
+    "weather", "cricket", "movies", "joke", "today", "match", "pizza", "music",
+    "food", "best", "rest", "late", "gate", "paid", "hotel", "where", "mtech", "prize",
+    "hall", "ball", "coaching", "camps",
+]
+
+
+def brute_force_lookup(vocabulary, max_distance_for, token):
+    """Reference implementation: edit distance against every vocabulary word."""
+    if token in vocabulary:
+        return token
+    max_distance = max_distance_for(token)
+    if not max_distance:
+        return None
+    best, best_key = None, None
+    for word, count in vocabulary.items():
+        distance = edit_distance(token, word, max_distance)
+        if distance <= max_distance:
+            key = (distance, -count, word)
+            if best_key is None or key < best_key:
+                best, best_key = word, key
+    return best
+
+
+def time_per_token(func, tokens, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for token in tokens:
+            func(token)
+    return (time.perf_counter() - start) / (repeat * len(tokens)) * 1e6
+
+
+def main():
+    nlp = NLPProcessor()
+    corrector = nlp.spell_corrector
+    vocabulary = corrector.words
+
+    correct = sum(1 for typo, word in MISSPELLINGS if corrector.correct(typo) == word)
+    untouched = sum(1 for word in UNRELATED if corrector.correct(word) == word)
+    misses = [(typo, corrector.correct(typo)) for typo, word in MISSPELLINGS if corrector.correct(typo) != word]
+
+    print(f"Vocabulary: {len(vocabulary)} words, delete index: {len(corrector.deletes)} entries")
+    print(f"Corrected:  {correct}/{len(MISSPELLINGS)} ({correct / len(MISSPELLINGS) * 100:.1f}%)")
+    print(f"Untouched:  {untouched}/{len(UNRELATED)} unrelated words")
+    for typo, got in misses:
+        print(f"  miss: {typo} -> {got}")
+
+    tokens = [typo for typo, _ in MISSPELLINGS] + UNRELATED
+
+    def symspell_uncached(token):
+        corrector._cache.clear()
+        return corrector.lookup(token)
+
+    symspell = time_per_token(symspell_uncached, tokens)
+    corrector._cache.clear()
+    cached = time_per_token(corrector.lookup, tokens)
+    brute = time_per_token(lambda t: brute_force_lookup(vocabulary, corrector.max_distance_for, t), tokens)
+
+    print()
+    print(f"{'method':<22} {'us/token':>10}")
+    print(f"{'brute force':<22} {brute:>10.1f}")
+    print(f"{'symmetric delete':<22} {symspell:>10.1f}")
+    print(f"{'symmetric delete+cache':<22} {cached:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
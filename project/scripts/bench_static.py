@@ -0,0 +1,156 @@
+"""Measure bytes and worker time per page load for the frontend build.
+
+Compares the previous plain Flask static folder with StaticAssets serving
+precompressed variants, for a first visit and a repeat visit (the browser
+revalidates whatever it may not reuse from its cache).
+
+Run from the project root after ``npm run build``:
+    python -m scripts.bench_static [--dist dist] [--loads N]
+
+Without a build, a sample one is assembled from src/ and index.html.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from flask import Flask, request, send_from_directory
+
+from chatbot.static_assets import StaticAssets, precompress_directory
+
+ACCEPT_ENCODING = 'gzip, deflate, br'
+
+
+def make_sample_build(root):
+    """A stand-in for dist/: the app sources as the JS bundle, the dev page's CSS as the stylesheet."""
+    os.makedirs(os.path.join(root, 'assets'))
+    script = []
+    for directory, _, filenames in os.walk('src'):
+        for filename in sorted(filenames):
+            if filename.endswith(('.ts', '.tsx')):
+                with open(os.path.join(directory, filename), encoding='utf-8') as handle:
+                    script.append(handle.read())
+    with open('index.html', encoding='utf-8') as handle:
+        page = handle.read()
+    styles = '\n'.join(re.findall(r'<style[^>]*>(.*?)</style>', page, re.S))
+
+    with open(os.path.join(root, 'assets', 'index-Bq3xK9aZ.js'), 'w', encoding='utf-8') as handle:
+        handle.write('\n'.join(script))
+    with open(os.path.join(root, 'assets', 'index-C7dPw2Lm.css'), 'w', encoding='utf-8') as handle:
+        handle.write(styles)
+    with open(os.path.join(root, 'index.html'), 'w', encoding='utf-8') as handle:
+        handle.write(
+            '<!doctype html><html lang="en"><head><meta charset="UTF-8">'
+            '<link rel="icon" type="image/png" href="/rgm-logo.png">'
+            '<title>RGM College of Engineering and Technology - Inquiry Chatbot</title>'
+            '<script type="module" crossorigin src="/assets/index-Bq3xK9aZ.js"></script>'
+            '<link rel="stylesheet" crossorigin href="/assets/index-C7dPw2Lm.css">'
+            '</head><body><div id="root"></div></body></html>'
+        )
+    shutil.copy('rgm-logo.png', root)
+
+
+def page_paths(root):
+    """The requests a browser makes for one page load."""
+    with open(os.path.join(root, 'index.html'), encoding='utf-8') as handle:
+        page = handle.read()
+    return ['/'] + [path for path in re.findall(r'(?:src|href)="(/[^"]+)"', page)]
+
+
+def plain_app(root):
+    app = Flask(__name__, static_folder=root, static_url_path='')
+
+    @app.route('/')
+    def index():
+        return send_from_directory(root, 'index.html')
+    return app
+
+
+def precompressed_app(root):
+    app = Flask(__name__, static_folder=None)
+    assets = StaticAssets(root)
+
+    @app.route('/')
+    def index():
+        return assets.serve('index.html', request)
+
+    @app.route('/<path:filename>')
+    def static_file(filename):
+        return assets.serve(filename, request)
+    return app
+
+
+def is_fresh(response):
+    """Whether a browser may reuse the response without asking the server."""
+    cache_control = response.cache_control
+    return not cache_control.no_cache and (cache_control.max_age or 0) > 0
+
+
+def load_page(client, paths, cache):
+    """Request every path the browser cannot take from ``cache``; returns (requests, body bytes)."""
+    requests = 0
+    transferred = 0
+    for path in paths:
+        cached = cache.get(path)
+        if cached is not None and is_fresh(cached):
+            continue
+        headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        if cached is not None and cached.headers.get('ETag'):
+            headers['If-None-Match'] = cached.headers['ETag']
+        response = client.get(path, headers=headers)
+        requests += 1
+        transferred += len(response.get_data())
+        if response.status_code == 200:
+            cache[path] = response
+        response.close()
+    return requests, transferred
+
+
+def bench(app, paths, loads):
+    client = app.test_client()
+    results = {}
+    for visit in ('first', 'repeat'):
+        elapsed = 0.0
+        for _ in range(loads):
+            cache = {}
+            if visit == 'repeat':
+                load_page(client, paths, cache)
+            start = time.perf_counter()
+            requests, transferred = load_page(client, paths, cache)
+            elapsed += time.perf_counter() - start
+        results[visit] = (requests, transferred, elapsed / loads)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dist', default='dist')
+    parser.add_argument('--loads', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        plain_root = os.path.join(directory, 'plain')
+        compressed_root = os.path.join(directory, 'compressed')
+        if os.path.isdir(args.dist):
+            shutil.copytree(args.dist, plain_root)
+            source = args.dist
+        else:
+            make_sample_build(plain_root)
+            source = 'sample build from src/'
+        shutil.copytree(plain_root, compressed_root)
+        precompress_directory(compressed_root)
+
+        paths = page_paths(plain_root)
+        print(f"Build: {source}; page load requests: {', '.join(paths)}")
+        print(f"{'serving':<16} {'visit':<7} {'requests':>9} {'bytes':>10} {'worker ms':>10}")
+        for name, app in (('static folder', plain_app(plain_root)),
+                          ('precompressed', precompressed_app(compressed_root))):
+            for visit, (requests, transferred, seconds) in bench(app, paths, args.loads).items():
+                print(f"{name:<16} {visit:<7} {requests:>9} {transferred:>10,} {seconds * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Measure stemmer throughput with and without the per-token cache.
+
+Run from the project root:
+    python -m scripts.bench_stemmer
+"""
+
+import time
+
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.stemmer import PorterStemmer
+from chatbot.training_data import TRAINING_DATA
+
+# Plural forms the old hand-written lemma map did not cover
+PLURALS = ["colleges", "departments", "certificates", "deadlines", "documents", "exams", "events"]
+
+
+def corpus_tokens(nlp, repeat):
+    tokens = []
+    for data in TRAINING_DATA.values():
+        for example in data['examples']:
+            tokens.extend(nlp.tokenize(example))
+    return tokens * repeat
+
+
+def throughput(func, tokens):
+    start = time.perf_counter()
+    for token in tokens:
+        func(token)
+    elapsed = time.perf_counter() - start
+    return len(tokens) / elapsed
+
+
+def main():
+    nlp = NLPProcessor()
+    tokens = corpus_tokens(nlp, repeat=200)
+    stemmer = PorterStemmer()
+
+    uncached = throughput(stemmer.stem_uncached, tokens)
+    cached = throughput(stemmer.stem, tokens)
+
+    print(f"Tokens: {len(tokens)} ({len(set(tokens))} distinct)")
+    print(f"{'mode':<10} {'tokens/s':>12}")
+    print(f"{'uncached':<10} {uncached:>12,.0f}")
+    print(f"{'cached':<10} {cached:>12,.0f}")
+    print(f"Speedup: {cached / uncached:.1f}x")
+
+    print()
+    for word in PLURALS:
+        singular = word[:-1]
+        print(f"  {word:<14} -> {stemmer.stem(word):<10} {singular:<12} -> {stemmer.stem(singular)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure chat messages per second over HTTP POSTs and over the WebSocket channel.
+
+A threaded development server runs the app on a local port. One client sends
+locally answered queries one after another, the way a browser tab does:
+as POST /api/chat on a keep-alive connection (session cookie decoded and CORS
+headers added on every request), then as frames on one /api/ws connection.
+
+Run from the project root (needs flask-sock):
+    python -m scripts.bench_websocket [--messages N]
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from scripts.bench_serving import local_queries
+
+ORIGIN = 'http://localhost:5173'
+
+
+def session_cookie(app_module):
+    """A signed session cookie, as the browser gets it from the index page."""
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['session_id'] = 'bench-websocket'
+    name = app_module.app.config['SESSION_COOKIE_NAME']
+    return f"{name}={client.get_cookie(name).value}"
+
+
+def bench_http(port, cookie, queries, messages):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    headers = {'Content-Type': 'application/json', 'Cookie': cookie, 'Origin': ORIGIN,
+               'Accept-Encoding': 'gzip, deflate, br'}
+    start = time.perf_counter()
+    for index in range(messages):
+        body = json.dumps({'message': queries[index % len(queries)], 'include_suggestions': True})
+        connection.request('POST', '/api/chat', body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"POST /api/chat returned {response.status}")
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return messages / elapsed
+
+
+def bench_websocket(port, cookie, queries, messages):
+    from simple_websocket import Client
+
+    ws = Client.connect(f'ws://127.0.0.1:{port}/api/ws', headers={'Cookie': cookie, 'Origin': ORIGIN})
+    start = time.perf_counter()
+    for index in range(messages):
+        ws.send(json.dumps({'id': index, 'message': queries[index % len(queries)], 'include_suggestions': True}))
+        while True:
+            frame = json.loads(ws.receive())
+            if frame['type'] == 'message':
+                break
+            if frame['type'] == 'error':
+                raise RuntimeError(f"WebSocket error frame: {frame}")
+    elapsed = time.perf_counter() - start
+    ws.close()
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    args = parser.parse_args()
+
+    # Keep the benchmark's messages out of the history database
+    os.environ.setdefault('HISTORY_DB_PATH', '')
+    import app as app_module
+    if not app_module.WEBSOCKETS_AVAILABLE:
+        parser.exit(1, "flask-sock is not installed (pip install flask-sock)\n")
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    app_module.chat_event_logger.setLevel(logging.WARNING)
+
+    queries = local_queries(app_module)
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cookie = session_cookie(app_module)
+
+    try:
+        print(f"Local queries: {len(queries)}, {args.messages} messages per run, one client")
+        print(f"{'channel':<16} {'msg/s':>8} {'ms/msg':>8}")
+        results = {}
+        for name, bench in (('HTTP POST', bench_http), ('WebSocket', bench_websocket)):
+            bench(server.port, cookie, queries, min(200, args.messages))  # warm up
+            results[name] = bench(server.port, cookie, queries, args.messages)
+            print(f"{name:<16} {results[name]:>8,.0f} {1000 / results[name]:>8.2f}")
+        print(f"WebSocket speedup: {results['WebSocket'] / results['HTTP POST']:.2f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
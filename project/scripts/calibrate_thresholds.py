@@ -0,0 +1,64 @@
+"""Fit per-intent routing thresholds from a labelled query set.
+
+Run from the project root:
+    python -m scripts.calibrate_thresholds --queries scripts/data/labelled_queries.jsonl
+"""
+
+import argparse
+
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.training_data import TRAINING_DATA
+from chatbot.calibration import (
+    collect_predictions, coverage_report, fit_intent_thresholds,
+    held_out_predictions, load_labelled_queries, save_thresholds
+)
+
+
+def print_report(rows):
+    print(f"{'threshold':>11} {'local':>7} {'ai_calls':>9} {'local %':>8} {'precision':>10}")
+    for row in rows:
+        print(f"{row['threshold']:>11} {row['local']:>7} {row['ai_calls']:>9} "
+              f"{row['local_fraction'] * 100:>7.1f}% {row['local_precision'] * 100:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', action='append', default=[],
+                        help="JSONL file with 'query' and 'intent' fields (repeatable)")
+    parser.add_argument('--no-training-examples', action='store_true',
+                        help="Do not add TRAINING_DATA examples to the labelled set")
+    parser.add_argument('--folds', type=int, default=5,
+                        help="TRAINING_DATA examples are predicted by a classifier trained on the other folds")
+    parser.add_argument('--target-precision', type=float, default=0.9)
+    parser.add_argument('--min-support', type=int, default=3)
+    parser.add_argument('--output', default='intent_thresholds.json')
+    args = parser.parse_args()
+
+    labelled = []
+    for path in args.queries:
+        labelled.extend(load_labelled_queries(path))
+
+    nlp = NLPProcessor()
+    clf = IntentClassifier()
+    clf.train(TRAINING_DATA)
+
+    # Thresholds are fitted on predictions for queries the classifier was not trained on
+    predictions = collect_predictions(labelled, nlp, clf)
+    if not args.no_training_examples:
+        predictions.extend(held_out_predictions(TRAINING_DATA, nlp, IntentClassifier, args.folds))
+    thresholds = fit_intent_thresholds(predictions, args.target_precision, args.min_support)
+
+    print(f"Labelled queries: {len(predictions)}  Target precision: {args.target_precision:.2f}")
+    print()
+    print_report(coverage_report(predictions, thresholds))
+    print()
+    for intent, threshold in sorted(thresholds.items()):
+        print(f"  {intent:<22} {threshold:.2f}")
+
+    save_thresholds(args.output, thresholds, args.target_precision)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Cluster queries that fell back to AI and propose TRAINING_DATA additions.
+
+Reads fallback queries (intent "unknown" or answered by AI) from chat event
+logs, the conversation history database or a plain query list, keeps the
+ones the current pipeline still sends to AI, clusters them and proposes
+keywords and examples per cluster. The projection retrains the pipeline with
+the proposals for existing intents and reports how much of that traffic
+would then be answered locally, and whether labelled-query precision holds.
+Proposals are mined from part of the queries; the coverage projection is
+measured on the held-out rest, which the proposals have not seen.
+
+Run from the project root:
+    python -m scripts.mine_unknown_queries --log logs/chat_events.log.gz --history instance/chat_history.db
+    python -m scripts.mine_unknown_queries --queries fallback_queries.txt --output proposals.json
+"""
+
+import argparse
+import json
+import os
+import zlib
+
+from chatbot.calibration import collect_predictions, evaluate, examples_from_training_data, load_labelled_queries
+from chatbot.history_store import iter_exchanges
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.log_analytics import iter_events, open_log
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.query_mining import ai_routed_volume, apply_proposals, cluster_queries, propose_training_updates
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import RESPONSES, TRAINING_DATA
+
+LABELLED_QUERIES = os.path.join(os.path.dirname(__file__), 'data', 'labelled_queries.jsonl')
+
+
+def is_fallback(record):
+    return record.get('intent') in ('unknown', 'ai_fallback') or record.get('source') == 'ai'
+
+
+def load_fallback_queries(args):
+    counts = {}
+
+    def add(text):
+        text = (text or '').strip()
+        if text:
+            counts[text] = counts.get(text, 0) + 1
+
+    for event in iter_events(args.log):
+        if is_fallback(event):
+            add(event.get('message'))
+    for path in args.history:
+        for exchange in iter_exchanges(path):
+            if is_fallback(exchange):
+                add(exchange['user_message'])
+    for path in args.queries:
+        with open_log(path) as handle:
+            for line in handle:
+                add(json.loads(line)['query'] if line.lstrip().startswith('{') else line)
+    return counts
+
+
+def build_pipeline(training_data, thresholds_path):
+    nlp = NLPProcessor(training_data)
+    classifier = IntentClassifier()
+    classifier.train(training_data)
+    generator = ResponseGenerator(nlp)
+    if thresholds_path and os.path.exists(thresholds_path):
+        generator.load_intent_thresholds(thresholds_path)
+    return nlp, classifier, generator
+
+
+def labelled_precision(labelled, nlp, classifier, generator):
+    predictions = collect_predictions(labelled, nlp, classifier)
+    return evaluate(predictions, generator.intent_thresholds, generator.confidence_threshold)
+
+
+def split_held_out(query_counts, fraction):
+    """Split queries into (mined, held_out) by a hash of the text, so reruns agree."""
+    mined, held_out = {}, {}
+    for text, count in query_counts.items():
+        target = held_out if zlib.crc32(text.lower().encode('utf-8')) % 1000 < fraction * 1000 else mined
+        target[text] = count
+    return mined, held_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', action='append', default=[], help="chat event log (plain, .gz, .bz2, .xz)")
+    parser.add_argument('--history', action='append', default=[], help="conversation history database")
+    parser.add_argument('--queries', action='append', default=[], help="one query per line, or JSONL with 'query'")
+    parser.add_argument('--clusters', type=int, default=None, help="number of clusters (default: 1.5 * sqrt(n), at most 50)")
+    parser.add_argument('--top', type=int, default=10, help="clusters to show and adopt in the projection")
+    parser.add_argument('--holdout', type=float, default=0.3,
+                        help="share of distinct queries kept out of mining to measure the projection (default: 0.3)")
+    parser.add_argument('--thresholds', default='intent_thresholds.json')
+    parser.add_argument('--output', help="write the proposals as JSON")
+    args = parser.parse_args()
+
+    query_counts = load_fallback_queries(args)
+    if not query_counts:
+        parser.error("no fallback queries found; pass --log, --history or --queries")
+
+    nlp, classifier, generator = build_pipeline(TRAINING_DATA, args.thresholds)
+
+    # Only traffic the current pipeline still sends to AI is worth mining
+    still_ai = {}
+    for text, count in query_counts.items():
+        processed_input = nlp.process(text)
+        if generator.try_local_response(classifier.classify(processed_input), processed_input) is None:
+            still_ai[text] = count
+    total_volume = sum(query_counts.values())
+    ai_volume = sum(still_ai.values())
+    print(f"Fallback queries: {total_volume:,} ({len(query_counts):,} distinct), "
+          f"still routed to AI: {ai_volume:,}")
+    if not still_ai:
+        return
+
+    mined, held_out = split_held_out(still_ai, args.holdout)
+    if not mined:
+        parser.error("no queries left to mine; lower --holdout")
+    mined_volume, held_out_volume = sum(mined.values()), sum(held_out.values())
+    print(f"Mining {mined_volume:,} ({len(mined):,} distinct), "
+          f"holding out {held_out_volume:,} ({len(held_out):,} distinct) for the projection")
+
+    clusters = cluster_queries(mined, nlp, clusters=args.clusters)
+    proposals = propose_training_updates(clusters, TRAINING_DATA, RESPONSES, nlp)[:args.top]
+
+    print(f"\nTop {len(proposals)} of {len(clusters)} clusters by volume:")
+    for rank, proposal in enumerate(proposals, 1):
+        target = proposal['intent'] or f"new intent? ({proposal['new_intent']})"
+        print(f"\n{rank:>2}. {proposal['volume']:,} queries ({proposal['volume'] / mined_volume:.1%}), "
+              f"cohesion {proposal['cohesion']:.2f} -> {target}")
+        for text, count in proposal['queries'][:3]:
+            print(f"      {count:>5,}  {text}")
+        if proposal['keywords']:
+            print(f"    keywords: {', '.join(proposal['keywords'])}")
+        if proposal['intent'] and proposal['examples']:
+            print(f"    examples: {'; '.join(proposal['examples'])}")
+
+    adopted = [p for p in proposals if p['intent'] and p['keywords']]
+    updated = apply_proposals(TRAINING_DATA, adopted)
+    new_nlp, new_classifier, new_generator = build_pipeline(updated, args.thresholds)
+    moved = held_out_volume - ai_routed_volume(held_out, new_nlp, new_classifier, new_generator)
+    moved_mined = mined_volume - ai_routed_volume(mined, new_nlp, new_classifier, new_generator)
+
+    # The same labelled set before and after, so the proposals' own examples do not count
+    labelled = examples_from_training_data(TRAINING_DATA) + load_labelled_queries(LABELLED_QUERIES)
+    before = labelled_precision(labelled, nlp, classifier, generator)
+    after = labelled_precision(labelled, new_nlp, new_classifier, new_generator)
+
+    print(f"\nProjection with the {len(adopted)} proposals for existing intents adopted:")
+    if held_out_volume:
+        print(f"  Held-out AI-routed traffic moved to local answers: {moved:,} of {held_out_volume:,} "
+              f"({moved / held_out_volume:.1%})")
+    else:
+        print("  No held-out queries to measure the projection on; raise --holdout")
+    print(f"  (on the mined queries themselves: {moved_mined / mined_volume:.1%}, an optimistic figure)")
+    print(f"  Labelled queries served locally: {before['local_fraction']:.1%} -> {after['local_fraction']:.1%}, "
+          f"precision {before['local_precision']:.1%} -> {after['local_precision']:.1%}")
+    print("  Proposals for new intents need response templates and are not included.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fallback_volume': total_volume,
+                'ai_volume': ai_volume,
+                'held_out_volume': held_out_volume,
+                'projected_moved': moved,
+                'proposals': proposals
+            }, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Write gzip (and brotli, if installed) variants of the built frontend.
+
+app.py serves these variants to clients that accept them, so the workers
+never compress at request time. Run it after ``npm run build`` with
+``npm run precompress`` (the project's .venv interpreter), or by hand from
+the project root:
+    python -m scripts.precompress_assets [dist]
+"""
+
+import argparse
+
+from chatbot.static_assets import BROTLI_AVAILABLE, precompress_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root', nargs='?', default='dist')
+    parser.add_argument('--min-size', type=int, default=1024,
+                        help="skip files smaller than this many bytes")
+    args = parser.parse_args()
+
+    totals = precompress_directory(args.root, min_size=args.min_size)
+    print(f"Compressed {totals['files']} files ({totals['original_bytes']:,} bytes)")
+    for encoding in ('gzip', 'br'):
+        key = f'{encoding}_bytes'
+        if key in totals and totals['original_bytes']:
+            print(f"  {encoding:<5} {totals[key]:>10,} bytes ({totals[key] / totals['original_bytes']:.1%})")
+    if not BROTLI_AVAILABLE:
+        print("  brotli not installed; only gzip variants written (pip install brotli)")
+
+
+if __name__ == '__main__':
+    main()
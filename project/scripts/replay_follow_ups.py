@@ -0,0 +1,79 @@
+"""Replay conversations and count the messages that would go to an AI service.
+
+Each conversation is replayed through the app pipeline (analysis, intent
+classification and local answers) twice: classifying every message on its
+own, and resolving short follow-ups ("yes", "what about hostel?") against the
+session's previous intent first.
+
+Run from the project root:
+    python -m scripts.replay_follow_ups [--conversations FILE] [--verbose]
+"""
+
+import argparse
+import json
+import os
+
+from chatbot.analysis_cache import AnalysisCache
+from chatbot.conversation_manager import ConversationManager
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+CONVERSATIONS = os.path.join(os.path.dirname(__file__), 'data', 'follow_up_conversations.jsonl')
+
+
+def load_conversations(path):
+    with open(path, encoding='utf-8') as handle:
+        return [json.loads(line)['turns'] for line in handle if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--conversations', default=CONVERSATIONS)
+    parser.add_argument('--thresholds', default='intent_thresholds.json',
+                        help="Calibrated routing thresholds, as loaded by the app")
+    parser.add_argument('--verbose', action='store_true', help="Show how each message is routed")
+    args = parser.parse_args()
+
+    nlp = NLPProcessor()
+    classifier = IntentClassifier()
+    classifier.train(TRAINING_DATA)
+    generator = ResponseGenerator(nlp)
+    if os.path.exists(args.thresholds):
+        generator.load_intent_thresholds(args.thresholds)
+    analysis_cache = AnalysisCache(nlp, classifier)
+    manager = ConversationManager()
+
+    conversations = load_conversations(args.conversations)
+    messages = ai_before = ai_after = 0
+    for number, turns in enumerate(conversations):
+        session_id = f'replay-{number}'
+        for turn in turns:
+            processed_input, intent_result = analysis_cache.analyze(turn)
+            before = generator.try_local_response(intent_result, processed_input)
+            resolved = classifier.resolve_follow_up(intent_result, processed_input, manager.get_last_intent(session_id))
+            after = generator.try_local_response(resolved, processed_input)
+
+            messages += 1
+            ai_before += before is None
+            ai_after += after is None
+            manager.update_context(session_id, turn, after['response'] if after else '',
+                                   intent=resolved['intent'], source=after['source'] if after else 'ai')
+            if args.verbose:
+                routes = f"{'AI' if before is None else 'local':>5} -> {'AI' if after is None else 'local':<5}"
+                follow_up = f" (after {resolved['follow_up']})" if 'follow_up' in resolved else ''
+                print(f"{routes} {turn!r}: {resolved['intent']}{follow_up}")
+        if args.verbose:
+            print()
+
+    print(f"Conversations: {len(conversations)}, messages: {messages}")
+    print(f"{'':<28} {'AI calls':>9} {'AI share':>9}")
+    print(f"{'each message on its own':<28} {ai_before:>9} {ai_before / messages * 100:>8.1f}%")
+    print(f"{'with follow-up resolution':<28} {ai_after:>9} {ai_after / messages * 100:>8.1f}%")
+    if ai_before:
+        print(f"AI calls removed: {ai_before - ai_after} ({(ai_before - ai_after) / ai_before * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Simulate AI fallback latency with the fixed and the adaptive provider order.
+
+Stub providers (and Gemini models) answer after a random latency or fail
+with a timeout, on a simulated clock, through the real _fallback_to_ai
+(retries, deadline, model fallback). Conditions change between phases, the
+way a provider has a slow or failing stretch.
+
+Run from the project root:
+    python -m scripts.simulate_provider_order [--messages N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import random
+
+import chatbot.response_generator as response_generator_module
+from chatbot.response_generator import ResponseGenerator
+
+# Per phase: (mean latency in seconds, failure rate) for each provider or Gemini model
+PHASES = [
+    ("normal", {
+        "Gemini/gemini-1.5-flash": (1.0, 0.02), "Gemini/gemini-1.5-pro": (2.5, 0.02), "Gemini/gemini-pro": (2.0, 0.05),
+        "ChatGPT": (1.6, 0.02), "Perplexity": (2.2, 0.03),
+    }),
+    ("flash degraded", {
+        "Gemini/gemini-1.5-flash": (4.0, 0.30), "Gemini/gemini-1.5-pro": (2.5, 0.02), "Gemini/gemini-pro": (2.0, 0.05),
+        "ChatGPT": (1.6, 0.02), "Perplexity": (2.2, 0.03),
+    }),
+    ("Gemini outage", {
+        "Gemini/gemini-1.5-flash": (8.0, 0.90), "Gemini/gemini-1.5-pro": (8.0, 0.90), "Gemini/gemini-pro": (8.0, 0.90),
+        "ChatGPT": (1.8, 0.05), "Perplexity": (1.4, 0.03),
+    }),
+    ("recovered", {
+        "Gemini/gemini-1.5-flash": (0.9, 0.02), "Gemini/gemini-1.5-pro": (2.5, 0.02), "Gemini/gemini-pro": (2.0, 0.05),
+        "ChatGPT": (2.4, 0.05), "Perplexity": (2.2, 0.03),
+    }),
+]
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_generator(clock, rng, conditions, adaptive):
+    generator = ResponseGenerator()
+    generator.clock = clock
+    generator.sleep = clock.sleep
+    # Retry backoff jitter comes from the seeded generator too, so runs are reproducible
+    generator.jitter = rng.random
+    generator.adaptive_provider_order = adaptive
+
+    def call(key, deadline):
+        mean, failure_rate = conditions[key]
+        latency = rng.expovariate(1.0 / mean) * 0.5 + mean * 0.5
+        if rng.random() < failure_rate:
+            # A failure costs the wait for the timeout
+            clock.now += deadline.timeout(generator.ai_attempt_timeout)
+            raise TimeoutError(f"{key} timed out")
+        clock.now += min(latency, deadline.timeout(generator.ai_attempt_timeout))
+        return f"answer from {key}"
+
+    generator._call_gemini_model = lambda model_name, prompt, deadline, on_token=None: call(f"Gemini/{model_name}", deadline)
+    generator._try_chatgpt = lambda prompt, deadline, on_token=None: call("ChatGPT", deadline)
+    generator._try_perplexity = lambda prompt, deadline, on_token=None: call("Perplexity", deadline)
+    return generator
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def simulate(messages, seed, adaptive):
+    clock = SimulatedClock()
+    rng = random.Random(seed)
+    conditions = {}
+    generator = make_generator(clock, rng, conditions, adaptive)
+
+    latencies = {name: [] for name, _ in PHASES}
+    failures = 0
+    per_phase = messages // len(PHASES)
+    for name, phase in PHASES:
+        conditions.clear()
+        conditions.update(phase)
+        for _ in range(per_phase):
+            # Messages needing AI arrive a few seconds apart
+            clock.now += rng.expovariate(1 / 5.0)
+            started = clock.now
+            response = generator._fallback_to_ai("Compare CSE and ECE", prompt="Compare CSE and ECE")
+            latencies[name].append(clock.now - started)
+            failures += not response.startswith("answer from")
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=4000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    # The stubs stand in for the provider SDKs; their per-call logging is muted
+    response_generator_module.AI_SERVICES_AVAILABLE = True
+    logging.getLogger('ai_services').setLevel(logging.CRITICAL)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {
+            'fixed': simulate(args.messages, args.seed, adaptive=False),
+            'adaptive': simulate(args.messages, args.seed, adaptive=True),
+        }
+
+    print(f"{args.messages} AI fallbacks in {len(PHASES)} phases (seconds per message)")
+    print(f"{'phase':<16} {'fixed mean':>11} {'fixed p95':>10} {'adaptive mean':>14} {'adaptive p95':>13}")
+    for name, _ in PHASES:
+        fixed, adaptive = results['fixed'][0][name], results['adaptive'][0][name]
+        print(f"{name:<16} {sum(fixed) / len(fixed):>11.2f} {percentile(fixed, 95):>10.2f} "
+              f"{sum(adaptive) / len(adaptive):>14.2f} {percentile(adaptive, 95):>13.2f}")
+    for order, (latencies, failures) in results.items():
+        values = [value for phase in latencies.values() for value in phase]
+        print(f"{order:<9} overall: mean {sum(values) / len(values):.2f}s  p95 {percentile(values, 95):.2f}s  "
+              f"unanswered {failures}")
+
+
+if __name__ == '__main__':
+    main()
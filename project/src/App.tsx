@@ -1,51 +1,23 @@
 import React, { useState, useRef, useEffect } from 'react';
 import logoUrl from '../rgm-logo.png';
+import { useChat } from './hooks/useChat';
 import { Send, MessageCircle, RefreshCw, User, Bot, Sparkles, GraduationCap, Phone, Mail, MapPin, Clock, Sun, Moon, BookOpen } from 'lucide-react';
 
-interface Message {
-  id: string;
-  text: string;
-  isUser: boolean;
-  timestamp: Date;
-  suggestions?: string[];
-  intent?: string;
-  confidence?: number;
-}
-
-interface ChatResponse {
-  response: string;
-  intent: string;
-  confidence: number;
-  suggestions: string[];
-  timestamp: string;
-}
-
 function App() {
-  const [messages, setMessages] = useState<Message[]>([
-    {
-      id: '1',
-      text: "Hello! Welcome to RGM College of Engineering and Technology's inquiry system. I'm here to help you with information about admissions, courses, fees, facilities, campus life, and more. How can I assist you today?",
-      isUser: false,
-      timestamp: new Date(),
-      suggestions: [
-        "Tell me about admissions",
-        "What courses do you offer?",
-        "What are the fees?",
-        "Show me campus facilities"
-      ]
-    }
-  ]);
+  const {
+    messages,
+    isTyping,
+    isConnected,
+    sessionSuggestions,
+    sendMessage,
+    resetConversation,
+    handleSuggestionClick,
+  } = useChat();
   const [inputValue, setInputValue] = useState('');
-  const [isTyping, setIsTyping] = useState(false);
-  const [isConnected, setIsConnected] = useState(true);
   const [isDark, setIsDark] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
 
-  const handleSuggestionClick = (suggestion: string) => {
-    sendMessage(suggestion);
-  };
-
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
@@ -77,94 +49,16 @@ function App() {
     }
   };
 
-  const sendMessage = async (text: string) => {
-    if (!text.trim()) return;
-
-    const userMessage: Message = {
-      id: Date.now().toString(),
-      text: text.trim(),
-      isUser: true,
-      timestamp: new Date()
-    };
-
-    setMessages(prev => [...prev, userMessage]);
-    setInputValue('');
-    setIsTyping(true);
-
-    try {
-      const response = await fetch('/api/chat', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ message: text.trim() }),
-      });
-
-      if (!response.ok) {
-        throw new Error('Network response was not ok');
-      }
-
-      const data: ChatResponse = await response.json();
-
-      const botMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        text: data.response,
-        isUser: false,
-        timestamp: new Date(),
-        suggestions: data.suggestions,
-        intent: data.intent,
-        confidence: data.confidence
-      };
-
-      setMessages(prev => [...prev, botMessage]);
-      setIsConnected(true);
-    } catch (error) {
-      console.error('Error sending message:', error);
-      const errorMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        text: "I'm sorry, I'm having trouble connecting right now. Please try again in a moment.",
-        isUser: false,
-        timestamp: new Date(),
-        suggestions: ["Try again", "Contact support"]
-      };
-      setMessages(prev => [...prev, errorMessage]);
-      setIsConnected(false);
-    } finally {
-      setIsTyping(false);
-    }
-  };
-
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     sendMessage(inputValue);
+    setInputValue('');
   };
 
   const handleQuickInfoClick = (info: string) => {
     sendMessage(info);
   };
 
-  const resetConversation = async () => {
-    try {
-      await fetch('/api/reset', { method: 'POST' });
-      setMessages([
-        {
-          id: '1',
-          text: "Hello! Welcome to RGM College of Engineering and Technology's inquiry system. I'm here to help you with information about admissions, courses, fees, facilities, campus life, and more. How can I assist you today?",
-          isUser: false,
-          timestamp: new Date(),
-          suggestions: [
-            "Tell me about admissions",
-            "What courses do you offer?",
-            "What are the fees?",
-            "Show me campus facilities"
-          ]
-        }
-      ]);
-    } catch (error) {
-      console.error('Error resetting conversation:', error);
-    }
-  };
-
   return (
     <div className="flex flex-col h-screen transition-colors duration-500">
       <header className="flex items-center justify-between p-4 shadow-md bg-white/80 dark:bg-gray-800/80 backdrop-blur-sm">
@@ -273,6 +167,22 @@ function App() {
 
         {/* Input Area */}
         <div className="p-4 border-t border-gray-200 dark:border-gray-800 bg-gray-50/50 dark:bg-gray-900/50">
+          {/* Topics suggested from this conversation, kept up to date by the server */}
+          {sessionSuggestions.length > 0 && (
+            <div className="flex flex-wrap gap-2 mb-3">
+              {sessionSuggestions.map((suggestion) => (
+                <button
+                  key={suggestion}
+                  type="button"
+                  onClick={() => handleSuggestionClick(suggestion)}
+                  disabled={isTyping}
+                  className="px-3 py-1 text-xs rounded-full border border-orange-200 dark:border-gray-700 bg-orange-50 dark:bg-gray-800 text-brand dark:text-gray-200 hover:bg-orange-100 dark:hover:bg-gray-700 disabled:opacity-50 transition-colors duration-200"
+                >
+                  {suggestion}
+                </button>
+              ))}
+            </div>
+          )}
           <form onSubmit={handleSubmit} className="flex space-x-4">
             <div className="flex-1 relative">
               <input
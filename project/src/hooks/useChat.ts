@@ -27,6 +27,7 @@ export const useChat = () => {
       ],
     },
   ]);
+  const [sessionSuggestions, setSessionSuggestions] = useState<string[]>([]);
   const [isTyping, setIsTyping] = useState(false);
   const [isConnected, setIsConnected] = useState(true);
 
@@ -43,11 +44,32 @@ export const useChat = () => {
     setMessages((prev) => [...prev, userMessage]);
     setIsTyping(true);
 
+    // Streamed AI answers are shown in this message as they arrive
+    const botMessageId = (Date.now() + 1).toString();
+    let streamed = '';
+    const showStreamedText = (token: string | null) => {
+      streamed = token === null ? '' : streamed + token;
+      setIsTyping(streamed === '');
+      setMessages((prev) => {
+        const rest = prev.filter((message) => message.id !== botMessageId);
+        if (streamed === '') return rest;
+        return [...rest, { id: botMessageId, text: streamed, isUser: false, timestamp: new Date() }];
+      });
+    };
+
     try {
-      const data = await ChatAPI.sendMessage(text.trim());
+      let data = await ChatAPI.sendMessage(text.trim(), showStreamedText);
+      if (data.job_id) {
+        // Slow AI answers are produced in the background
+        data = await ChatAPI.waitForJob(data.job_id);
+      }
+      if (data.session_suggestions) {
+        // Only sent when the list changed since the last response
+        setSessionSuggestions(data.session_suggestions);
+      }
 
       const botMessage: Message = {
-        id: (Date.now() + 1).toString(),
+        id: botMessageId,
         text: data.response,
         isUser: false,
         timestamp: new Date(),
@@ -56,7 +78,7 @@ export const useChat = () => {
         confidence: data.confidence,
       };
 
-      setMessages((prev) => [...prev, botMessage]);
+      setMessages((prev) => [...prev.filter((message) => message.id !== botMessageId), botMessage]);
       setIsConnected(true);
     } catch (error) {
       console.error('Error sending message:', error);
@@ -68,7 +90,7 @@ export const useChat = () => {
         timestamp: new Date(),
         suggestions: ['Try again', 'Contact support'],
       };
-      setMessages((prev) => [...prev, errorMessage]);
+      setMessages((prev) => [...prev.filter((message) => message.id !== botMessageId), errorMessage]);
       setIsConnected(false);
     } finally {
       setIsTyping(false);
@@ -78,6 +100,7 @@ export const useChat = () => {
   const resetConversation = useCallback(async () => {
     try {
       await ChatAPI.resetConversation();
+      setSessionSuggestions([]);
       setMessages([
         {
           id: '1',
@@ -109,6 +132,7 @@ export const useChat = () => {
     messages,
     isTyping,
     isConnected,
+    sessionSuggestions,
     sendMessage,
     resetConversation,
     handleSuggestionClick,
@@ -15,6 +15,17 @@ export interface ChatResponse {
   suggestions: string[];
   timestamp: string;
   error?: boolean;
+  // Sent when the request asks for include_suggestions
+  suggestions_etag?: string;
+  session_suggestions?: string[];
+}
+
+export interface PendingChatResponse {
+  job_id: string;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  intent: string;
+  confidence: number;
+  timestamp: string;
 }
 
 export interface ConversationContext {
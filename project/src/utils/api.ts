@@ -1,23 +1,205 @@
 const API_BASE_URL = '';
 
+// Close the tab's WebSocket after this long without messages, freeing its server thread
+const SOCKET_IDLE_MS = 60000;
+// Stay on HTTP this long after the server said it has no WebSocket slot free
+const SOCKET_BUSY_RETRY_MS = 60000;
+
+class SocketBusyError extends Error {}
+
+// Receives streamed answer text; null means discard what arrived so far
+export type TokenHandler = (text: string | null) => void;
+
+interface PendingMessage {
+  resolve: (data: any) => void;
+  reject: (error: Error) => void;
+  onToken?: TokenHandler;
+}
+
 export class ChatAPI {
-  static async sendMessage(message: string): Promise<any> {
+  // ETag of the session suggestions last received, so unchanged lists are not resent
+  private static suggestionsEtag: string | undefined;
+
+  // Background AI answers are only requested once the server has said it supports them
+  private static asyncJobs = false;
+
+  // One WebSocket per tab, opened only once the server has said AI answers can be
+  // streamed; HTTP is used until then and when it cannot be opened
+  private static streaming = false;
+  private static socket: Promise<WebSocket> | null = null;
+  private static socketDisabled = typeof WebSocket === 'undefined';
+  private static socketRetryAt = 0;
+  private static idleTimer: ReturnType<typeof setTimeout> | undefined;
+  private static pending = new Map<number, PendingMessage>();
+  private static nextMessageId = 1;
+
+  static async sendMessage(message: string, onToken?: TokenHandler): Promise<any> {
+    if (ChatAPI.streaming && !ChatAPI.socketDisabled && Date.now() >= ChatAPI.socketRetryAt) {
+      let socket: WebSocket | null = null;
+      try {
+        socket = await ChatAPI.openSocket();
+      } catch {
+        // No WebSocket endpoint (or it is blocked): stay on HTTP for this tab
+        ChatAPI.socketDisabled = true;
+      }
+      if (socket) {
+        try {
+          return await ChatAPI.sendOverSocket(socket, message, onToken);
+        } catch (error) {
+          // The server refused the socket before reading the message; send it over HTTP
+          if (!(error instanceof SocketBusyError)) throw error;
+        }
+      }
+    }
+    return ChatAPI.postMessage(message);
+  }
+
+  private static openSocket(): Promise<WebSocket> {
+    if (ChatAPI.socket) return ChatAPI.socket;
+
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const opening = new Promise<WebSocket>((resolve, reject) => {
+      const socket = new WebSocket(`${protocol}//${window.location.host}${API_BASE_URL}/api/ws`);
+      socket.onopen = () => resolve(socket);
+      socket.onmessage = (event) => ChatAPI.handleFrame(JSON.parse(event.data));
+      socket.onclose = () => {
+        // Reconnect on the next message; answers still in flight are lost
+        ChatAPI.socket = null;
+        reject(new Error('WebSocket closed'));
+        ChatAPI.pending.forEach((pending) => pending.reject(new Error('WebSocket closed')));
+        ChatAPI.pending.clear();
+      };
+    });
+    ChatAPI.socket = opening;
+    return opening;
+  }
+
+  private static sendOverSocket(socket: WebSocket, message: string, onToken?: TokenHandler): Promise<any> {
+    const id = ChatAPI.nextMessageId++;
+    clearTimeout(ChatAPI.idleTimer);
+    return new Promise((resolve, reject) => {
+      ChatAPI.pending.set(id, { resolve, reject, onToken });
+      socket.send(
+        JSON.stringify({
+          id,
+          message,
+          include_suggestions: true,
+          suggestions_etag: ChatAPI.suggestionsEtag,
+        })
+      );
+    });
+  }
+
+  private static handleFrame(frame: any): void {
+    if (frame.type === 'busy') {
+      // The server closes the socket next; its messages go over HTTP instead
+      ChatAPI.socketRetryAt = Date.now() + SOCKET_BUSY_RETRY_MS;
+      ChatAPI.pending.forEach((pending) => pending.reject(new SocketBusyError('WebSocket busy')));
+      ChatAPI.pending.clear();
+      return;
+    }
+
+    const pending = ChatAPI.pending.get(frame.id);
+    if (!pending) return;
+
+    if (frame.type === 'token') {
+      pending.onToken?.(frame.text);
+    } else if (frame.type === 'restart') {
+      pending.onToken?.(null);
+    } else {
+      ChatAPI.pending.delete(frame.id);
+      if (ChatAPI.pending.size === 0) {
+        ChatAPI.idleTimer = setTimeout(() => ChatAPI.socket?.then((socket) => socket.close()), SOCKET_IDLE_MS);
+      }
+      if (frame.type === 'error') {
+        pending.reject(new Error(typeof frame.error === 'string' ? frame.error : 'Chat request failed'));
+        return;
+      }
+      if (frame.suggestions_etag) {
+        ChatAPI.suggestionsEtag = frame.suggestions_etag;
+      }
+      pending.resolve(frame);
+    }
+  }
+
+  private static async postMessage(message: string): Promise<any> {
     const response = await fetch(`${API_BASE_URL}/api/chat`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify({ message }),
+      body: JSON.stringify({
+        message,
+        ...(ChatAPI.asyncJobs ? { async: true } : {}),
+        include_suggestions: true,
+        suggestions_etag: ChatAPI.suggestionsEtag,
+      }),
     });
 
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
 
+    const data = await response.json();
+    ChatAPI.asyncJobs = data.async_jobs === true;
+    ChatAPI.streaming = data.streaming === true;
+    if (data.suggestions_etag) {
+      ChatAPI.suggestionsEtag = data.suggestions_etag;
+    }
+    return data;
+  }
+
+  static async getJob(jobId: string): Promise<any> {
+    const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}`);
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
     return response.json();
   }
 
+  static async pollJob(jobId: string, timeoutMs = 60000, intervalMs = 1000): Promise<any> {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      const job = await ChatAPI.getJob(jobId);
+      if (job.status === 'done') return job.result;
+      if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+    throw new Error('Timed out waiting for response');
+  }
+
+  static waitForJob(jobId: string, timeoutMs = 60000): Promise<any> {
+    if (typeof EventSource === 'undefined') {
+      return ChatAPI.pollJob(jobId, timeoutMs);
+    }
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/events`);
+      const fallBackToPolling = () => {
+        source.close();
+        ChatAPI.pollJob(jobId, timeoutMs).then(resolve, reject);
+      };
+
+      source.onmessage = (event) => {
+        const job = JSON.parse(event.data);
+        if (job.status === 'done') {
+          source.close();
+          resolve(job.result);
+        } else if (job.status === 'failed') {
+          source.close();
+          reject(new Error(job.error || 'Job failed'));
+        } else {
+          fallBackToPolling();
+        }
+      };
+      source.onerror = fallBackToPolling;
+    });
+  }
+
   static async resetConversation(): Promise<void> {
+    ChatAPI.suggestionsEtag = undefined;
     const response = await fetch(`${API_BASE_URL}/api/reset`, {
       method: 'POST',
     });
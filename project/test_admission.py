@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for AI admission control: per-client rate limits and the concurrency cap.
+"""
+
+from chatbot.admission import (
+    OVER_CAPACITY, RATE_LIMITED, AdmissionController, ConcurrencyLimiter, TokenBucketLimiter
+)
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_controller(clock, burst=3, max_concurrent=2):
+    return AdmissionController(TokenBucketLimiter(rate=1.0, burst=burst, clock=clock), ConcurrencyLimiter(max_concurrent))
+
+def admitted(controller, key, exempt=False):
+    with controller.admit(key, exempt=exempt) as rejection:
+        return rejection is None
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=0.5, burst=3, clock=clock)
+    assert [limiter.allow('a') for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow('b')  # buckets are per key
+    clock.now += 2.0  # one token back
+    assert limiter.allow('a')
+    assert not limiter.allow('a')
+
+def test_token_bucket_tracks_bounded_keys():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=2, clock=FakeClock())
+    for key in ['a', 'b', 'c']:
+        limiter.allow(key)
+    assert list(limiter._buckets) == ['b', 'c']
+
+def test_concurrency_limiter_caps_in_flight_calls():
+    limiter = ConcurrencyLimiter(2)
+    first, second = limiter.acquire(), limiter.acquire()
+    assert first and second
+    assert limiter.acquire() is None
+    assert limiter.in_flight == 2
+    limiter.release(first)
+    assert limiter.acquire() is not None
+
+def test_requests_without_a_key_are_rate_limited():
+    """Leaving out the key does not lift the limit; such requests share one bucket."""
+    controller = make_controller(FakeClock())
+    assert [admitted(controller, None) for _ in range(4)] == [True, True, True, False]
+    assert controller.stats()[RATE_LIMITED] == 1
+    assert admitted(controller, 'session-1')
+
+def test_exempt_requests_skip_the_rate_limit_but_not_the_cap():
+    controller = make_controller(FakeClock(), burst=1, max_concurrent=1)
+    assert all(admitted(controller, None, exempt=True) for _ in range(5))
+    with controller.admit('session-1') as rejection:
+        assert rejection is None
+        assert not admitted(controller, None, exempt=True)
+    assert controller.stats()[OVER_CAPACITY] == 1
+
+def test_generate_response_limits_by_client_key():
+    """AI fallbacks are keyed by client_key, falling back to the session id."""
+    nlp_processor = NLPProcessor()
+    intent_classifier = IntentClassifier()
+    intent_classifier.train(TRAINING_DATA)
+    generator = ResponseGenerator(nlp_processor)
+    generator.admission_controller = make_controller(FakeClock(), burst=1)
+    generator._fallback_to_ai = lambda *args, **kwargs: "AI answer"
+
+    processed_input = nlp_processor.process("Compare CSE and ECE for research")
+    intent_result = intent_classifier.classify(processed_input)
+
+    def source(session_id, client_key=None):
+        return generator.generate_response(intent_result, processed_input, session_id, client_key=client_key)['source']
+
+    assert source(None, client_key='10.0.0.1') == 'ai'
+    assert source(None, client_key='10.0.0.1') == 'local'
+    assert source(None, client_key='10.0.0.2') == 'ai'
+    assert source('session-1') == 'ai'
+    assert source('session-1') == 'local'
+
+if __name__ == "__main__":
+    print("🚦 Admission Control Tests")
+    print("=" * 50)
+    test_token_bucket_allows_burst_then_refills()
+    test_token_bucket_tracks_bounded_keys()
+    test_concurrency_limiter_caps_in_flight_calls()
+    test_requests_without_a_key_are_rate_limited()
+    test_exempt_requests_skip_the_rate_limit_but_not_the_cap()
+    test_generate_response_limits_by_client_key()
+    print("✅ All admission control tests passed")
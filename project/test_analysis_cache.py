@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the cache of NLP processing and intent classification results.
+"""
+
+from chatbot.analysis_cache import AnalysisCache
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.training_data import TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+
+def test_repeated_message_is_a_hit():
+    cache = AnalysisCache(nlp_processor, intent_classifier)
+    first = cache.analyze("what are the hostel fees")
+    second = cache.analyze("what are the hostel fees")
+    assert second is first
+    processed_input, intent_result = first
+    assert intent_result['intent'] == intent_classifier.classify(nlp_processor.process("what are the hostel fees"))['intent']
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+
+def test_entries_cannot_be_changed():
+    """Callers share entries, so one request must not be able to alter what the next one sees."""
+    cache = AnalysisCache(nlp_processor, intent_classifier)
+    processed_input, intent_result = cache.analyze("when is the application deadline")
+    for attempt in (
+        lambda: intent_result.__setitem__('intent', 'greeting'),
+        lambda: processed_input['tokens'].append('extra'),
+    ):
+        try:
+            attempt()
+            assert False, "expected the entry to be read-only"
+        except (TypeError, AttributeError):
+            pass
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AnalysisCache(nlp_processor, intent_classifier, maxsize=2)
+    cache.analyze("hostel fees")
+    cache.analyze("library timings")
+    cache.analyze("hostel fees")
+    cache.analyze("placement record")
+    assert cache.stats()['size'] == 2
+    cache.reset_stats()
+    cache.analyze("hostel fees")
+    cache.analyze("library timings")
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_warmed_entries_are_never_evicted():
+    cache = AnalysisCache(nlp_processor, intent_classifier, maxsize=1)
+    assert cache.warm(["Tell me about admissions", "What courses are offered?"]) == 2
+    for message in ["hostel fees", "library timings", "placement record"]:
+        cache.analyze(message)
+    cache.reset_stats()
+    cache.analyze("Tell me about admissions")
+    cache.analyze("What courses are offered?")
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 0
+    assert stats['pinned'] == 2 and stats['size'] == 1
+
+def test_clear_drops_everything():
+    cache = AnalysisCache(nlp_processor, intent_classifier)
+    cache.warm(["Tell me about admissions"])
+    cache.analyze("hostel fees")
+    cache.clear()
+    assert cache.stats() == {'size': 0, 'pinned': 0, 'maxsize': 1024, 'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+
+if __name__ == "__main__":
+    print("🗃️ Analysis Cache Tests")
+    print("=" * 50)
+    test_repeated_message_is_a_hit()
+    test_entries_cannot_be_changed()
+    test_least_recently_used_entry_is_evicted()
+    test_warmed_entries_are_never_evicted()
+    test_clear_drops_everything()
+    print("✅ All analysis cache tests passed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch JSONL mode of the chatbot.py command-line script.
+"""
+
+import importlib.util
+import io
+import json
+import os
+import threading
+import time
+
+# chatbot.py shares its name with the chatbot package, so it is loaded by path
+spec = importlib.util.spec_from_file_location(
+    'chatbot_cli', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chatbot.py')
+)
+chatbot_cli = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(chatbot_cli)
+
+QUERIES = [
+    "what are the fees?",
+    "",
+    '{"query": "Compare CSE and ECE for research", "intent": "unknown"}',
+    "is hostel available for girls",
+    "Which branch is better for a career in robotics and why?",
+]
+
+def run(queries, **kwargs):
+    output = io.StringIO()
+    counts = chatbot_cli.run_batch(iter(queries), output, **kwargs)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_results_follow_input_order():
+    """Blank lines are skipped, JSON lines use their query, and line numbers match the input."""
+    _, results = run(QUERIES, use_ai=False)
+    assert [result['line'] for result in results] == [1, 3, 4, 5]
+    assert results[1]['query'] == "Compare CSE and ECE for research"
+    for result in results:
+        assert result['response']
+        assert result['latency_ms'] >= 0
+
+def test_ai_queries_run_in_the_worker_pool():
+    """AI-routed queries overlap in the pool and are still written in order."""
+    pipeline = chatbot_cli.build_pipeline()
+    response_generator = pipeline[1]
+    lock = threading.Lock()
+    in_flight = {'now': 0, 'peak': 0}
+
+    def slow_ai(user_message, processed_input=None, deadline=None, on_token=None, prompt=None):
+        with lock:
+            in_flight['now'] += 1
+            in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        time.sleep(0.1)
+        with lock:
+            in_flight['now'] -= 1
+        return f"AI answer to {user_message}"
+    response_generator._fallback_to_ai = slow_ai
+
+    queries = ["Compare CSE and ECE for research"] * 4 + ["what are the fees?"]
+    counts, results = run(queries, workers=4, pipeline=pipeline)
+    assert in_flight['peak'] > 1, in_flight
+    assert counts == {'ai': 4, 'local': 1}
+    assert [result['line'] for result in results] == [1, 2, 3, 4, 5]
+    assert results[0]['response'] == "AI answer to Compare CSE and ECE for research"
+
+def test_failing_query_does_not_stop_the_batch():
+    pipeline = chatbot_cli.build_pipeline()
+    response_generator = pipeline[1]
+
+    def flaky_ai(user_message, processed_input=None, deadline=None, on_token=None, prompt=None):
+        if "robotics" in user_message:
+            raise RuntimeError("provider exploded")
+        return f"AI answer to {user_message}"
+    response_generator._fallback_to_ai = flaky_ai
+
+    counts, results = run(QUERIES, workers=2, pipeline=pipeline)
+    assert [result['line'] for result in results] == [1, 3, 4, 5]
+    assert counts == {'ai': 1, 'local': 2, 'error': 1}
+    assert results[-1]['source'] == 'error'
+    assert results[-1]['error'] == "RuntimeError: provider exploded"
+    assert results[1]['source'] == 'ai'
+
+def test_no_ai_marks_queries_that_need_it():
+    counts, results = run(["Compare CSE and ECE for research"], use_ai=False)
+    assert counts == {'needs_ai': 1}
+    assert results[0]['source'] == 'needs_ai'
+
+if __name__ == "__main__":
+    print("📄 Batch CLI Tests")
+    print("=" * 50)
+    test_results_follow_input_order()
+    test_ai_queries_run_in_the_worker_pool()
+    test_failing_query_does_not_stop_the_batch()
+    test_no_ai_marks_queries_that_need_it()
+    print("✅ All batch CLI tests passed")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for fitting the per-intent thresholds that route queries to local answers.
+"""
+
+import json
+import os
+
+from chatbot.calibration import (
+    MAX_THRESHOLD, collect_predictions, fit_intent_thresholds, held_out_predictions, load_labelled_queries
+)
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_PATH = os.path.join(PROJECT_ROOT, 'intent_thresholds.json')
+LABELLED_QUERIES = os.path.join(PROJECT_ROOT, 'scripts', 'data', 'labelled_queries.jsonl')
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+
+def prediction(intent, label, confidence):
+    return {'query': f"{label} question", 'label': label, 'intent': intent, 'confidence': confidence}
+
+def test_thresholds_are_capped_below_one():
+    """An intent that misses the target still answers messages whose keywords all point at it."""
+    predictions = [prediction('greeting', 'greeting', 1.0), prediction('greeting', 'greeting', 1.0)]
+    predictions += [prediction('greeting', 'admission_info', 1.0), prediction('greeting', 'greeting', 0.4)]
+    thresholds = fit_intent_thresholds(predictions, target_precision=0.9)
+    assert thresholds['greeting'] == MAX_THRESHOLD < 1.0
+
+    predictions = [prediction('fee_info', 'fee_info', 0.5)] * 3 + [prediction('fee_info', 'course_info', 0.4)]
+    assert fit_intent_thresholds(predictions, target_precision=0.9)['fee_info'] == 0.5
+
+def test_every_example_is_predicted_once_while_held_out():
+    predictions = held_out_predictions(TRAINING_DATA, nlp_processor, IntentClassifier, folds=5)
+    examples = sorted(example for data in TRAINING_DATA.values() for example in data.get('examples', []))
+    assert sorted(p['query'] for p in predictions) == examples
+
+def test_committed_thresholds_match_the_classifier():
+    """intent_thresholds.json must be regenerated when the classifier or its training data changes."""
+    predictions = collect_predictions(load_labelled_queries(LABELLED_QUERIES), nlp_processor, intent_classifier)
+    predictions += held_out_predictions(TRAINING_DATA, nlp_processor, IntentClassifier)
+    with open(THRESHOLDS_PATH, 'r', encoding='utf-8') as f:
+        committed = json.load(f)
+    assert fit_intent_thresholds(predictions, committed['target_precision']) == committed['intents']
+
+def test_greetings_are_answered_locally():
+    generator = ResponseGenerator(nlp_processor)
+    assert generator.load_intent_thresholds(THRESHOLDS_PATH)
+    for message in ["hi", "hello", "good morning"]:
+        processed_input = nlp_processor.process(message)
+        response = generator.try_local_response(intent_classifier.classify(processed_input), processed_input)
+        assert response is not None and response['intent'] == 'greeting', message
+
+def test_topic_wins_a_tie_with_small_talk():
+    intent_result = intent_classifier.classify(nlp_processor.process("when do admissions start"))
+    assert intent_result['intent'] == 'admission_info'
+
+if __name__ == "__main__":
+    print("🎚️ Threshold Calibration Tests")
+    print("=" * 50)
+    test_thresholds_are_capped_below_one()
+    test_every_example_is_predicted_once_while_held_out()
+    test_committed_thresholds_match_the_classifier()
+    test_greetings_are_answered_locally()
+    test_topic_wins_a_tie_with_small_talk()
+    print("✅ All calibration tests passed")
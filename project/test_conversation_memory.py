@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-budgeted conversation context sent with AI prompts.
+"""
+
+import threading
+from datetime import timedelta
+
+from chatbot.conversation_manager import ConversationManager
+from chatbot.prompt_builder import estimate_tokens
+from chatbot.response_generator import ResponseGenerator
+
+LONG_ANSWER = "The college offers B.Tech programs in several branches with modern labs. " * 4
+
+def make_manager(turns):
+    manager = ConversationManager()
+    for number in range(turns):
+        manager.update_context('s1', f"Question {number} about ECE fees", LONG_ANSWER,
+                               intent='fee_info', source='local')
+    return manager
+
+def test_recent_turns_fit_the_budget():
+    """Only the newest turns that fit are sent, oldest first."""
+    context = make_manager(8).get_prompt_context('s1', token_budget=120, max_turn_tokens=30)
+    assert context['turns']
+    assert sum(estimate_tokens(turn) for turn in context['turns']) <= 120
+    assert context['turns'][-1].startswith("Student: Question 7 ")
+    assert "Question 7" not in context['summary']
+
+def test_summary_is_updated_only_when_turns_drop_out():
+    """The summary covers dropped turns once and is reused until more drop out."""
+    manager = make_manager(8)
+    first = manager.get_prompt_context('s1', token_budget=120, max_turn_tokens=30)
+    memory = manager.sessions['s1']['memory']
+    summarized = memory['summarized']
+    assert first['summary'].startswith("Earlier the student asked: Question ")
+
+    again = manager.get_prompt_context('s1', token_budget=120, max_turn_tokens=30)
+    assert again == first
+    assert memory['summarized'] == summarized
+
+    manager.update_context('s1', "Question 8 about ECE fees", LONG_ANSWER, intent='fee_info', source='local')
+    later = manager.get_prompt_context('s1', token_budget=120, max_turn_tokens=30)
+    assert memory['summarized'] == summarized + 1
+    for turn in later['turns']:
+        question = turn.splitlines()[0][len("Student: "):]
+        assert question not in later['summary']
+
+def test_new_session_has_no_context():
+    assert ConversationManager().get_prompt_context('missing') == {'summary': '', 'turns': [], 'tokens': 0}
+
+def test_prompt_carries_the_conversation():
+    """The AI prompt includes the summary and recent turns before the question."""
+    generator = ResponseGenerator()
+    context = make_manager(8).get_prompt_context('s1')
+    prompt = generator.build_ai_prompt("And what about the hostel for that branch?", conversation=context)
+    assert context['summary'] in prompt
+    assert "Recent conversation:\nStudent: " in prompt
+    assert prompt.endswith('Question: "And what about the hostel for that branch?"')
+
+def test_sessions_are_safe_to_update_from_several_threads():
+    """Background AI jobs update sessions while requests read and expire them."""
+    manager = ConversationManager()
+    # Every update expires the other sessions, so cleanup runs alongside inserts
+    manager.context_timeout = timedelta(0)
+    errors = []
+
+    def worker(number):
+        try:
+            for turn in range(300):
+                session_id = f"s{number}-{turn}"
+                manager.update_context(session_id, "What are the hostel fees?", "...", intent='fee_info', source='local')
+                manager.get_suggestions_with_etag(session_id)
+                manager.get_prompt_context(session_id)
+                manager.get_last_intent(session_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+if __name__ == "__main__":
+    print("🧠 Conversation Memory Tests")
+    print("=" * 50)
+    test_recent_turns_fit_the_budget()
+    test_summary_is_updated_only_when_turns_drop_out()
+    test_new_session_has_no_context()
+    test_prompt_carries_the_conversation()
+    test_sessions_are_safe_to_update_from_several_threads()
+    print("✅ All conversation memory tests passed")
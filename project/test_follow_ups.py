@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for resolving short follow-up replies from the session's previous intent.
+"""
+
+from chatbot.conversation_manager import ConversationManager
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+response_generator = ResponseGenerator(nlp_processor)
+
+def answer(message, last_intent):
+    processed_input = nlp_processor.process(message)
+    intent_result = intent_classifier.resolve_follow_up(
+        intent_classifier.classify(processed_input), processed_input, last_intent
+    )
+    return intent_result, response_generator.try_local_response(intent_result, processed_input)
+
+def test_yes_continues_previous_answer():
+    """'yes' after an admission answer asks about the required documents."""
+    intent_result, response = answer("Yes please!", 'admission_info')
+    print(f"yes -> {intent_result['intent']}: {response['response'][:60]}")
+    assert intent_result['intent'] == 'documents_required'
+    assert intent_result['follow_up'] == 'admission_info'
+    assert response['source'] == 'local'
+
+def test_agreement_phrases_continue_previous_answer():
+    for message in ["of course", "ok, tell me more", "go on", "sure"]:
+        intent_result, _ = answer(message, 'admission_info')
+        assert intent_result['intent'] == 'documents_required', message
+
+def test_topic_words_are_not_agreement():
+    """'course?' or 'courses' after an admission answer asks about courses, not documents."""
+    for message in ["course?", "courses"]:
+        intent_result, _ = answer(message, 'admission_info')
+        assert 'follow_up' not in intent_result, message
+        assert intent_result['intent'] == 'course_info', message
+    for message in ["me", "on", "tell me"]:
+        intent_result, _ = answer(message, 'admission_info')
+        assert 'follow_up' not in intent_result, message
+
+def test_elliptical_question_keeps_its_topic():
+    """'what about hostel?' is answered as a hostel question without AI."""
+    intent_result, response = answer("what about hostel?", 'fee_info')
+    assert intent_result['intent'] == 'hostel_info'
+    assert response['source'] == 'local'
+
+def test_named_department_takes_previous_intent():
+    """'what about ECE?' after a fee answer gets the ECE fee answer."""
+    intent_result, response = answer("what about ECE?", 'fee_info')
+    assert intent_result['intent'] == 'fee_info'
+    assert 'Electronics & Communication Engineering' in response['response']
+
+def test_messages_that_are_not_follow_ups():
+    """Without a usable previous intent, or for a full question, nothing is resolved."""
+    for message, last_intent in [
+        ("yes", None),
+        ("yes", 'greeting'),
+        ("and when?", 'fee_info'),
+        ("yes, and compare the hostel with living off campus for me", 'hostel_info'),
+    ]:
+        intent_result, _ = answer(message, last_intent)
+        assert 'follow_up' not in intent_result, message
+
+def test_last_intent_is_kept_for_template_answers_only():
+    """A 'yes' after an AI answer cannot be resolved from templates."""
+    manager = ConversationManager()
+    manager.update_context('s1', "Tell me about admissions", "...", intent='admission_info', source='local')
+    assert manager.get_last_intent('s1') == 'admission_info'
+    manager.update_context('s1', "Compare CSE and ECE", "...", intent='course_info', source='ai')
+    assert manager.get_last_intent('s1') is None
+    assert manager.get_last_intent('unknown-session') is None
+
+if __name__ == "__main__":
+    print("💬 Follow-up Resolution Tests")
+    print("=" * 50)
+    test_yes_continues_previous_answer()
+    test_agreement_phrases_continue_previous_answer()
+    test_topic_words_are_not_agreement()
+    test_elliptical_question_keeps_its_topic()
+    test_named_department_takes_previous_intent()
+    test_messages_that_are_not_follow_ups()
+    test_last_intent_is_kept_for_template_answers_only()
+    print("✅ All follow-up tests passed")
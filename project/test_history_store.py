@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the background conversation history writer.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from chatbot.history_store import HistoryWriter, iter_exchanges
+
+def make_record(number, session_id='session-1'):
+    return {
+        'session_id': session_id,
+        'timestamp': f"2024-01-01T00:00:{number:02d}",
+        'user_message': f"question {number}",
+        'bot_response': f"answer {number}",
+        'intent': 'fee_info',
+        'confidence': 0.5,
+        'source': 'local'
+    }
+
+def finishes(call, timeout=5.0):
+    """Run call in a thread; True if it returned within the timeout."""
+    thread = threading.Thread(target=call, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+def make_failed_writer(directory, max_buffer=10000):
+    # A directory cannot be opened as a database, so the writer thread fails at start
+    writer = HistoryWriter(directory, flush_interval=0.05, max_buffer=max_buffer)
+    writer.append(make_record(0))
+    writer._thread.join(5)
+    return writer
+
+def test_records_are_written_in_order():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'history.db')
+        writer = HistoryWriter(path, batch_size=3, flush_interval=0.05)
+        for number in range(7):
+            assert writer.append(make_record(number, session_id='a' if number % 2 else 'b'))
+        assert writer.flush(timeout=5)
+        stats = writer.stats()
+        assert stats['written'] == 7 and stats['dropped'] == 0 and stats['errors'] == 0
+        assert [row['user_message'] for row in iter_exchanges(path, 'a')] == ["question 1", "question 3", "question 5"]
+        writer.close()
+        assert len(list(iter_exchanges(path))) == 7
+        assert writer.flush(timeout=1) is False
+
+def test_open_failure_is_reported():
+    with tempfile.TemporaryDirectory() as directory:
+        writer = make_failed_writer(directory)
+        assert not writer._thread.is_alive()
+        assert writer.append(make_record(1)) is False
+        stats = writer.stats()
+        assert stats['errors'] == 1
+        assert stats['dropped'] == 2 and stats['written'] == 0 and stats['pending'] == 0
+        assert writer.flush(timeout=1) is False
+
+def test_flush_and_close_do_not_hang_on_a_full_buffer():
+    """With no writer thread to drain it, a full buffer must not block flush or close."""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = make_failed_writer(directory, max_buffer=2)
+        writer._buffer.put_nowait(('stuck',))
+        writer._buffer.put_nowait(('stuck',))
+        started = time.monotonic()
+        assert finishes(writer.flush)
+        assert finishes(writer.close)
+        assert time.monotonic() - started < 2
+
+def test_flush_gives_up_after_timeout():
+    with tempfile.TemporaryDirectory() as directory:
+        writer = HistoryWriter(os.path.join(directory, 'history.db'), flush_interval=0.05, max_buffer=1)
+        writer.append(make_record(0))
+        writer.flush(timeout=5)
+        gate = threading.Event()
+        original_write = writer._write
+        writer._write = lambda connection, rows: gate.wait(5) and original_write(connection, rows)
+        writer.append(make_record(1))
+        assert writer.flush(timeout=0.2) is False
+        gate.set()
+        writer.close()
+        assert writer.stats()['written'] == 2
+
+if __name__ == "__main__":
+    print("🗄️ History Writer Tests")
+    print("=" * 50)
+    test_records_are_written_in_order()
+    test_open_failure_is_reported()
+    test_flush_and_close_do_not_hang_on_a_full_buffer()
+    test_flush_gives_up_after_timeout()
+    print("✅ All history writer tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the background AI fallback queue and the job store shared by worker processes.
+"""
+
+import os
+import tempfile
+import threading
+
+from chatbot.job_queue import FallbackJobQueue, SQLiteJobStore, create_job_store
+
+def make_store(directory):
+    return SQLiteJobStore(os.path.join(directory, 'jobs.db'))
+
+def test_jobs_run_by_priority_and_report_results():
+    gate = threading.Event()
+    order = []
+    jobs = FallbackJobQueue(workers=1, max_pending=10)
+    try:
+        blocker = jobs.submit(lambda: gate.wait(5))
+        low = jobs.submit(lambda: order.append('low') or 'low', priority=1)
+        high = jobs.submit(lambda: order.append('high') or 'high', priority=0)
+        failing = jobs.submit(lambda: 1 / 0, priority=2)
+        gate.set()
+        for job in (blocker, low, high, failing):
+            jobs.wait(job.id, timeout=5)
+        assert order == ['high', 'low']
+        assert high.to_dict() == {'job_id': high.id, 'status': 'done', 'result': 'high', 'error': None}
+        assert failing.status == 'failed' and 'division' in failing.error
+        assert jobs.stats()['completed'] == 3 and jobs.stats()['failed'] == 1
+    finally:
+        jobs.shutdown(timeout=5)
+
+def test_full_queue_rejects_jobs():
+    gate = threading.Event()
+    jobs = FallbackJobQueue(workers=1, max_pending=1)
+    try:
+        running = jobs.submit(lambda: gate.wait(5))
+        while running.status == 'pending':
+            jobs.wait(running.id, timeout=0.05)
+        assert jobs.submit(lambda: None) is not None
+        assert jobs.submit(lambda: None) is None
+        assert jobs.stats()['dropped'] == 1
+        gate.set()
+    finally:
+        jobs.shutdown(timeout=5)
+
+def test_job_is_found_from_another_process():
+    """A queue sharing the store (as another worker would) sees the job's state and result."""
+    with tempfile.TemporaryDirectory() as directory:
+        gate = threading.Event()
+        accepting = FallbackJobQueue(workers=1, store=make_store(directory))
+        polling = FallbackJobQueue(workers=1, store=make_store(directory), poll_interval=0.01)
+        try:
+            job = accepting.submit(lambda: gate.wait(5) and {'response': "AI answer"}, owner='session-1')
+            seen = polling.get(job.id)
+            assert seen is not None and seen.owner == 'session-1'
+            assert seen.status in ('pending', 'running')
+            assert polling.wait(job.id, timeout=0.05).status != 'done'
+
+            gate.set()
+            finished = polling.wait(job.id, timeout=5)
+            assert finished.status == 'done'
+            assert finished.to_dict()['result'] == {'response': "AI answer"}
+            assert polling.get('unknown-job') is None
+        finally:
+            accepting.shutdown(timeout=5)
+
+def test_rejected_job_is_not_left_in_the_store():
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        gate = threading.Event()
+        jobs = FallbackJobQueue(workers=1, max_pending=1, store=store)
+        try:
+            running = jobs.submit(lambda: gate.wait(5))
+            while running.status == 'pending':
+                jobs.wait(running.id, timeout=0.05)
+            assert jobs.submit(lambda: None) is not None
+            ids_before = {row[0] for row in store._connection().execute("SELECT job_id FROM jobs")}
+            assert jobs.submit(lambda: None) is None
+            ids_after = {row[0] for row in store._connection().execute("SELECT job_id FROM jobs")}
+            assert ids_after == ids_before
+            gate.set()
+        finally:
+            jobs.shutdown(timeout=5)
+
+def test_create_job_store():
+    assert create_job_store() is None
+    assert isinstance(create_job_store(path=':memory:'), SQLiteJobStore)
+    with tempfile.TemporaryDirectory() as directory:
+        # A directory cannot be opened as a database
+        assert create_job_store(path=directory) is None
+        assert create_job_store(path=os.path.join(directory, 'missing', 'jobs.db')) is None
+
+if __name__ == "__main__":
+    print("📬 Job Queue Tests")
+    print("=" * 50)
+    test_jobs_run_by_priority_and_report_results()
+    test_full_queue_rejects_jobs()
+    test_job_is_found_from_another_process()
+    test_rejected_job_is_not_left_in_the_store()
+    test_create_job_store()
+    print("✅ All job queue tests passed")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests that background AI jobs are only handed to the session that asked for them.
+"""
+
+import os
+import tempfile
+
+# Keep the databases app.py opens at import out of the working tree
+temp_dir = tempfile.mkdtemp()
+os.environ['AI_JOBS_DB_PATH'] = os.path.join(temp_dir, 'ai_jobs.db')
+os.environ['HISTORY_DB_PATH'] = os.path.join(temp_dir, 'chat_history.db')
+
+import app as app_module
+
+QUESTION = {'message': "Compare the hostel with living off campus for a first-year student", 'async': True}
+
+def make_client(session_id=None):
+    client = app_module.app.test_client()
+    if session_id:
+        with client.session_transaction() as session:
+            session['session_id'] = session_id
+    return client
+
+def submit_job(client):
+    response = client.post('/api/chat', json=QUESTION)
+    assert response.status_code == 202, response.get_json()
+    job_id = response.get_json()['job_id']
+    app_module.fallback_jobs.wait(job_id, 10)
+    return job_id
+
+def test_job_is_returned_to_its_session_only():
+    job_id = submit_job(make_client('owner-1'))
+    assert make_client('owner-1').get(f'/api/jobs/{job_id}').status_code == 200
+    assert make_client('someone-else').get(f'/api/jobs/{job_id}').status_code == 404
+    assert make_client().get(f'/api/jobs/{job_id}').status_code == 404
+    assert make_client().get(f'/api/jobs/{job_id}/events').status_code == 404
+
+def test_job_without_owner_is_not_returned():
+    job = app_module.fallback_jobs.submit(lambda: {'response': "answer"}, owner=None)
+    app_module.fallback_jobs.wait(job.id, 10)
+    assert make_client().get(f'/api/jobs/{job.id}').status_code == 404
+
+def test_client_without_session_is_answered_inline():
+    """A job without an owner could be collected by any client without a session."""
+    response = make_client().post('/api/chat', json=QUESTION)
+    assert response.status_code == 200
+    assert 'job_id' not in response.get_json()
+    assert response.get_json()['response']
+
+if __name__ == "__main__":
+    print("🔐 Job Ownership Tests")
+    print("=" * 50)
+    test_job_is_returned_to_its_session_only()
+    test_job_without_owner_is_not_returned()
+    test_client_without_session_is_answered_inline()
+    print("✅ All job ownership tests passed")
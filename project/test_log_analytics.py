@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming chat log analytics.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from chatbot.log_analytics import ChatLogAnalyzer, HeavyHitters, LatencyHistogram, iter_events, parse_line
+
+def event_line(**fields):
+    event = {'event': 'chat', 'session': 's1', 'intent': 'fee_info', 'confidence': 0.9,
+             'source': 'local', 'latency_ms': 5.0, 'prompt_tokens': None, 'message': "fees?"}
+    event.update(fields)
+    return f"2024-01-01 10:00:00,000 - chat_events - INFO - {json.dumps(event)}\n"
+
+def test_structured_and_legacy_lines_are_parsed():
+    event = parse_line(event_line(intent='hostel_info'))
+    assert event['intent'] == 'hostel_info' and event['latency_ms'] == 5.0
+
+    legacy = parse_line("2024-01-01 10:00:00,000 - app - INFO - Session abc: Intent=fee_info, Confidence=0.85, Source=ai")
+    assert legacy == {'event': 'chat', 'session': 'abc', 'intent': 'fee_info', 'confidence': 0.85, 'source': 'ai'}
+    assert parse_line("Session abc: Intent=greeting, Confidence=1.0")['source'] == 'unknown'
+
+    assert parse_line("2024-01-01 10:00:00,000 - werkzeug - INFO - GET /api/health") is None
+    assert parse_line('{"event": "startup"}') is None
+    assert parse_line('{"event": "chat", broken') is None
+
+def test_report_summarises_traffic():
+    events = [parse_line(line) for line in [
+        event_line(latency_ms=10.0),
+        event_line(latency_ms=20.0),
+        event_line(intent='unknown', source='ai', latency_ms=2000.0, prompt_tokens=300, message="Bus to campus?"),
+        event_line(intent='unknown', source='ai', latency_ms=1500.0, prompt_tokens=100, message="bus to campus? "),
+    ]]
+    report = ChatLogAnalyzer().consume(events).report()
+    assert report['events'] == 4
+    assert report['intents'] == {'fee_info': 2, 'unknown': 2}
+    assert report['ai_fallback_rate'] == 0.5 and report['unknown_rate'] == 0.5
+    assert report['latency_ms']['count'] == 4 and report['latency_ms']['max'] == 2000.0
+    assert report['prompt_tokens'] == {'count': 2, 'mean': 200.0, 'max': 300}
+    assert report['unknown_clusters'] == [{'key': "bus to campus?", 'count': 2, 'example': "Bus to campus?"}]
+
+def test_latency_percentiles_are_within_bucket_growth():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.add(float(value))
+    assert abs(histogram.percentile(50) - 500) <= 500 * 0.05
+    assert abs(histogram.percentile(99) - 990) <= 990 * 0.05
+    assert histogram.percentile(100) == 1000.0
+
+def test_frequent_queries_survive_in_fixed_memory():
+    hitters = HeavyHitters(capacity=3)
+    for number in range(100):
+        hitters.add("bus timings", "Bus timings?")
+        hitters.add(f"rare {number}", f"rare {number}")
+    assert len(hitters.counts) <= 3
+    assert hitters.top(1)[0][0] == "bus timings"
+
+def test_compressed_logs_are_read():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'app.log.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as handle:
+            handle.write(event_line())
+            handle.write("2024-01-01 10:00:01,000 - werkzeug - INFO - GET /\n")
+            handle.write(event_line(intent='greeting'))
+        assert [event['intent'] for event in iter_events([path])] == ['fee_info', 'greeting']
+
+if __name__ == "__main__":
+    print("📈 Log Analytics Tests")
+    print("=" * 50)
+    test_structured_and_legacy_lines_are_parsed()
+    test_report_summarises_traffic()
+    test_latency_percentiles_are_within_bucket_growth()
+    test_frequent_queries_survive_in_fixed_memory()
+    test_compressed_logs_are_read()
+    print("✅ All log analytics tests passed")
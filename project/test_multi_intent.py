@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for answering compound questions from several intents' templates.
+"""
+
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+response_generator = ResponseGenerator(nlp_processor)
+
+def compose(message):
+    processed_input = nlp_processor.process(message)
+    intent_result = intent_classifier.classify(processed_input)
+    return intent_result, response_generator.generate_composed_response(intent_result, processed_input)
+
+def test_compound_questions_are_composed():
+    for message, intents in [
+        ("fees and scholarships?", ['fee_info', 'scholarship_info']),
+        ("admission process and last date to apply", ['admission_info', 'application_deadline']),
+        ("hostel fees?", ['hostel_info', 'fee_info']),
+        # 'hostel' is also a facility keyword, but distinctive for hostel questions
+        ("tell me about hostel and sports facilities", ['hostel_info', 'facility_info']),
+    ]:
+        _, response = compose(message)
+        assert response is not None, message
+        assert response['intents'] == intents, message
+
+def test_compound_question_is_answered_before_the_knowledge_base():
+    processed_input = nlp_processor.process("tell me about hostel and sports facilities")
+    response = response_generator.try_local_response(intent_classifier.classify(processed_input), processed_input)
+    assert response['intents'] == ['hostel_info', 'facility_info']
+    assert 'local_source' not in response
+
+def test_weak_keyword_does_not_add_an_intent():
+    """'need' is a scholarship keyword, but these questions are not about scholarships."""
+    for message, intent in [
+        ("what documents are needed", 'documents_required'),
+        ("Do I need to pay fees", 'fee_info'),
+    ]:
+        intent_result, response = compose(message)
+        assert intent_result['intent'] == intent, message
+        assert [item['intent'] for item in intent_result['intents']] == [intent], message
+        assert response is None, message
+
+def test_distinctive_keywords():
+    assert 'scholarship' in intent_classifier.distinctive_keywords['scholarship_info']
+    assert 'need' not in intent_classifier.distinctive_keywords['scholarship_info']
+    assert 'hostel' in intent_classifier.distinctive_keywords['hostel_info']
+    assert 'hostel' not in intent_classifier.distinctive_keywords['facility_info']
+
+if __name__ == "__main__":
+    print("🧩 Compound Question Tests")
+    print("=" * 50)
+    test_compound_questions_are_composed()
+    test_compound_question_is_answered_before_the_knowledge_base()
+    test_weak_keyword_does_not_add_an_intent()
+    test_distinctive_keywords()
+    print("✅ All compound question tests passed")
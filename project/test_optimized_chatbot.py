@@ -58,6 +58,26 @@ def test_optimized_chatbot():
             "expected_source": "local",
             "description": "Facility information query"
         },
+        {
+            "query": "Fees and scholarships?",
+            "expected_source": "local",
+            "description": "Compound fee and scholarship query"
+        },
+        {
+            "query": "Tell me about placements and faculty",
+            "expected_source": "local",
+            "description": "Compound placement and faculty query"
+        },
+        {
+            "query": "Fees for CSE",
+            "expected_source": "local",
+            "description": "Department fee query"
+        },
+        {
+            "query": "EAMCET cutoff",
+            "expected_source": "local",
+            "description": "Entrance exam query"
+        },
         {
             "query": "Tell me about the campus",
             "expected_source": "local",
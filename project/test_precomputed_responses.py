@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed suggestion chip responses and warming their AI answers.
+"""
+
+from chatbot.analysis_cache import AnalysisCache
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import AI_FAILED_RESPONSE, ResponseGenerator
+from chatbot.training_data import TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+analysis_cache = AnalysisCache(nlp_processor, intent_classifier)
+
+LOCAL_CHIP = "What are the fees?"
+AI_CHIP = "Compare CSE and ECE for research"
+
+def test_local_answers_are_precomputed():
+    generator = ResponseGenerator(nlp_processor)
+    counts = generator.precompute_responses([LOCAL_CHIP, AI_CHIP], analysis_cache.analyze)
+    assert counts == {'local': 1, 'ai': 0, 'skipped': 1}
+    assert generator.get_precomputed_response(LOCAL_CHIP) is not None
+    assert generator.get_precomputed_response(AI_CHIP) is None
+
+def test_failed_ai_answer_is_not_cached_and_is_rewarmed():
+    """The 'trouble connecting' text is not an AI answer; a later warm-up replaces it."""
+    generator = ResponseGenerator(nlp_processor)
+    generator._fallback_to_ai = lambda *args, **kwargs: AI_FAILED_RESPONSE
+    processed_input, intent_result = analysis_cache.analyze(AI_CHIP)
+    response = generator.generate_response(intent_result, processed_input, 'session-1')
+    assert response['response'] == AI_FAILED_RESPONSE
+    assert response['source'] == 'ai_unavailable'
+
+    counts = generator.precompute_responses([LOCAL_CHIP, AI_CHIP], analysis_cache.analyze, warm_ai=True)
+    assert counts['skipped'] == 1
+    assert generator.get_precomputed_response(AI_CHIP) is None
+
+    generator._fallback_to_ai = lambda *args, **kwargs: "CSE focuses on software; ECE on electronics."
+    counts = generator.precompute_responses([LOCAL_CHIP, AI_CHIP], analysis_cache.analyze, warm_ai=True)
+    assert counts == {'local': 0, 'ai': 1, 'skipped': 0}
+    _, cached = generator.get_precomputed_response(AI_CHIP)
+    assert cached['source'] == 'ai'
+    assert cached['response'].startswith("CSE focuses")
+
+if __name__ == "__main__":
+    print("📌 Precomputed Response Tests")
+    print("=" * 50)
+    test_local_answers_are_precomputed()
+    test_failed_ai_answer_is_not_cached_and_is_rewarmed()
+    print("✅ All precomputed response tests passed")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for ordering AI providers by measured latency.
+Uses a fake clock so estimates can be aged without waiting.
+"""
+
+import chatbot.response_generator as response_generator_module
+from chatbot.provider_stats import ProviderStats
+from chatbot.response_generator import ResponseGenerator
+
+class FakeClock:
+    """Clock that only moves when a call or a sleep spends time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def make_generator(clock):
+    generator = ResponseGenerator()
+    generator.clock = clock
+    generator.sleep = clock.sleep
+    return generator
+
+def test_provider_stats_order_by_expected_latency():
+    """Slow or failing keys sort after fast ones and are looked at again once not tried for a while."""
+    clock = FakeClock()
+    stats = ProviderStats(clock=clock)
+    assert stats.order(["Gemini", "ChatGPT", "Perplexity"]) == ["Gemini", "ChatGPT", "Perplexity"]
+    stats.record("Gemini", 6.0, True)
+    stats.record("ChatGPT", 1.5, True)
+    stats.record("Perplexity", 0.5, False)
+    assert stats.order(["Gemini", "ChatGPT", "Perplexity"]) == ["ChatGPT", "Gemini", "Perplexity"]
+
+    clock.now += 20 * stats.half_life
+    stats.record("ChatGPT", 1.5, True)
+    assert stats.order(["ChatGPT", "Gemini"]) == ["Gemini", "ChatGPT"]
+
+def test_idle_slow_provider_is_not_promoted():
+    """An unused estimate drifts to the key's own long-run average, not to the prior."""
+    clock = FakeClock()
+    stats = ProviderStats(clock=clock)
+    for _ in range(20):
+        stats.record("ChatGPT", 2.0, True)
+        stats.record("Gemini", 1.3, True)
+        clock.now += 5
+    for _ in range(60):
+        clock.now += 5
+        stats.record("Gemini", 1.3, True)
+        assert stats.order(["ChatGPT", "Gemini"]) == ["Gemini", "ChatGPT"]
+
+def test_failure_spike_fades_back_to_long_run_average():
+    clock = FakeClock()
+    stats = ProviderStats(clock=clock)
+    for _ in range(50):
+        stats.record("Gemini", 1.0, True)
+        stats.record("ChatGPT", 1.6, True)
+    stats.record("Gemini", 10.0, False)
+    stats.record("Gemini", 10.0, False)
+    assert stats.order(["Gemini", "ChatGPT"]) == ["ChatGPT", "Gemini"]
+    for _ in range(10):
+        clock.now += 30
+        stats.record("ChatGPT", 1.6, True)
+    assert stats.order(["Gemini", "ChatGPT"]) == ["Gemini", "ChatGPT"]
+
+def test_recovered_provider_is_tried_again():
+    """After an outage long enough to move the long-run average, a recovered key is found by exploring."""
+    clock = FakeClock()
+    stats = ProviderStats(clock=clock)
+    for _ in range(300):
+        stats.record("Gemini", 10.0, False)
+        stats.record("Perplexity", 2.2, True)
+        clock.now += 1
+    assert stats.order(["Gemini", "Perplexity"]) == ["Perplexity", "Gemini"]
+    clock.now += stats.explore_interval
+    stats.record("Perplexity", 2.2, True)
+    assert stats.order(["Gemini", "Perplexity"]) == ["Gemini", "Perplexity"]
+    # The first attempt after the gap replaces the stale average
+    stats.record("Gemini", 0.9, True)
+    assert abs(stats.expected_cost("Gemini") - 0.9) < 1e-9
+    assert stats.order(["Gemini", "Perplexity"]) == ["Gemini", "Perplexity"]
+
+def test_slow_provider_is_tried_later():
+    """After a slow answer from Gemini, the next message goes to the faster ChatGPT first."""
+    clock = FakeClock()
+    generator = make_generator(clock)
+    calls = []
+
+    def gemini(prompt, deadline, on_token=None):
+        calls.append("Gemini")
+        clock.now += 8.0
+        return "Gemini answer"
+
+    def chatgpt(prompt, deadline, on_token=None):
+        calls.append("ChatGPT")
+        clock.now += 1.0
+        return "ChatGPT answer"
+    generator._try_gemini = gemini
+    generator._try_chatgpt = chatgpt
+
+    original = response_generator_module.AI_SERVICES_AVAILABLE
+    response_generator_module.AI_SERVICES_AVAILABLE = True
+    try:
+        answers = [generator._fallback_to_ai("Compare hostel life with living off campus") for _ in range(3)]
+    finally:
+        response_generator_module.AI_SERVICES_AVAILABLE = original
+
+    # Gemini is measured first, then ChatGPT (not yet measured), then the faster one wins
+    assert calls == ["Gemini", "ChatGPT", "ChatGPT"]
+    assert answers[-1] == "ChatGPT answer"
+
+
+if __name__ == "__main__":
+    print("📊 Provider Latency Tests")
+    print("=" * 50)
+    test_provider_stats_order_by_expected_latency()
+    test_idle_slow_provider_is_not_promoted()
+    test_failure_spike_fades_back_to_long_run_average()
+    test_recovered_provider_is_tried_again()
+    test_slow_provider_is_tried_later()
+    print("✅ All provider latency tests passed")
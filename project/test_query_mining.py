@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for mining AI-routed queries into training data proposals.
+"""
+
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.query_mining import apply_proposals, cluster_queries, propose_training_updates
+from chatbot.training_data import RESPONSES, TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+
+BUS_QUERIES = {
+    "college bus route timings": 5,
+    "is there a college bus": 4,
+    "bus route to campus": 3,
+    "bus pass fees": 2,
+}
+RAGGING_QUERIES = {
+    "ragging complaint cell": 4,
+    "how to report ragging": 3,
+    "anti ragging committee": 2,
+}
+MESS_QUERIES = {
+    "hostel mess food menu": 5,
+    "mess food in hostel": 4,
+    "hostel mess timings": 3,
+}
+
+def test_similar_queries_are_clustered_by_volume():
+    clusters = cluster_queries({**RAGGING_QUERIES, **BUS_QUERIES}, nlp_processor, clusters=2)
+    assert [sorted(text for text, _ in cluster['queries']) for cluster in clusters] == [
+        sorted(BUS_QUERIES), sorted(RAGGING_QUERIES)
+    ]
+    assert [cluster['volume'] for cluster in clusters] == [14, 9]
+    assert clusters[0]['terms'][0][:2] == ('bu', 'bus')
+    assert 0 < clusters[1]['cohesion'] <= 1
+
+def test_unmatched_cluster_is_proposed_as_new_intent():
+    clusters = cluster_queries(RAGGING_QUERIES, nlp_processor, clusters=1)
+    proposal, = propose_training_updates(clusters, TRAINING_DATA, RESPONSES, nlp_processor)
+    assert proposal['intent'] is None
+    assert proposal['new_intent'] == 'ragging'
+    assert proposal['keywords'] == ['ragging']
+    assert proposal['volume'] == 9
+
+def test_cluster_matching_an_intent_extends_it():
+    clusters = cluster_queries(MESS_QUERIES, nlp_processor, clusters=1)
+    proposals = propose_training_updates(clusters, TRAINING_DATA, RESPONSES, nlp_processor)
+    assert proposals[0]['intent'] == 'hostel_info'
+    assert proposals[0]['keywords'] == ['food']
+
+    updated = apply_proposals(TRAINING_DATA, proposals)
+    assert 'food' in updated['hostel_info']['keywords']
+    assert 'food' not in TRAINING_DATA['hostel_info']['keywords']
+    assert updated['hostel_info']['examples'][-3:] == proposals[0]['examples']
+    assert len(TRAINING_DATA['hostel_info']['examples']) + 3 == len(updated['hostel_info']['examples'])
+
+if __name__ == "__main__":
+    print("⛏️ Query Mining Tests")
+    print("=" * 50)
+    test_similar_queries_are_clustered_by_volume()
+    test_unmatched_cluster_is_proposed_as_new_intent()
+    test_cluster_matching_an_intent_extends_it()
+    print("✅ All query mining tests passed")
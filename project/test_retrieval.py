@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for answering factual questions from the local BM25 index.
+"""
+
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.retrieval import BM25Index, build_passages, content_tokens
+from chatbot.training_data import NOT_PUBLISHED, TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+generator = ResponseGenerator(nlp_processor)
+
+def answer(message):
+    processed_input = nlp_processor.process(message)
+    return generator.generate_response(intent_classifier.classify(processed_input), processed_input, 'session-1')
+
+def test_rare_terms_outrank_common_ones():
+    """A document matching a rare term beats ones that only match a term every document has."""
+    index = BM25Index()
+    index.build([
+        ['hostel', 'fee', 'fee'],
+        ['hostel', 'mess', 'timing'],
+        ['hostel', 'room'],
+        ['librari', 'timing'],
+    ])
+    results = index.search(['hostel', 'mess'], top_k=2)
+    assert results[0][0] == 1
+    assert results[0][2] == 2 and results[1][2] == 1
+    assert results[0][1] > results[1][1]
+    assert index.search(['canteen']) == []
+
+def test_shorter_documents_score_higher_for_the_same_match():
+    index = BM25Index()
+    index.build([['bus'] + ['filler'] * 20, ['bus', 'route'], ['other']])
+    assert [doc_id for doc_id, _, _ in index.search(['bus'])] == [1, 0]
+
+def test_placeholder_values_are_not_indexed():
+    college_info = {
+        'name': 'Test College',
+        'established': '1995',
+        'fees': {'tuition_per_year': NOT_PUBLISHED, 'hostel_per_year': 'Rs. 60,000'},
+        'departments': ['Civil Engineering', 'Mechanical Engineering']
+    }
+    passages = build_passages(college_info, {'greeting': ["Hello!"]}, {'Is there a bus?': "Yes."}, str)
+    texts = [passage['text'] for passage in passages]
+    assert "Fees hostel per year: Rs. 60,000." in texts
+    assert not any(NOT_PUBLISHED in text for text in texts)
+    assert "Civil Engineering is one of the departments at Test College." in texts
+    assert "Hello!" not in texts
+    assert passages[-1] == {'text': "Yes.", 'index_text': "Is there a bus? Yes.", 'source': 'faq'}
+
+def test_filler_only_query_is_not_answered():
+    tokens = nlp_processor.process("tell me about it please")['clean_tokens']
+    assert content_tokens(list(tokens)) == []
+    assert generator.retriever.answer(nlp_processor.process("tell me about it please")) is None
+
+def test_factual_question_is_answered_locally():
+    """A question the classifier does not recognise is answered from the knowledge base."""
+    response = answer("when was the college established")
+    assert response['source'] == 'local'
+    assert response['local_source'] == 'retrieval'
+    assert "1995" in response['response']
+
+def test_department_question_gets_the_department_answer():
+    response = answer("is Cyber Security a separate department?")
+    assert response['source'] == 'local'
+    assert "Cyber Security" in response['response']
+    assert "hostel" not in response['response'].lower()
+
+if __name__ == "__main__":
+    print("🔎 Knowledge Retrieval Tests")
+    print("=" * 50)
+    test_rare_terms_outrank_common_ones()
+    test_shorter_documents_score_higher_for_the_same_match()
+    test_placeholder_values_are_not_indexed()
+    test_filler_only_query_is_not_answered()
+    test_factual_question_is_answered_locally()
+    test_department_question_gets_the_department_answer()
+    print("✅ All retrieval tests passed")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for deadline-aware AI retries.
+Uses a fake clock so worst-case latency can be checked without waiting.
+"""
+
+import chatbot.response_generator as response_generator_module
+from chatbot.response_generator import ResponseGenerator
+from chatbot.retry import AIServiceError, Deadline, DeadlineExceeded, call_with_retries, is_retryable
+
+class FakeClock:
+    """Clock that only moves when a call or a sleep spends time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def make_hanging_service(clock, calls, name, error=None):
+    """A provider that hangs until its timeout, then fails with a transient error."""
+    def service(prompt, deadline, on_token=None):
+        calls.append(name)
+        clock.now += deadline.timeout(10.0)
+        raise error or TimeoutError(f"{name} timed out")
+    return service
+
+def make_generator(clock):
+    generator = ResponseGenerator()
+    generator.clock = clock
+    generator.sleep = clock.sleep
+    return generator
+
+def _wrapped(error):
+    """Wrap an error the way the providers do."""
+    try:
+        try:
+            raise error
+        except AIServiceError as e:
+            raise AIServiceError(f"Provider error: {e}") from e
+    except AIServiceError as outer:
+        return outer
+
+def test_retryable_errors():
+    """Only transient failures are retried."""
+    assert is_retryable(TimeoutError())
+    assert is_retryable(AIServiceError("busy", status_code=503))
+    assert is_retryable(_wrapped(AIServiceError("rate limited", status_code=429)))
+    assert not is_retryable(AIServiceError("bad request", status_code=400))
+    assert not is_retryable(AIServiceError("empty", retryable=False))
+    assert not is_retryable(ValueError("invalid key"))
+    assert not is_retryable(DeadlineExceeded())
+
+def test_non_retryable_error_fails_fast():
+    """A permanent error is raised after one call and no sleeping."""
+    clock = FakeClock()
+    calls = []
+
+    def service(deadline):
+        calls.append(clock.now)
+        raise AIServiceError("invalid API key", status_code=401)
+
+    try:
+        call_with_retries(service, Deadline(20.0, clock=clock), sleep=clock.sleep)
+        assert False, "expected the error to propagate"
+    except AIServiceError:
+        pass
+    assert len(calls) == 1
+    assert clock.sleeps == []
+
+def test_backoff_is_jittered_and_capped():
+    """Retry delays are drawn below an exponentially growing cap."""
+    clock = FakeClock()
+    draws = iter([1.0, 0.5, 0.25])
+
+    def service(deadline):
+        raise TimeoutError()
+
+    try:
+        call_with_retries(service, Deadline(60.0, clock=clock), max_retries=3, base_delay=0.5,
+                          max_delay=1.5, sleep=clock.sleep, jitter=lambda: next(draws))
+        assert False, "expected the error to propagate"
+    except TimeoutError:
+        pass
+    assert clock.sleeps == [0.5, 0.5, 0.375]
+
+def test_retry_stops_at_deadline():
+    """No retry is scheduled once the remaining budget is used up."""
+    clock = FakeClock()
+    calls = []
+
+    def service(deadline):
+        calls.append(clock.now)
+        clock.now += deadline.timeout(4.0)
+        raise TimeoutError()
+
+    try:
+        call_with_retries(service, Deadline(5.0, clock=clock), max_retries=5,
+                          sleep=clock.sleep, jitter=lambda: 1.0)
+        assert False, "expected the deadline to be exceeded"
+    except DeadlineExceeded:
+        pass
+    assert clock.now <= 5.0
+    assert len(calls) == 2
+
+def test_worst_case_latency_is_bounded():
+    """Every provider hanging and failing costs at most the deadline."""
+    clock = FakeClock()
+    generator = make_generator(clock)
+    calls = []
+    generator._try_gemini = make_hanging_service(clock, calls, "Gemini")
+    generator._try_chatgpt = make_hanging_service(clock, calls, "ChatGPT")
+    generator._try_perplexity = make_hanging_service(clock, calls, "Perplexity")
+
+    original = response_generator_module.AI_SERVICES_AVAILABLE
+    response_generator_module.AI_SERVICES_AVAILABLE = True
+    try:
+        response = generator._fallback_to_ai("Compare hostel life with living off campus")
+    finally:
+        response_generator_module.AI_SERVICES_AVAILABLE = original
+
+    print(f"Worst case: {clock.now:.1f}s over {len(calls)} calls ({', '.join(calls)})")
+    assert clock.now <= generator.ai_deadline_seconds
+    assert response.startswith("I'm sorry, I'm having trouble connecting")
+
+def test_permanent_failure_moves_to_next_provider():
+    """A provider with a permanent error is skipped without retries."""
+    clock = FakeClock()
+    generator = make_generator(clock)
+    calls = []
+    generator._try_gemini = make_hanging_service(
+        clock, calls, "Gemini", AIServiceError("Gemini API key not configured", retryable=False)
+    )
+
+    def chatgpt(prompt, deadline):
+        calls.append("ChatGPT")
+        return "ChatGPT answer"
+    generator._try_chatgpt = chatgpt
+
+    original = response_generator_module.AI_SERVICES_AVAILABLE
+    response_generator_module.AI_SERVICES_AVAILABLE = True
+    try:
+        response = generator._fallback_to_ai("Compare hostel life with living off campus")
+    finally:
+        response_generator_module.AI_SERVICES_AVAILABLE = original
+
+    assert response == "ChatGPT answer"
+    assert calls == ["Gemini", "ChatGPT"]
+    assert clock.sleeps == []
+
+if __name__ == "__main__":
+    print("⏱️  Deadline-aware Retry Tests")
+    print("=" * 50)
+    test_retryable_errors()
+    test_non_retryable_error_fails_fast()
+    test_backoff_is_jittered_and_capped()
+    test_retry_stops_at_deadline()
+    test_worst_case_latency_is_bounded()
+    test_permanent_failure_moves_to_next_provider()
+    print("✅ All retry tests passed")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for answers about a named department.
+"""
+
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.response_generator import ResponseGenerator
+from chatbot.training_data import COLLEGE_INFO, NOT_PUBLISHED, TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+
+def answer(generator, message):
+    processed_input = nlp_processor.process(message)
+    return generator.generate_response(intent_classifier.classify(processed_input), processed_input, 'session-1')
+
+def test_unpublished_fees_point_to_the_office():
+    """Placeholder fees are not quoted as if they were amounts."""
+    generator = ResponseGenerator(nlp_processor)
+    for message in ["Fees for CSE", "Tell me about the fees", "what is the tuition fee"]:
+        response = answer(generator, message)
+        assert response['source'] == 'local', message
+        assert NOT_PUBLISHED not in response['response'], message
+    assert "contact the college office" in answer(generator, "Fees for CSE")['response']
+
+def test_published_fees_are_quoted():
+    generator = ResponseGenerator(nlp_processor)
+    generator.college_info = {**COLLEGE_INFO, 'fees': {'tuition_per_year': 'Rs. 70,000', 'other_fees': 'Rs. 5,000'}}
+    response = answer(generator, "Fees for CSE")
+    assert response['intent'] == 'fee_info'
+    assert "Rs. 70,000" in response['response'] and "Rs. 5,000" in response['response']
+
+if __name__ == "__main__":
+    print("🏛️ Department Answer Tests")
+    print("=" * 50)
+    test_unpublished_fees_point_to_the_office()
+    test_published_fees_are_quoted()
+    print("✅ All department answer tests passed")
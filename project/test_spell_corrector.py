@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for spelling correction: misspelt keywords are fixed, real words are not.
+"""
+
+from chatbot.intent_classifier import IntentClassifier
+from chatbot.lexicon import Lexicon
+from chatbot.nlp_processor import NLPProcessor
+from chatbot.spell_corrector import SpellCorrector, edit_distance
+from chatbot.training_data import TRAINING_DATA
+
+nlp_processor = NLPProcessor()
+intent_classifier = IntentClassifier()
+intent_classifier.train(TRAINING_DATA)
+
+def test_misspelt_keywords_are_corrected():
+    corrector = nlp_processor.spell_corrector
+    for typo, word in [("admision", "admission"), ("hostle", "hostel"), ("scholorship", "scholarship"),
+                       ("placment", "placement"), ("libary", "library"), ("tution", "tuition")]:
+        assert corrector.correct(typo) == word, typo
+
+def test_real_words_are_left_alone():
+    """English words one edit from a keyword are not pulled to it."""
+    corrector = nlp_processor.spell_corrector
+    for word in ["food", "best", "rest", "late", "gate", "paid", "hotel", "hotels", "where",
+                 "mtech", "prize", "hall", "ball", "coaching"]:
+        assert corrector.correct(word) == word, f"{word} -> {corrector.correct(word)}"
+
+def test_real_words_keep_their_intent():
+    """Queries with such words are classified as they were before spelling correction."""
+    for message, intent in [
+        ("food in the hostel", 'hostel_info'),
+        ("I paid the fees late", 'fee_info'),
+    ]:
+        assert intent_classifier.classify(nlp_processor.process(message))['intent'] == intent, message
+    for message, wrong_intent in [
+        ("which branch is best", 'entrance_exam_info'),
+        ("is there a GATE coaching", 'application_deadline'),
+        ("where is the hotel", 'hostel_info'),
+    ]:
+        assert intent_classifier.classify(nlp_processor.process(message))['intent'] != wrong_intent, message
+
+def test_lexicon_recognises_inflections():
+    lexicon = Lexicon()
+    for word in ["hotels", "stopped", "studies", "cheaper", "coaching", "paid"]:
+        assert word in lexicon, word
+    for typo in ["hostell", "deadlin", "placment", "scholorship"]:
+        assert typo not in lexicon, typo
+
+def test_vocabulary_only_corrector():
+    """Without a lexicon any close vocabulary word is taken, fewest edits first."""
+    corrector = SpellCorrector()
+    corrector.build(["hostel", "good"], count=10)
+    assert corrector.correct("hostle") == "hostel"
+    assert corrector.correct("food") == "good"
+    assert corrector.correct("hat") == "hat"  # too short to correct
+    assert edit_distance("hostle", "hostel", 2) == 1
+
+if __name__ == "__main__":
+    print("🔤 Spelling Correction Tests")
+    print("=" * 50)
+    test_misspelt_keywords_are_corrected()
+    test_real_words_are_left_alone()
+    test_real_words_keep_their_intent()
+    test_lexicon_recognises_inflections()
+    test_vocabulary_only_corrector()
+    print("✅ All spelling correction tests passed")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming AI answers to a listener.
+"""
+
+import chatbot.response_generator as response_generator_module
+from chatbot.response_generator import ResponseGenerator, TokenStream
+from chatbot.retry import AIServiceError
+
+class FakeClock:
+    """Clock that only moves when a call or a sleep spends time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def make_hanging_service(clock, calls, name, error=None):
+    """A provider that hangs until its timeout, then fails with a transient error."""
+    def service(prompt, deadline, on_token=None):
+        calls.append(name)
+        clock.now += deadline.timeout(10.0)
+        raise error or TimeoutError(f"{name} timed out")
+    return service
+
+def make_generator(clock):
+    generator = ResponseGenerator()
+    generator.clock = clock
+    generator.sleep = clock.sleep
+    return generator
+
+def test_restart_is_only_sent_after_text():
+    """A listener hears about a restart only if it already got text from the failed attempt."""
+    received = []
+    stream = TokenStream(received.append)
+    stream.restart()
+    assert received == []
+    stream("Hostel ")
+    stream.restart()
+    stream.restart()
+    stream("Hostel life")
+    assert received == ["Hostel ", None, "Hostel life"]
+
+def test_partial_stream_is_restarted():
+    """A listener is told to discard text from a failed attempt before the next one streams."""
+    clock = FakeClock()
+    generator = make_generator(clock)
+    generator._try_gemini = make_hanging_service(clock, [], "Gemini", AIServiceError("no key", retryable=False))
+    attempts = []
+
+    def chatgpt(prompt, deadline, on_token=None):
+        attempts.append(clock.now)
+        on_token("Hostel life ")
+        if len(attempts) == 1:
+            raise TimeoutError("stream stalled")
+        on_token("is cheaper.")
+        return "Hostel life is cheaper."
+    generator._try_chatgpt = chatgpt
+
+    tokens = []
+    original = response_generator_module.AI_SERVICES_AVAILABLE
+    response_generator_module.AI_SERVICES_AVAILABLE = True
+    try:
+        response = generator._fallback_to_ai("Compare hostel life with living off campus", on_token=tokens.append)
+    finally:
+        response_generator_module.AI_SERVICES_AVAILABLE = original
+
+    assert response == "Hostel life is cheaper."
+    assert tokens == ["Hostel life ", None, "Hostel life ", "is cheaper."]
+
+
+if __name__ == "__main__":
+    print("📡 Streaming Tests")
+    print("=" * 50)
+    test_restart_is_only_sent_after_text()
+    test_partial_stream_is_restarted()
+    print("✅ All streaming tests passed")
@@ -10,6 +10,7 @@ export default defineConfig({
       '/api': {
         target: 'http://127.0.0.1:5000',
         changeOrigin: true,
+        ws: true, // /api/ws chat channel
       },
     },
   },